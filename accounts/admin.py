@@ -102,6 +102,7 @@ class EmailOTPAdmin(admin.ModelAdmin):
 class NotificationAdmin(admin.ModelAdmin):
     list_display = (
         "title",
+        "is_broadcast",
         "recipient_count",
         "created_at",
     )
@@ -0,0 +1,88 @@
+# Generated by Django 6.0 on 2026-10-18 09:46
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+def copy_read_state(apps, schema_editor):
+    """
+    Flag targeted notifications and turn the read_by maps into
+    receipts.
+    """
+    Notification = apps.get_model("accounts", "Notification")
+    NotificationReceipt = apps.get_model("accounts", "NotificationReceipt")
+    User = apps.get_model(*settings.AUTH_USER_MODEL.split("."))
+
+    user_ids = set(User.objects.values_list("id", flat=True))
+    receipts = []
+
+    for notification in Notification.objects.prefetch_related("recipients").iterator(chunk_size=500):
+        recipient_ids = {user.id for user in notification.recipients.all()}
+        read_ids = {
+            int(key)
+            for key, value in (notification.read_by or {}).items()
+            if value and str(key).isdigit() and int(key) in user_ids
+        }
+
+        if recipient_ids:
+            Notification.objects.filter(id=notification.id).update(is_broadcast=False)
+            target_ids = recipient_ids
+        else:
+            target_ids = read_ids
+
+        receipts.extend(
+            NotificationReceipt(
+                notification_id=notification.id,
+                user_id=user_id,
+                is_read=user_id in read_ids,
+            )
+            for user_id in target_ids
+        )
+
+    NotificationReceipt.objects.bulk_create(receipts, batch_size=1000, ignore_conflicts=True)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0002_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='notification',
+            name='is_broadcast',
+            field=models.BooleanField(db_index=True, default=True, editable=False),
+        ),
+        migrations.AlterField(
+            model_name='notification',
+            name='read_by',
+            field=models.JSONField(blank=True, default=dict, help_text='Legacy map of user_id -> read status (see NotificationReceipt)'),
+        ),
+        migrations.CreateModel(
+            name='NotificationInbox',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('last_read_broadcast_id', models.PositiveBigIntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('user', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='notification_inbox', to=settings.AUTH_USER_MODEL)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='NotificationReceipt',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('is_read', models.BooleanField(default=False)),
+                ('read_at', models.DateTimeField(blank=True, null=True)),
+                ('notification', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='receipts', to='accounts.notification')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='notification_receipts', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['user', 'is_read'], name='accounts_no_user_id_f78c21_idx')],
+                'unique_together': {('notification', 'user')},
+            },
+        ),
+        migrations.RunPython(copy_read_state, migrations.RunPython.noop),
+    ]
@@ -1,7 +1,7 @@
 from .client import Client
 from .contact_method import ContactMethod
 from .enrollment import EnrollmentLead
-from .notification import Notification
+from .notification import Notification, NotificationInbox, NotificationReceipt
 from .otp import EmailOTP
 from .payment import Payment
 from .profile import UserProfile
\ No newline at end of file
@@ -12,10 +12,17 @@ class Notification(models.Model):
         help_text="Empty = broadcast to all users"
     )
 
+    # Kept in sync with `recipients` (accounts.signals)
+    is_broadcast = models.BooleanField(
+        default=True,
+        db_index=True,
+        editable=False,
+    )
+
     read_by = models.JSONField(
         default=dict,
         blank=True,
-        help_text="Map of user_id -> read status"
+        help_text="Legacy map of user_id -> read status (see NotificationReceipt)"
     )
 
     created_at = models.DateTimeField(auto_now_add=True)
@@ -24,11 +31,70 @@ class Notification(models.Model):
         ordering = ["-created_at"]
 
     def mark_as_read(self, user):
-        self.read_by[str(user.id)] = True
-        self.save(update_fields=["read_by"])
+        from accounts.services.notification_inbox import mark_read
+
+        mark_read(self, user)
 
     def is_unread_for(self, user):
-        return not self.read_by.get(str(user.id), False)
+        from accounts.services.notification_inbox import is_unread
+
+        return is_unread(self, user)
 
     def __str__(self):
         return self.title
+
+
+class NotificationReceipt(models.Model):
+    """
+    Per-user delivery / read state.
+
+    Targeted notifications get an unread receipt per recipient when
+    sent. Broadcasts are fanned out on read: a receipt is only
+    written when the user opens one, everything up to the user's
+    NotificationInbox watermark counts as read.
+    """
+
+    notification = models.ForeignKey(
+        Notification,
+        on_delete=models.CASCADE,
+        related_name="receipts",
+    )
+
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="notification_receipts",
+    )
+
+    is_read = models.BooleanField(default=False)
+
+    read_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        unique_together = ("notification", "user")
+        indexes = [
+            models.Index(fields=["user", "is_read"]),
+        ]
+
+    def __str__(self):
+        return f"{self.user_id} - {self.notification_id}"
+
+
+class NotificationInbox(models.Model):
+    """
+    Broadcast watermark: every broadcast with an id up to
+    `last_read_broadcast_id` is read for this user.
+    """
+
+    user = models.OneToOneField(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="notification_inbox",
+    )
+
+    last_read_broadcast_id = models.PositiveBigIntegerField(default=0)
+
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.user_id} - {self.last_read_broadcast_id}"
@@ -0,0 +1,288 @@
+# accounts/services/notification_inbox.py
+
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Max, Q
+from django.utils import timezone
+
+from core.utils.cache import cross_request_timeout
+from accounts.models import (
+    Notification,
+    NotificationInbox,
+    NotificationReceipt,
+)
+
+
+# ============================================================
+# UNREAD COUNT CACHE
+# ============================================================
+# The header badge reads a cached per-user count. Reads and
+# targeted deliveries drop the user's entry; a new or deleted
+# broadcast bumps the version so every count is rebuilt lazily.
+# On a per-process cache other workers only see those after
+# cross_request_timeout() (core.utils.cache).
+
+UNREAD_VERSION_KEY = "accounts:notifications:version"
+UNREAD_TIMEOUT = 60 * 60  # 1 hour
+
+
+def _version() -> int:
+    version = cache.get(UNREAD_VERSION_KEY)
+    if version is None:
+        version = 1
+        cache.set(UNREAD_VERSION_KEY, version, None)
+    return version
+
+
+def _cache_key(user_id, version=None) -> str:
+    return f"accounts:notifications:{version or _version()}:unread:{user_id}"
+
+
+def invalidate_unread_count(user_id) -> None:
+    if user_id:
+        cache.delete(_cache_key(user_id))
+
+
+def invalidate_unread_counts(user_ids) -> None:
+    version = _version()
+    cache.delete_many([_cache_key(user_id, version) for user_id in user_ids])
+
+
+def invalidate_all_unread_counts() -> None:
+    try:
+        cache.incr(UNREAD_VERSION_KEY)
+    except ValueError:
+        cache.set(UNREAD_VERSION_KEY, 2, None)
+
+
+# ============================================================
+# READ STATE
+# ============================================================
+
+def broadcast_watermark(user_id) -> int:
+    return (
+        NotificationInbox.objects
+        .filter(user_id=user_id)
+        .values_list("last_read_broadcast_id", flat=True)
+        .first()
+    ) or 0
+
+
+def count_unread(user_id) -> int:
+    """
+    Unread targeted receipts plus broadcasts past the watermark
+    that were not opened individually (indexed COUNTs only).
+    """
+
+    watermark = broadcast_watermark(user_id)
+
+    targeted = NotificationReceipt.objects.filter(
+        user_id=user_id,
+        is_read=False,
+    ).count()
+
+    broadcasts = Notification.objects.filter(
+        is_broadcast=True,
+        id__gt=watermark,
+    ).count()
+
+    if broadcasts:
+        broadcasts -= NotificationReceipt.objects.filter(
+            user_id=user_id,
+            is_read=True,
+            notification__is_broadcast=True,
+            notification_id__gt=watermark,
+        ).count()
+
+    return targeted + max(broadcasts, 0)
+
+
+def get_unread_count(user_id) -> int:
+    key = _cache_key(user_id)
+    count = cache.get(key)
+
+    if count is None:
+        count = count_unread(user_id)
+        cache.set(key, count, cross_request_timeout(UNREAD_TIMEOUT))
+
+    return count
+
+
+def is_unread(notification, user) -> bool:
+    if notification.is_broadcast:
+        if notification.id <= broadcast_watermark(user.id):
+            return False
+
+        return not NotificationReceipt.objects.filter(
+            notification=notification,
+            user=user,
+            is_read=True,
+        ).exists()
+
+    return NotificationReceipt.objects.filter(
+        notification=notification,
+        user=user,
+        is_read=False,
+    ).exists()
+
+
+def mark_read(notification, user) -> None:
+    now = timezone.now()
+
+    if notification.is_broadcast:
+        if notification.id > broadcast_watermark(user.id):
+            NotificationReceipt.objects.update_or_create(
+                notification=notification,
+                user=user,
+                defaults={"is_read": True, "read_at": now},
+            )
+    else:
+        NotificationReceipt.objects.filter(
+            notification=notification,
+            user=user,
+            is_read=False,
+        ).update(is_read=True, read_at=now)
+
+    invalidate_unread_count(user.id)
+
+
+def unread_ids(user_id, notifications) -> set:
+    """
+    IDs of the unread notifications among `notifications` (two
+    queries), for annotating a list.
+    """
+
+    watermark = broadcast_watermark(user_id)
+
+    receipts = dict(
+        NotificationReceipt.objects
+        .filter(
+            user_id=user_id,
+            notification_id__in=[n.id for n in notifications],
+        )
+        .values_list("notification_id", "is_read")
+    )
+
+    unread = set()
+
+    for notification in notifications:
+        is_read = receipts.get(notification.id)
+
+        if notification.is_broadcast:
+            if notification.id > watermark and not is_read:
+                unread.add(notification.id)
+
+        elif is_read is False:
+            unread.add(notification.id)
+
+    return unread
+
+
+def visible_notifications(user_id):
+    """
+    Broadcasts plus notifications targeted at the user.
+    """
+
+    return Notification.objects.filter(
+        Q(is_broadcast=True)
+        | Q(receipts__user_id=user_id)
+    ).distinct()
+
+
+def mark_all_read(user_id) -> None:
+    """
+    Constant-cost "mark all read": one UPDATE for targeted
+    receipts, then the broadcast watermark is moved to the newest
+    broadcast.
+    """
+
+    now = timezone.now()
+
+    latest = (
+        Notification.objects
+        .filter(is_broadcast=True)
+        .aggregate(latest=Max("id"))["latest"]
+    ) or 0
+
+    with transaction.atomic():
+        NotificationReceipt.objects.filter(
+            user_id=user_id,
+            is_read=False,
+        ).update(is_read=True, read_at=now)
+
+        NotificationInbox.objects.update_or_create(
+            user_id=user_id,
+            defaults={"last_read_broadcast_id": latest},
+        )
+
+    invalidate_unread_count(user_id)
+
+
+# ============================================================
+# DELIVERY
+# ============================================================
+
+def send_notification(*, title, message, user_ids=None):
+    """
+    Create a notification.
+
+    user_ids=None broadcasts it (one INSERT, read state is fanned
+    out on read). Otherwise recipients and receipts are inserted in
+    bulk, so the query count does not grow with the audience.
+    Returns None when an explicit recipient list is empty.
+    """
+
+    if user_ids is None:
+        return Notification.objects.create(
+            title=title,
+            message=message,
+        )
+
+    user_ids = list(dict.fromkeys(user_ids))
+
+    if not user_ids:
+        return None
+
+    through = Notification.recipients.through
+
+    with transaction.atomic():
+        notification = Notification.objects.create(
+            title=title,
+            message=message,
+            is_broadcast=False,
+        )
+
+        through.objects.bulk_create(
+            [
+                through(notification_id=notification.id, user_id=user_id)
+                for user_id in user_ids
+            ],
+            batch_size=1000,
+            ignore_conflicts=True,
+        )
+
+        create_receipts(notification.id, user_ids)
+
+    return notification
+
+
+def create_receipts(notification_id, user_ids) -> None:
+    """
+    Unread receipts for the targeted recipients (one INSERT per
+    batch; existing receipts are left untouched).
+    """
+
+    NotificationReceipt.objects.bulk_create(
+        [
+            NotificationReceipt(
+                notification_id=notification_id,
+                user_id=user_id,
+            )
+            for user_id in user_ids
+        ],
+        batch_size=1000,
+        ignore_conflicts=True,
+    )
+
+    invalidate_unread_counts(user_ids)
+
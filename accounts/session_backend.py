@@ -0,0 +1,89 @@
+# accounts/session_backend.py
+
+import time
+
+from django.conf import settings
+from django.contrib.sessions.backends.cached_db import (
+    SessionStore as CachedDBStore,
+)
+from django.contrib.sessions.backends.db import SessionStore as DBStore
+
+from core.utils.cache import is_shared_cache
+
+
+# ============================================================
+# LOW-WRITE SESSION STORE
+# ============================================================
+# Cache-backed sessions with write-through to django_session.
+#
+# With SESSION_SAVE_EVERY_REQUEST the middleware calls save() on
+# every request to slide the expiry. Here an unmodified session is
+# only written again once its last write is older than
+# SESSION_REFRESH_THRESHOLD seconds, so the stored expiry trails
+# the cookie by at most that much.
+#
+# Any change to the session data (login, OTP state, logout, ...)
+# is still written to the database immediately, and key rotation
+# (cycle_key) always creates the new row.
+#
+# A per-process cache (LocMemCache) would hand stale sessions to
+# other workers, so with it reads go to the database and only the
+# write reduction applies (core.utils.cache.is_shared_cache).
+
+WRITTEN_AT_KEY = "_session_written_at"
+
+
+def _refresh_threshold() -> int:
+    return getattr(settings, "SESSION_REFRESH_THRESHOLD", 300)
+
+
+class SessionStore(CachedDBStore):
+
+    cache_key_prefix = "accounts.session_backend"
+
+    def __init__(self, session_key=None):
+        super().__init__(session_key)
+        self._use_cache = is_shared_cache(settings.SESSION_CACHE_ALIAS)
+
+    # --------------------------------------------------------
+    # READ
+    # --------------------------------------------------------
+
+    def load(self):
+        if self._use_cache:
+            return super().load()
+        return DBStore.load(self)
+
+    def exists(self, session_key):
+        if self._use_cache:
+            return super().exists(session_key)
+        return DBStore.exists(self, session_key)
+
+    # --------------------------------------------------------
+    # WRITE
+    # --------------------------------------------------------
+
+    def _recently_written(self) -> bool:
+        written_at = self._get_session().get(WRITTEN_AT_KEY)
+        return (
+            written_at is not None
+            and time.time() - written_at < _refresh_threshold()
+        )
+
+    def save(self, must_create=False):
+        if (
+            not must_create
+            and not self.modified
+            and self.session_key
+            and self._recently_written()
+        ):
+            return
+
+        # Stored with the data; set directly so it does not mark
+        # the session as modified.
+        self._get_session(no_load=must_create)[WRITTEN_AT_KEY] = int(time.time())
+
+        if self._use_cache:
+            super().save(must_create)
+        else:
+            DBStore.save(self, must_create)
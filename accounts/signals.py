@@ -1,7 +1,13 @@
-from django.db.models.signals import post_save
+from django.db.models.signals import m2m_changed, post_delete, post_save
 from django.dispatch import receiver
 from django.contrib.auth import get_user_model
+from .models.notification import Notification, NotificationReceipt
 from .models.profile import UserProfile
+from .services.notification_inbox import (
+    create_receipts,
+    invalidate_all_unread_counts,
+    invalidate_unread_counts,
+)
 
 User = get_user_model()
 
@@ -9,3 +15,40 @@ User = get_user_model()
 def create_profile(sender, instance, created, **kwargs):
     if created:
         UserProfile.objects.create(user=instance)
+
+
+# ============================================================
+# NOTIFICATION INBOX
+# ============================================================
+
+@receiver(post_save, sender=Notification)
+@receiver(post_delete, sender=Notification)
+def _on_notification_change(sender, instance, **kwargs):
+    if instance.is_broadcast:
+        invalidate_all_unread_counts()
+
+
+@receiver(m2m_changed, sender=Notification.recipients.through)
+def _on_recipients_change(sender, instance, action, reverse, pk_set, **kwargs):
+    if reverse or action not in ("post_add", "post_remove", "post_clear"):
+        return
+
+    if action == "post_add":
+        create_receipts(instance.id, list(pk_set))
+    elif action == "post_remove":
+        NotificationReceipt.objects.filter(
+            notification=instance,
+            user_id__in=pk_set,
+        ).delete()
+        invalidate_unread_counts(list(pk_set))
+    else:
+        NotificationReceipt.objects.filter(notification=instance).delete()
+
+    is_broadcast = not instance.recipients.exists()
+
+    if is_broadcast != instance.is_broadcast:
+        Notification.objects.filter(id=instance.id).update(
+            is_broadcast=is_broadcast,
+        )
+        instance.is_broadcast = is_broadcast
+        invalidate_all_unread_counts()
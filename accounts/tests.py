@@ -1,3 +1,189 @@
-from django.test import TestCase
+from unittest import mock
 
-# Create your tests here.
+from django.contrib.auth.models import User
+from django.contrib.sessions.models import Session
+from django.core.cache import cache
+from django.db import connection
+from django.db.migrations.executor import MigrationExecutor
+from django.test import TestCase, TransactionTestCase
+from django.test.utils import CaptureQueriesContext
+
+from accounts.models import Notification, NotificationReceipt
+from accounts.services.notification_inbox import (
+    count_unread,
+    get_unread_count,
+    mark_all_read,
+    mark_read,
+    send_notification,
+)
+from accounts.session_backend import SessionStore
+
+
+# ============================================================
+# SESSION BACKEND
+# ============================================================
+
+class SessionBackendTests(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.store = SessionStore()
+        self.store["otp_verified"] = True
+        self.store.save()
+
+    def _reload(self):
+        return SessionStore(self.store.session_key).load()
+
+    def test_logout_on_another_worker_is_seen_on_a_local_cache(self):
+        # Row gone (flush elsewhere); this process's cache still has it
+        Session.objects.filter(session_key=self.store.session_key).delete()
+
+        self.assertEqual(self._reload(), {})
+
+    @mock.patch("accounts.session_backend.is_shared_cache", return_value=True)
+    def test_reads_come_from_a_shared_cache(self, _shared):
+        store = SessionStore()
+        store["otp_verified"] = True
+        store.save()
+
+        with self.assertNumQueries(0):
+            data = SessionStore(store.session_key).load()
+
+        self.assertTrue(data["otp_verified"])
+
+
+# ============================================================
+# NOTIFICATION INBOX BACKFILL (0003)
+# ============================================================
+
+class NotificationBackfillTests(TransactionTestCase):
+
+    before = [("accounts", "0002_initial")]
+    after = [("accounts", "0003_notification_inbox")]
+
+    def _migrate(self, targets):
+        executor = MigrationExecutor(connection)
+        executor.loader.build_graph()
+        executor.migrate(targets)
+        return executor.loader.project_state(targets).apps
+
+    def setUp(self):
+        cache.clear()
+        apps = self._migrate(self.before)
+
+        User = apps.get_model("auth", "User")
+        Notification = apps.get_model("accounts", "Notification")
+
+        self.reader, self.unread, self.viewer = (
+            User.objects.create(username=name).id
+            for name in ("reader", "unread", "viewer")
+        )
+
+        targeted = Notification.objects.create(
+            title="Targeted",
+            message="m",
+            read_by={str(self.reader): True, str(self.unread): False},
+        )
+        targeted.recipients.set([self.reader, self.unread])
+        self.targeted = targeted.id
+
+        # Read by "viewer" and by a user that no longer exists
+        self.broadcast = Notification.objects.create(
+            title="Broadcast",
+            message="m",
+            read_by={str(self.viewer): True, "99999": True},
+        ).id
+
+        self._migrate(self.after)
+
+    def tearDown(self):
+        self._migrate(MigrationExecutor(connection).loader.graph.leaf_nodes())
+
+    def test_targeted_notifications_get_receipts(self):
+        self.assertFalse(Notification.objects.get(id=self.targeted).is_broadcast)
+        self.assertEqual(
+            dict(
+                NotificationReceipt.objects
+                .filter(notification_id=self.targeted)
+                .values_list("user_id", "is_read")
+            ),
+            {self.reader: True, self.unread: False},
+        )
+
+    def test_broadcast_reads_become_read_receipts(self):
+        self.assertTrue(Notification.objects.get(id=self.broadcast).is_broadcast)
+        self.assertEqual(
+            list(
+                NotificationReceipt.objects
+                .filter(notification_id=self.broadcast)
+                .values_list("user_id", "is_read")
+            ),
+            [(self.viewer, True)],
+        )
+
+    def test_unread_counts_match_the_legacy_read_state(self):
+        self.assertEqual(count_unread(self.reader), 1)
+        self.assertEqual(count_unread(self.unread), 2)
+        self.assertEqual(count_unread(self.viewer), 0)
+
+
+# ============================================================
+# NOTIFICATION DELIVERY
+# ============================================================
+
+class NotificationDeliveryTests(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.users = [User.objects.create(username=f"user{i}") for i in range(3)]
+        self.user = self.users[0]
+
+    def _send(self, user_ids):
+        return send_notification(title="Hi", message="m", user_ids=user_ids)
+
+    def test_targeted_delivery_is_unread_for_recipients_only(self):
+        notification = self._send([u.id for u in self.users[:2]] * 2)
+
+        self.assertFalse(notification.is_broadcast)
+        self.assertEqual(notification.recipients.count(), 2)
+        self.assertEqual([count_unread(u.id) for u in self.users], [1, 1, 0])
+
+    def test_query_count_does_not_grow_with_the_audience(self):
+        many = [User.objects.create(username=f"many{i}").id for i in range(30)]
+
+        def queries(user_ids):
+            with CaptureQueriesContext(connection) as ctx:
+                self._send(user_ids)
+            return len(ctx.captured_queries)
+
+        self.assertEqual(queries(many[:2]), queries(many))
+
+    def test_empty_audience_sends_nothing(self):
+        self.assertIsNone(self._send([]))
+        self.assertFalse(Notification.objects.exists())
+
+    def test_cached_badge_follows_delivery_and_reads(self):
+        self.assertEqual(get_unread_count(self.user.id), 0)
+
+        targeted = self._send([self.user.id])
+        broadcast = send_notification(title="All", message="m")
+        self.assertEqual(get_unread_count(self.user.id), 2)
+
+        mark_read(targeted, self.user)
+        self.assertEqual(get_unread_count(self.user.id), 1)
+
+        mark_read(broadcast, self.user)
+        self.assertEqual(get_unread_count(self.user.id), 0)
+
+    def test_mark_all_read_covers_targeted_and_broadcasts(self):
+        self._send([self.user.id])
+        send_notification(title="All", message="m")
+        send_notification(title="All again", message="m")
+
+        mark_all_read(self.user.id)
+
+        self.assertEqual(get_unread_count(self.user.id), 0)
+        self.assertFalse(
+            NotificationReceipt.objects.filter(user=self.user, is_read=False).exists()
+        )
+        self.assertEqual(count_unread(self.users[1].id), 2)
@@ -11,6 +11,7 @@ from django.utils.timezone import now
 
 from quiz.models import UserExam, ExamSubscription, ExamTrackSubscription
 from courses.models import CourseSubscription
+from quiz.services.platform_metrics import get_platform_metrics
 
 
 def is_admin(user):
@@ -120,24 +121,8 @@ def user_monitoring(request):
     # =====================================
     # 📊 GLOBAL KPI SUMMARY
     # =====================================
-    total_users = User.objects.count()
-    active_users = User.objects.filter(is_active=True).count()
-
-    total_attempts_all = UserExam.objects.count()
-
-    avg_score_all = UserExam.objects.aggregate(
-        avg=Avg("score")
-    )["avg"]
-
-    active_exam_subs = ExamSubscription.objects.filter(
-        is_active=True,
-        expires_at__gte=now()
-    ).count()
-
-    active_track_subs = ExamTrackSubscription.objects.filter(
-        is_active=True,
-        expires_at__gte=now()
-    ).count()
+    # Pre-aggregated (quiz.services.platform_metrics)
+    row = get_platform_metrics()
 
     # =====================================
     # 📄 PAGINATION
@@ -151,12 +136,12 @@ def user_monitoring(request):
         "search_query": search_query,
         "sort_by": sort_by,
         "order": order,
-        "total_users": total_users,
-        "active_users": active_users,
-        "total_attempts_all": total_attempts_all,
-        "avg_score_all": avg_score_all,
-        "active_exam_subs": active_exam_subs,
-        "active_track_subs": active_track_subs,
+        "total_users": row.total_users,
+        "active_users": row.metrics.get("active_users"),
+        "total_attempts_all": row.total_user_exams,
+        "avg_score_all": row.metrics.get("avg_score"),
+        "active_exam_subs": row.metrics.get("active_exam_subs"),
+        "active_track_subs": row.metrics.get("active_track_subs"),
     }
 
     return render(request, "accounts/admin/user_monitoring.html", context)
@@ -0,0 +1,44 @@
+from django.core.cache import DEFAULT_CACHE_ALIAS, caches
+from django.core.cache.backends.locmem import LocMemCache
+
+
+# ============================================================
+# CROSS-REQUEST CACHE POLICY
+# ============================================================
+# Services cache data across requests and invalidate it from
+# signals (key deletes / version bumps). With a process-local
+# backend (LocMemCache) that invalidation only reaches the worker
+# that ran it, so:
+#
+#   * data that decides access or grading (entitlements,
+#     organization roles, answer keys) is only cached across
+#     requests on a shared cache; otherwise it is rebuilt per use.
+#
+#   * derived data where a short lag is harmless (question pools,
+#     category tree, unread badges) stays cached, with its timeout
+#     capped at LOCAL_CACHE_TIMEOUT so other workers catch up
+#     within that time.
+
+LOCAL_CACHE_TIMEOUT = 60  # seconds
+
+
+def is_shared_cache(alias=DEFAULT_CACHE_ALIAS) -> bool:
+    """
+    True when every worker sees the same cache (not LocMemCache).
+    """
+    return not isinstance(caches[alias], LocMemCache)
+
+
+def cross_request_timeout(timeout, alias=DEFAULT_CACHE_ALIAS):
+    """
+    Timeout for lag-tolerant entries: `timeout` on a shared cache,
+    at most LOCAL_CACHE_TIMEOUT on a process-local one.
+    """
+
+    if is_shared_cache(alias):
+        return timeout
+
+    if timeout is None:
+        return LOCAL_CACHE_TIMEOUT
+
+    return min(timeout, LOCAL_CACHE_TIMEOUT)
@@ -9,6 +9,7 @@ from django.db import transaction
 from django.db.models import F
 
 from courses.models import *
+from quiz.services.entitlements import invalidate_user_entitlements
 
 #from .models import *
 
@@ -408,11 +409,17 @@ class CourseSubscriptionAdmin(admin.ModelAdmin):
 
     @admin.action(description="✅ Activate selected subscriptions")
     def activate_subscription(self, request, queryset):
+        user_ids = list(queryset.values_list("user_id", flat=True))
         queryset.update(is_active=True)
+        for user_id in set(user_ids):
+            invalidate_user_entitlements(user_id)
 
     @admin.action(description="⛔ Deactivate selected subscriptions")
     def deactivate_subscription(self, request, queryset):
+        user_ids = list(queryset.values_list("user_id", flat=True))
         queryset.update(is_active=False)
+        for user_id in set(user_ids):
+            invalidate_user_entitlements(user_id)
 
     @admin.action(description="⏳ Extend subscription by 30 days")
     def extend_subscription_30_days(self, request, queryset):
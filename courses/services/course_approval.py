@@ -2,7 +2,7 @@ from django.contrib.auth import get_user_model
 from django.db import transaction
 from django.utils import timezone
 
-from accounts.models import Notification
+from accounts.services.notification_inbox import send_notification
 
 from courses.models import Course
 
@@ -26,26 +26,21 @@ def _notify_admins(*, title, message):
     Send a notification to all active platform administrators.
 
     Platform administrators are represented by Django
-    superusers.
+    superusers. Recipients are added in bulk; nothing is sent
+    when there are no administrators.
     """
 
-    admins = User.objects.filter(
+    admin_ids = User.objects.filter(
         is_superuser=True,
         is_active=True,
-    )
+    ).values_list("id", flat=True)
 
-    notification = Notification.objects.create(
+    return send_notification(
         title=title,
         message=message,
+        user_ids=admin_ids,
     )
 
-    if admins.exists():
-        notification.recipients.add(
-            *admins
-        )
-
-    return notification
-
 
 # ============================================================
 # INTERNAL: COURSE OWNER NOTIFICATION
@@ -61,20 +56,15 @@ def _notify_course_owner(
     Send a notification to the user who created the course.
     """
 
-    if not course.created_by:
+    if not course.created_by_id:
         return None
 
-    notification = Notification.objects.create(
+    return send_notification(
         title=title,
         message=message,
+        user_ids=[course.created_by_id],
     )
 
-    notification.recipients.add(
-        course.created_by
-    )
-
-    return notification
-
 
 # ============================================================
 # SUBMIT COURSE FOR REVIEW
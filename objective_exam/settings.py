@@ -175,10 +175,14 @@ USE_TZ = True
 # SESSIONS (PRODUCTION SAFE + OTP SAFE)
 # ============================================================
 
-SESSION_ENGINE = "django.contrib.sessions.backends.db"
+# Cache-backed, write-through to the DB; unmodified sessions are
+# re-saved at most once per SESSION_REFRESH_THRESHOLD seconds
+# (see accounts/session_backend.py).
+SESSION_ENGINE = "accounts.session_backend"
 
 SESSION_COOKIE_AGE = 60 * 60 * 2   # 2 hours
 SESSION_SAVE_EVERY_REQUEST = True
+SESSION_REFRESH_THRESHOLD = 60 * 5   # 5 minutes
 SESSION_EXPIRE_AT_BROWSER_CLOSE = False
 
 SESSION_COOKIE_SECURE = True
@@ -1,40 +1,38 @@
-from organizations.models.membership import OrganizationMember
+from django.utils.functional import SimpleLazyObject
 
+from organizations.services.memberships import get_active_membership
 
-class ActiveOrganizationMiddleware:
-    def __init__(self, get_response):
-        self.get_response = get_response
 
-    def __call__(self, request):
-       
+def _resolve_membership(request):
+    """
+    (organization, role) for the request, resolved once and only
+    when a view or template reads request.active_org / org_role.
+    """
 
-        request.active_org = None
-        request.org_role = None   # 👈 ADD THIS
+    if not hasattr(request, "_active_membership"):
+        user = request.user
 
-        if request.user.is_authenticated:
-           
+        if user.is_authenticated:
+            request._active_membership = get_active_membership(user.id)
+        else:
+            request._active_membership = (None, None)
 
-            memberships = OrganizationMember.objects.filter(
-                user=request.user,
-                is_active=True
-            ).select_related("organization")
+    return request._active_membership
 
-            
 
-            # Prefer admin membership
-            admin_membership = memberships.filter(role="org_admin").first()
-          
+class ActiveOrganizationMiddleware:
+    def __init__(self, get_response):
+        self.get_response = get_response
 
-            if admin_membership:
-                request.active_org = admin_membership.organization
-                request.org_role = admin_membership.role   # 👈 SET ROLE
-            else:
-                first = memberships.first()
-             
-                if first:
-                    request.active_org = first.organization
-                    request.org_role = first.role          # 👈 SET ROLE
+    def __call__(self, request):
 
-     
+        # Prefer admin membership (see get_active_membership);
+        # the lookup is served from the cached membership snapshot.
+        request.active_org = SimpleLazyObject(
+            lambda: _resolve_membership(request)[0]
+        )
+        request.org_role = SimpleLazyObject(
+            lambda: _resolve_membership(request)[1]
+        )
 
         return self.get_response(request)
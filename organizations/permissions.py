@@ -4,7 +4,10 @@ from functools import wraps
 from django.shortcuts import get_object_or_404, redirect
 from django.core.exceptions import PermissionDenied
 from organizations.models.organization import Organization
-from organizations.models.membership import OrganizationMember
+from organizations.services.memberships import (
+    ORG_ADMIN,
+    get_membership_by_slug,
+)
 
 
 
@@ -18,23 +21,25 @@ def org_admin_required(view_func):
         if not request.user.is_authenticated:
             return redirect("accounts:request-login-otp")
 
-        # 🔐 2. Load organization from slug
-        organization = get_object_or_404(Organization, slug=slug)
+        # 🔐 2. Membership (organizations.services.memberships)
+        organization, role = get_membership_by_slug(
+            request.user.id,
+            slug,
+        )
+
+        if organization is None:
+            # Unknown slug -> 404, otherwise not a member
+            get_object_or_404(Organization, slug=slug)
+            raise PermissionDenied("Organization admin only.")
+
+        # 🔐 3. Verify role
+        if role != ORG_ADMIN:
+            raise PermissionDenied("Organization admin only.")
 
         # Attach to request (so views can use it)
         request.organization = organization
         request.active_org = organization  # optional consistency
 
-        # 🔐 3. Verify membership
-        member = OrganizationMember.objects.filter(
-            user=request.user,
-            organization=organization,
-            is_active=True,
-        ).first()
-
-        if not member or member.role != "org_admin":
-            raise PermissionDenied("Organization admin only.")
-
         return view_func(request, slug, *args, **kwargs)
 
     return _wrapped
\ No newline at end of file
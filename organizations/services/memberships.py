@@ -0,0 +1,110 @@
+# organizations/services/memberships.py
+
+from django.core.cache import cache
+
+from core.utils.cache import is_shared_cache
+from organizations.models.membership import OrganizationMember
+
+
+# ============================================================
+# MEMBERSHIP SNAPSHOT
+# ============================================================
+# Every active membership of a user as [(organization, role), ..]
+# in membership order.
+#
+# Roles decide admin access, so the snapshot is only cached across
+# requests on a shared cache (see core.utils.cache). There, per-user
+# entries are dropped by organizations.signals on OrganizationMember
+# save / delete, and Organization changes bump the version so
+# cached organization rows are reloaded.
+
+MEMBERSHIP_VERSION_KEY = "organizations:memberships:version"
+MEMBERSHIP_TIMEOUT = 60 * 60  # 1 hour
+
+ORG_ADMIN = "org_admin"
+
+
+def _version() -> int:
+    version = cache.get(MEMBERSHIP_VERSION_KEY)
+    if version is None:
+        version = 1
+        cache.set(MEMBERSHIP_VERSION_KEY, version, None)
+    return version
+
+
+def _cache_key(user_id) -> str:
+    return f"organizations:memberships:{_version()}:user:{user_id}"
+
+
+def invalidate_user_memberships(user_id) -> None:
+    if user_id:
+        cache.delete(_cache_key(user_id))
+
+
+def invalidate_all_memberships() -> None:
+    try:
+        cache.incr(MEMBERSHIP_VERSION_KEY)
+    except ValueError:
+        cache.set(MEMBERSHIP_VERSION_KEY, 2, None)
+
+
+def build_memberships(user_id) -> list:
+    return [
+        (member.organization, member.role)
+        for member in (
+            OrganizationMember.objects
+            .filter(user_id=user_id, is_active=True)
+            .select_related("organization")
+            .order_by("id")
+        )
+    ]
+
+
+def get_memberships(user_id) -> list:
+    if not is_shared_cache():
+        return build_memberships(user_id)
+
+    key = _cache_key(user_id)
+    memberships = cache.get(key)
+
+    if memberships is None:
+        memberships = build_memberships(user_id)
+        cache.set(key, memberships, MEMBERSHIP_TIMEOUT)
+
+    return memberships
+
+
+# ============================================================
+# LOOKUPS
+# ============================================================
+
+def get_active_membership(user_id):
+    """
+    (organization, role) to use as the request's active
+    organization: an org_admin membership first, otherwise the
+    first membership; (None, None) without memberships.
+    """
+
+    memberships = get_memberships(user_id)
+
+    for organization, role in memberships:
+        if role == ORG_ADMIN:
+            return organization, role
+
+    if memberships:
+        return memberships[0]
+
+    return None, None
+
+
+def get_membership_by_slug(user_id, slug):
+    """
+    (organization, role) of the user's active membership in the
+    organization `slug`, or (None, None).
+    """
+
+    for organization, role in get_memberships(user_id):
+        if organization.slug == slug:
+            return organization, role
+
+    return None, None
@@ -0,0 +1,21 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .models.membership import OrganizationMember
+from .models.organization import Organization
+from .services.memberships import (
+    invalidate_all_memberships,
+    invalidate_user_memberships,
+)
+
+
+@receiver(post_save, sender=OrganizationMember)
+@receiver(post_delete, sender=OrganizationMember)
+def _on_membership_change(sender, instance, **kwargs):
+    invalidate_user_memberships(instance.user_id)
+
+
+@receiver(post_save, sender=Organization)
+@receiver(post_delete, sender=Organization)
+def _on_organization_change(sender, instance, **kwargs):
+    invalidate_all_memberships()
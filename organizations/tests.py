@@ -1,3 +1,69 @@
-from django.test import TestCase
+from unittest import mock
 
-# Create your tests here.
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.exceptions import PermissionDenied
+from django.http import HttpResponse
+from django.test import RequestFactory, TestCase
+
+from organizations.models.membership import OrganizationMember
+from organizations.models.organization import Organization
+from organizations.permissions import org_admin_required
+
+
+@org_admin_required
+def _admin_view(request, slug):
+    return HttpResponse("ok")
+
+
+class OrgAdminRequiredTests(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create(username="admin")
+        self.org = Organization.objects.create(
+            name="School A",
+            slug="school-a",
+            org_type=Organization.TYPE_SCHOOL,
+        )
+        self.member = OrganizationMember.objects.create(
+            user=self.user,
+            organization=self.org,
+            role="org_admin",
+        )
+
+    def _get(self):
+        request = RequestFactory().get("/org/school-a/dashboard/")
+        request.user = self.user
+        return _admin_view(request, "school-a")
+
+    def test_admin_is_let_in(self):
+        self.assertEqual(self._get().status_code, 200)
+
+    def test_demoted_admin_is_refused(self):
+        self._get()
+
+        self.member.role = "student"
+        self.member.save()
+
+        with self.assertRaises(PermissionDenied):
+            self._get()
+
+    def test_demotion_on_another_worker_is_seen_on_a_local_cache(self):
+        self._get()
+
+        # No signal reaches this process's cache
+        OrganizationMember.objects.filter(pk=self.member.pk).update(role="student")
+
+        with self.assertRaises(PermissionDenied):
+            self._get()
+
+    @mock.patch("organizations.services.memberships.is_shared_cache", return_value=True)
+    def test_demotion_invalidates_the_shared_snapshot(self, _shared):
+        self._get()
+
+        self.member.is_active = False
+        self.member.save()
+
+        with self.assertRaises(PermissionDenied):
+            self._get()
@@ -41,7 +41,11 @@ from .models import (
     StudyPlan,
     StudyPlanAnalyticsSnapshot,
     LeaderboardEntry,
+    LeaderboardSnapshot,
+    PlatformMetrics,
 )
+from .services.entitlements import invalidate_user_entitlements
+from .services.question_pool import invalidate_question_pools
 
 
 # ============================================================
@@ -164,10 +168,17 @@ class ExamTrackSubscriptionAdmin(admin.ModelAdmin):
         request,
         queryset,
     ):
+        user_ids = set(
+            queryset.values_list("user_id", flat=True)
+        )
+
         updated = queryset.update(
             is_active=False
         )
 
+        for user_id in user_ids:
+            invalidate_user_entitlements(user_id)
+
         self.message_user(
             request,
             f"{updated} subscription(s) deactivated.",
@@ -462,6 +473,8 @@ class QuestionAdmin(admin.ModelAdmin):
             deleted_by=request.user,
         )
 
+        invalidate_question_pools()
+
     @admin.display(
         description="Question"
     )
@@ -1176,6 +1189,8 @@ class QuestionDiscussionAdmin(
             is_active=False
         )
 
+        invalidate_question_pools()
+
         self.message_user(
             request,
             "Related questions disabled.",
@@ -1199,6 +1214,8 @@ class StudyPlanAdmin(admin.ModelAdmin):
         "is_completed",
         "start_date",
         "extension_days",
+        "readiness_score",
+        "competitive_score",
     )
 
     list_filter = (
@@ -1328,6 +1345,7 @@ class LeaderboardEntryAdmin(
 
     list_display = (
         "user",
+        "plan",
         "score",
         "rank",
         "updated_at",
@@ -1343,6 +1361,63 @@ class LeaderboardEntryAdmin(
     )
 
 
+@admin.register(LeaderboardSnapshot)
+class LeaderboardSnapshotAdmin(
+    admin.ModelAdmin
+):
+
+    list_display = (
+        "partition",
+        "rank",
+        "user",
+        "score",
+        "percentile",
+        "created_at",
+    )
+
+    list_filter = (
+        "partition",
+    )
+
+    search_fields = (
+        "user__username",
+    )
+
+    ordering = (
+        "partition",
+        "rank",
+    )
+
+
+@admin.register(PlatformMetrics)
+class PlatformMetricsAdmin(
+    admin.ModelAdmin
+):
+
+    list_display = (
+        "kind",
+        "date",
+        "total_users",
+        "total_enrollments",
+        "total_track_subs",
+        "total_course_subs",
+        "computed_at",
+    )
+
+    list_filter = (
+        "kind",
+    )
+
+    readonly_fields = (
+        "computed_at",
+    )
+
+    ordering = (
+        "kind",
+        "-date",
+    )
+
+
 # ============================================================
 # PAYMENT RECORD
 # ============================================================
@@ -11,6 +11,8 @@ from django.utils import timezone
 
 from .models import Exam, Question, Choice, UserExam, UserAnswer, ExamCategoryAllocation
 from .serializers import ExamSerializer
+from .services.answer_keys import get_answer_keys
+from .services.grading import GRADED_FIELDS
 
 # Reuse allocation function (same logic as in views.py)
 def allocate_questions_for_exam(exam):
@@ -174,68 +176,68 @@ def api_submit_attempt(request, attempt_id):
     total = 0
     score_acc = 0.0
 
-    for ua in ue.answers.select_related('question'):
+    user_answers = list(ue.answers.select_related('question'))
+    keys = get_answer_keys([ua.question_id for ua in user_answers])
+
+    for ua in user_answers:
         q = ua.question
+        key = keys[q.id]
         total += 1
 
         if q.question_type in ('single','dropdown','tf'):
             choice_id = answers.get(str(q.id))
-            if choice_id:
-                try:
-                    ch = Choice.objects.get(pk=int(choice_id), question=q)
-                    ua.choice = ch
-                    ua.is_correct = ch.is_correct
-                    if ua.is_correct:
-                        score_acc += 1.0
-                except Exception:
-                    ua.choice = None
-                    ua.is_correct = False
+            try:
+                choice_id = int(choice_id) if choice_id else None
+            except (TypeError, ValueError):
+                choice_id = None
+            if choice_id in key['choice_ids']:
+                ua.choice_id = choice_id
+                ua.is_correct = choice_id in key['correct_choice_ids']
+                if ua.is_correct:
+                    score_acc += 1.0
             else:
-                ua.choice = None
+                ua.choice_id = None
                 ua.is_correct = False
             ua.selections = None
             ua.raw_answer = None
-            ua.save()
 
         elif q.question_type == 'multi':
             sel = answers.get(str(q.id), [])
             sel_ids = [int(x) for x in sel if x]
             ua.selections = sel_ids
-            correct_ids = [c.id for c in q.choices.filter(is_correct=True)]
+            correct_ids = key['correct_choice_ids']
             if not correct_ids:
                 frac = 0.0
             else:
-                tp = len(set(sel_ids) & set(correct_ids))
-                fp = len(set(sel_ids) - set(correct_ids))
+                tp = len(set(sel_ids) & correct_ids)
+                fp = len(set(sel_ids) - correct_ids)
                 frac = max(0.0, (tp - 0.5 * fp) / len(correct_ids))
             score_acc += frac
-            ua.choice = None
+            ua.choice_id = None
             ua.is_correct = None
             ua.raw_answer = None
-            ua.save()
 
         elif q.question_type == 'fill':
             raw = (answers.get(str(q.id)) or '').strip()
             ua.raw_answer = raw
             def norm(s): return ' '.join(s.lower().split())
-            if q.correct_text:
-                ua.is_correct = norm(raw) == norm(q.correct_text)
+            if key['correct_text']:
+                ua.is_correct = norm(raw) == norm(key['correct_text'])
                 if ua.is_correct:
                     score_acc += 1.0
             else:
                 ua.is_correct = False
             ua.selections = None
-            ua.choice = None
-            ua.save()
+            ua.choice_id = None
 
         elif q.question_type == 'numeric':
             raw = (answers.get(str(q.id)) or '').strip()
             ua.raw_answer = raw
             try:
                 v = float(raw)
-                if q.numeric_answer is not None:
-                    tol = q.numeric_tolerance or 0.0
-                    if abs(v - float(q.numeric_answer)) <= float(tol):
+                if key['numeric_answer'] is not None:
+                    tol = key['tolerance']
+                    if abs(v - float(key['numeric_answer'])) <= float(tol):
                         ua.is_correct = True
                         score_acc += 1.0
                     else:
@@ -245,8 +247,7 @@ def api_submit_attempt(request, attempt_id):
             except Exception:
                 ua.is_correct = False
             ua.selections = None
-            ua.choice = None
-            ua.save()
+            ua.choice_id = None
 
         elif q.question_type == 'match':
             pairs = q.matching_pairs or []
@@ -262,9 +263,8 @@ def api_submit_attempt(request, attempt_id):
             frac = max(0.0, (tp - 0.5 * fp) / denom)
             score_acc += frac
             ua.selections = None
-            ua.choice = None
+            ua.choice_id = None
             ua.raw_answer = None
-            ua.save()
 
         elif q.question_type == 'order':
             raw = (answers.get(str(q.id)) or '').strip()
@@ -282,17 +282,17 @@ def api_submit_attempt(request, attempt_id):
             except Exception:
                 pass
             ua.selections = None
-            ua.choice = None
-            ua.save()
+            ua.choice_id = None
 
         else:
-            ua.choice = None
+            ua.choice_id = None
             ua.is_correct = False
             ua.selections = None
             ua.raw_answer = None
-            ua.save()
+
+    UserAnswer.objects.bulk_update(user_answers, GRADED_FIELDS, batch_size=500)
 
     ue.score = (score_acc / total) * 100 if total else 0
     ue.submitted_at = timezone.now()
-    ue.save()
+    ue.save(update_fields=['score', 'submitted_at'])
     return Response({'score': ue.score})
@@ -1,10 +1,13 @@
-from accounts.models import Notification
+from accounts.services.notification_inbox import get_unread_count
 
 
 def unread_notifications_count(request):
     """
     Make the unread notification count available
     to every template.
+
+    Served from the per-user cached counter
+    (accounts.services.notification_inbox).
     """
 
     if not request.user.is_authenticated:
@@ -14,34 +17,14 @@ def unread_notifications_count(request):
 
     try:
 
-        notifications = Notification.objects.all()
-
-        count = 0
-
-        for notification in notifications:
-
-            # Empty recipients = broadcast
-            is_visible = (
-                not notification.recipients.exists()
-                or notification.recipients.filter(
-                    id=request.user.id
-                ).exists()
-            )
-
-            if not is_visible:
-                continue
-
-            if notification.is_unread_for(
-                request.user
-            ):
-                count += 1
-
         return {
-            "unread_notifications_count": count,
+            "unread_notifications_count": get_unread_count(
+                request.user.id
+            ),
         }
 
     except Exception:
 
         return {
             "unread_notifications_count": 0,
-        }
\ No newline at end of file
+        }
@@ -0,0 +1,35 @@
+from django.core.management.base import BaseCommand
+
+from quiz.models import StudyPlan
+
+
+class Command(BaseCommand):
+    help = "Recompute the denormalized score columns of every study plan"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=500,
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options["batch_size"]
+        batch, total = [], 0
+
+        for plan in StudyPlan.objects.order_by("id").iterator(chunk_size=batch_size):
+            plan.refresh_scores()
+            batch.append(plan)
+
+            if len(batch) >= batch_size:
+                StudyPlan.objects.bulk_update(batch, StudyPlan.SCORE_FIELDS)
+                total += len(batch)
+                batch = []
+
+        if batch:
+            StudyPlan.objects.bulk_update(batch, StudyPlan.SCORE_FIELDS)
+            total += len(batch)
+
+        self.stdout.write(
+            self.style.SUCCESS(f"Backfilled scores for {total} study plans")
+        )
@@ -0,0 +1,19 @@
+from django.core.management.base import BaseCommand
+
+from quiz.services.subscription_cleanup import expire_old_subscriptions
+
+
+class Command(BaseCommand):
+    help = "Deactivate exam, track and course subscriptions past their expiry"
+
+    def handle(self, *args, **options):
+        expired = expire_old_subscriptions()
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                "Deactivated "
+                f"{expired['exam']} exam, "
+                f"{expired['track']} track and "
+                f"{expired['course']} course subscriptions"
+            )
+        )
@@ -9,28 +9,32 @@ class Command(BaseCommand):
     help = "Send subscription expiry reminders"
 
     def handle(self, *args, **options):
+        reminders = []
+
         for days in (7, 3, 1):
 
             track_subs, exam_subs = SubscriptionService.get_expiring_subscriptions(days)
 
             for sub in track_subs:
-                NotificationService.notify_expiry(
-                    user=sub.user,
-                    title="Subscription expiring soon",
-                    message=(
+                reminders.append((
+                    sub.user_id,
+                    "Subscription expiring soon",
+                    (
                         f"Your subscription for '{sub.track.title}' "
                         f"expires on {sub.expires_at.date()}."
-                    )
-                )
+                    ),
+                ))
 
             for sub in exam_subs:
-                NotificationService.notify_expiry(
-                    user=sub.user,
-                    title="Exam access expiring soon",
-                    message=(
+                reminders.append((
+                    sub.user_id,
+                    "Exam access expiring soon",
+                    (
                         f"Your access to exam '{sub.exam.title}' "
                         f"expires on {sub.expires_at.date()}."
-                    )
-                )
+                    ),
+                ))
+
+        notified = NotificationService.notify_expiry(reminders)
 
-        self.stdout.write(self.style.SUCCESS("Expiry reminders sent"))
+        self.stdout.write(self.style.SUCCESS(f"Expiry reminders sent ({notified})"))
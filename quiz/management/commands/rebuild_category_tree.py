@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from quiz.services.category_tree import rebuild_category_closure
+
+
+class Command(BaseCommand):
+    help = "Rebuild the category closure table from Category.parent"
+
+    def handle(self, *args, **options):
+        rows = rebuild_category_closure()
+        self.stdout.write(self.style.SUCCESS(f"Category tree rebuilt ({rows} rows)"))
@@ -0,0 +1,22 @@
+from django.core.management.base import BaseCommand
+
+from quiz.services.leaderboard import (
+    rebuild_leaderboard,
+    refresh_leaderboard_snapshots,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Recompute every leaderboard entry and stored rank from active "
+        "study plans, then rebuild the domain / season snapshots "
+        "(schedule it: boards show the last run)"
+    )
+
+    def handle(self, *args, **options):
+        total = rebuild_leaderboard()
+        rows = refresh_leaderboard_snapshots()
+
+        self.stdout.write(
+            self.style.SUCCESS(f"Ranked {total} users ({rows} snapshot rows)")
+        )
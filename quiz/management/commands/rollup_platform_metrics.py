@@ -0,0 +1,17 @@
+from django.core.management.base import BaseCommand
+
+from quiz.services.platform_metrics import refresh_platform_metrics
+
+
+class Command(BaseCommand):
+    help = (
+        "Recompute the admin dashboard KPIs into the platform metrics snapshot "
+        "(schedule it, at least daily: dashboards and trends show the last run)"
+    )
+
+    def handle(self, *args, **options):
+        row = refresh_platform_metrics()
+
+        self.stdout.write(
+            self.style.SUCCESS(f"Platform metrics refreshed for {row.date}")
+        )
@@ -0,0 +1,46 @@
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from quiz.models import StudyPlan, StudyPlanAnalyticsSnapshot
+
+
+class Command(BaseCommand):
+    help = (
+        "Write today's analytics snapshot for every active study plan "
+        "(schedule nightly, before midnight: rows are dated the run day)"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=500,
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options["batch_size"]
+        today = timezone.localdate()
+
+        plan_ids = list(
+            StudyPlan.objects
+            .filter(is_active=True)
+            .exclude(snapshots__date=today)
+            .order_by("id")
+            .values_list("id", flat=True)
+        )
+
+        created = 0
+
+        for start in range(0, len(plan_ids), batch_size):
+            plans = StudyPlan.objects.filter(
+                id__in=plan_ids[start:start + batch_size]
+            )
+
+            StudyPlanAnalyticsSnapshot.objects.bulk_create(
+                [plan.build_daily_snapshot() for plan in plans]
+            )
+            created += len(plans)
+
+        self.stdout.write(
+            self.style.SUCCESS(f"Created {created} study plan snapshots")
+        )
@@ -0,0 +1,48 @@
+# Generated by Django 6.0 on 2026-10-18 09:20
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def build_closure(apps, schema_editor):
+    Category = apps.get_model("quiz", "Category")
+    CategoryClosure = apps.get_model("quiz", "CategoryClosure")
+
+    parents = dict(Category.objects.values_list("id", "parent_id"))
+    rows = []
+
+    for cid in parents:
+        node, depth, seen = cid, 0, set()
+        while node is not None and node not in seen:
+            seen.add(node)
+            rows.append(
+                CategoryClosure(ancestor_id=node, descendant_id=cid, depth=depth)
+            )
+            node = parents.get(node)
+            depth += 1
+
+    CategoryClosure.objects.bulk_create(rows, batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('quiz', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CategoryClosure',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('depth', models.PositiveIntegerField(default=0)),
+                ('ancestor', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='closure_descendants', to='quiz.category')),
+                ('descendant', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='closure_ancestors', to='quiz.category')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['descendant', 'depth'], name='quiz_catego_descend_c32a15_idx')],
+                'unique_together': {('ancestor', 'descendant')},
+            },
+        ),
+        migrations.RunPython(build_closure, migrations.RunPython.noop),
+    ]
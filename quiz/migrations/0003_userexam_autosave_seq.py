@@ -0,0 +1,18 @@
+# Generated by Django 6.0 on 2026-10-18 09:23
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('quiz', '0002_category_closure'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='userexam',
+            name='autosave_seq',
+            field=models.PositiveIntegerField(default=0, help_text='Last applied client autosave sequence number'),
+        ),
+    ]
@@ -0,0 +1,34 @@
+# Generated by Django 6.0 on 2026-10-18 09:35
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('quiz', '0003_userexam_autosave_seq'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='QuestionReviewState',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('last_seen_at', models.DateTimeField()),
+                ('due_at', models.DateTimeField()),
+                ('ease', models.FloatField(default=2.5)),
+                ('interval_minutes', models.PositiveIntegerField(default=0)),
+                ('repetitions', models.PositiveSmallIntegerField(default=0)),
+                ('mistake_count', models.PositiveSmallIntegerField(default=0)),
+                ('question', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='review_states', to='quiz.question')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='question_reviews', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['user', 'due_at'], name='quiz_questi_user_id_bfbce1_idx')],
+                'unique_together': {('user', 'question')},
+            },
+        ),
+    ]
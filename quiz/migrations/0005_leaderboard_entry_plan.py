@@ -0,0 +1,24 @@
+# Generated by Django 6.0 on 2026-10-18 09:38
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('quiz', '0004_question_review_state'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='leaderboardentry',
+            name='plan',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='quiz.studyplan'),
+        ),
+        migrations.AlterField(
+            model_name='leaderboardentry',
+            name='score',
+            field=models.FloatField(db_index=True, default=0),
+        ),
+    ]
@@ -0,0 +1,36 @@
+# Generated by Django 6.0 on 2026-10-18 09:40
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('quiz', '0005_leaderboard_entry_plan'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='LeaderboardSnapshot',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('partition', models.CharField(max_length=64)),
+                ('rank', models.PositiveIntegerField()),
+                ('score', models.FloatField(default=0)),
+                ('percentile', models.FloatField(default=0)),
+                ('readiness', models.FloatField(default=0)),
+                ('xp', models.PositiveIntegerField(default=0)),
+                ('streak', models.PositiveIntegerField(default=0)),
+                ('level', models.PositiveIntegerField(default=1)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'ordering': ('partition', 'rank'),
+                'unique_together': {('partition', 'rank'), ('partition', 'user')},
+            },
+        ),
+    ]
@@ -0,0 +1,44 @@
+# Generated by Django 6.0 on 2026-10-18 09:41
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('quiz', '0006_leaderboard_snapshot'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='studyplan',
+            name='competitive_score',
+            field=models.FloatField(default=0),
+        ),
+        migrations.AddField(
+            model_name='studyplan',
+            name='mastery_index_score',
+            field=models.FloatField(db_index=True, default=0),
+        ),
+        migrations.AddField(
+            model_name='studyplan',
+            name='readiness_score',
+            field=models.FloatField(db_index=True, default=0),
+        ),
+        migrations.AddField(
+            model_name='studyplan',
+            name='volatility_score',
+            field=models.FloatField(default=0),
+        ),
+        migrations.AddField(
+            model_name='studyplan',
+            name='weighted_mastery_score',
+            field=models.FloatField(default=0),
+        ),
+        migrations.AddIndex(
+            model_name='studyplan',
+            index=models.Index(fields=['is_active', '-competitive_score'], name='quiz_studyp_is_acti_de16cf_idx'),
+        ),
+    ]
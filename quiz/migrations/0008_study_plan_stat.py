@@ -0,0 +1,60 @@
+# Generated by Django 6.0 on 2026-10-18 09:43
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def copy_category_stats(apps, schema_editor):
+    """
+    Seed counters from the JSON maps. Those only hold per-category
+    totals, so the rows get an empty difficulty.
+    """
+    Category = apps.get_model("quiz", "Category")
+    StudyPlan = apps.get_model("quiz", "StudyPlan")
+    StudyPlanStat = apps.get_model("quiz", "StudyPlanStat")
+
+    category_ids = set(Category.objects.values_list("id", flat=True))
+    rows = []
+
+    plans = StudyPlan.objects.exclude(category_stats={}).values_list("id", "category_stats")
+
+    for plan_id, stats in plans.iterator(chunk_size=1000):
+        for key, data in (stats or {}).items():
+            key = str(key)
+            if not key.isdigit() or int(key) not in category_ids:
+                continue
+            rows.append(StudyPlanStat(
+                plan_id=plan_id,
+                category_id=int(key),
+                difficulty="",
+                attempted=data.get("attempted", 0),
+                correct=data.get("correct", 0),
+            ))
+
+    StudyPlanStat.objects.bulk_create(rows, batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('quiz', '0007_study_plan_scores'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='StudyPlanStat',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('difficulty', models.CharField(blank=True, max_length=10)),
+                ('attempted', models.PositiveIntegerField(default=0)),
+                ('correct', models.PositiveIntegerField(default=0)),
+                ('category', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='study_plan_stats', to='quiz.category')),
+                ('plan', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='stat_rows', to='quiz.studyplan')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['category', 'difficulty'], name='quiz_studyp_categor_080c72_idx')],
+                'unique_together': {('plan', 'category', 'difficulty')},
+            },
+        ),
+        migrations.RunPython(copy_category_stats, migrations.RunPython.noop),
+    ]
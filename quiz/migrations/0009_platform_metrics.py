@@ -0,0 +1,35 @@
+# Generated by Django 6.0 on 2026-10-18 09:57
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('quiz', '0008_study_plan_stat'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PlatformMetrics',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('now', 'Now'), ('daily', 'Daily')], max_length=10)),
+                ('date', models.DateField()),
+                ('total_users', models.PositiveIntegerField(default=0)),
+                ('total_user_exams', models.PositiveIntegerField(default=0)),
+                ('total_courses', models.PositiveIntegerField(default=0)),
+                ('total_enrollments', models.PositiveIntegerField(default=0)),
+                ('total_orgs', models.PositiveIntegerField(default=0)),
+                ('total_track_subs', models.PositiveIntegerField(default=0)),
+                ('total_course_subs', models.PositiveIntegerField(default=0)),
+                ('metrics', models.JSONField(blank=True, default=dict)),
+                ('computed_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name_plural': 'Platform metrics',
+                'ordering': ('kind', '-date'),
+                'unique_together': {('kind', 'date')},
+            },
+        ),
+    ]
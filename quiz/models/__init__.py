@@ -5,6 +5,7 @@
 from .category import (
     Domain,
     Category,
+    CategoryClosure,
 )
 
 
@@ -108,8 +109,21 @@ from .study_plan_analytics import (
     StudyPlanAnalyticsSnapshot,
 )
 
+from .study_plan_stat import (
+    StudyPlanStat,
+)
+
 from .leaderboard import (
     LeaderboardEntry,
+    LeaderboardSnapshot,
+)
+
+from .review_state import (
+    QuestionReviewState,
+)
+
+from .platform_metrics import (
+    PlatformMetrics,
 )
 
 
@@ -92,14 +92,13 @@ class Category(models.Model):
     def get_descendants_include_self(self):
         """
         Return this category ID together with all descendant IDs.
-        """
 
-        ids = [self.id]
+        Served from the CategoryClosure table (one indexed query).
+        """
 
-        for child in self.children.all():
-            ids.extend(child.get_descendants_include_self())
+        from quiz.services.category_tree import get_descendant_ids
 
-        return ids
+        return get_descendant_ids(self.id)
 
     @property
     def is_root(self):
@@ -114,14 +113,14 @@ class Category(models.Model):
         Returns ancestors ordered from root -> parent.
         """
 
-        ancestors = []
-        node = self.parent
-
-        while node:
-            ancestors.insert(0, node)
-            node = node.parent
-
-        return ancestors
+        return list(
+            Category.objects
+            .filter(
+                closure_descendants__descendant_id=self.id,
+                closure_descendants__depth__gt=0,
+            )
+            .order_by("-closure_descendants__depth")
+        )
 
     def full_path(self):
         """
@@ -134,4 +133,45 @@ class Category(models.Model):
         names = [c.name for c in ancestors]
         names.append(self.name)
 
-        return " → ".join(names)
\ No newline at end of file
+        return " → ".join(names)
+
+
+# =====================================================
+# CATEGORY CLOSURE (Materialized Tree Index)
+# =====================================================
+
+class CategoryClosure(models.Model):
+    """
+    One row per (ancestor, descendant) pair, including the
+    depth-0 self row. Kept in sync by quiz.signals.
+    """
+
+    ancestor = models.ForeignKey(
+        Category,
+        on_delete=models.CASCADE,
+        related_name="closure_descendants",
+    )
+
+    descendant = models.ForeignKey(
+        Category,
+        on_delete=models.CASCADE,
+        related_name="closure_ancestors",
+    )
+
+    depth = models.PositiveIntegerField(
+        default=0,
+    )
+
+    class Meta:
+        unique_together = ("ancestor", "descendant")
+        indexes = [
+            models.Index(
+                fields=[
+                    "descendant",
+                    "depth",
+                ]
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.ancestor_id} → {self.descendant_id} ({self.depth})"
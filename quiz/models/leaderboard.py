@@ -3,13 +3,27 @@ from django.db import models
 
 
 class LeaderboardEntry(models.Model):
+    """
+    One row per user holding the competitive score of their best
+    active study plan (kept current by quiz.services.leaderboard).
+    """
+
     user = models.OneToOneField(
         User,
         on_delete=models.CASCADE,
     )
 
+    plan = models.ForeignKey(
+        "StudyPlan",
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="+",
+    )
+
     score = models.FloatField(
         default=0,
+        db_index=True,
     )
 
     rank = models.PositiveIntegerField(
@@ -21,4 +35,69 @@ class LeaderboardEntry(models.Model):
     )
 
     def __str__(self):
-        return f"{self.user} - Rank {self.rank}"
\ No newline at end of file
+        return f"{self.user} - Rank {self.rank}"
+
+
+class LeaderboardSnapshot(models.Model):
+    """
+    Precomputed, ranked leaderboard rows per partition:
+
+        "global", "domain:<id>", "season:<YYYY-MM>",
+        "domain:<id>:season:<YYYY-MM>"
+
+    Rebuilt by quiz.services.leaderboard.refresh_leaderboard_snapshots.
+    """
+
+    partition = models.CharField(
+        max_length=64,
+    )
+
+    rank = models.PositiveIntegerField()
+
+    user = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name="+",
+    )
+
+    score = models.FloatField(
+        default=0,
+    )
+
+    percentile = models.FloatField(
+        default=0,
+    )
+
+    readiness = models.FloatField(
+        default=0,
+    )
+
+    xp = models.PositiveIntegerField(
+        default=0,
+    )
+
+    streak = models.PositiveIntegerField(
+        default=0,
+    )
+
+    level = models.PositiveIntegerField(
+        default=1,
+    )
+
+    created_at = models.DateTimeField(
+        auto_now_add=True,
+    )
+
+    class Meta:
+        unique_together = (
+            ("partition", "rank"),
+            ("partition", "user"),
+        )
+
+        ordering = (
+            "partition",
+            "rank",
+        )
+
+    def __str__(self):
+        return f"{self.partition} #{self.rank} - {self.user}"
@@ -0,0 +1,90 @@
+from django.db import models
+
+
+class PlatformMetrics(models.Model):
+    """
+    Pre-aggregated admin dashboard KPIs.
+
+    The "now" row is what the dashboards read; "daily" rows keep
+    one copy per day for trends. Both are written by the
+    rollup_platform_metrics command (quiz.services.platform_metrics).
+
+    The counter columns on the "now" row are also kept current
+    between rollups with F() increments from quiz.signals; all other
+    KPIs live in `metrics` and are as fresh as the last rollup.
+    """
+
+    NOW = "now"
+    DAILY = "daily"
+
+    KIND_CHOICES = (
+        (NOW, "Now"),
+        (DAILY, "Daily"),
+    )
+
+    kind = models.CharField(
+        max_length=10,
+        choices=KIND_CHOICES,
+    )
+
+    date = models.DateField()
+
+    # --------------------------------------------------------
+    # INCREMENTAL COUNTERS
+    # --------------------------------------------------------
+
+    total_users = models.PositiveIntegerField(
+        default=0,
+    )
+
+    total_user_exams = models.PositiveIntegerField(
+        default=0,
+    )
+
+    total_courses = models.PositiveIntegerField(
+        default=0,
+    )
+
+    total_enrollments = models.PositiveIntegerField(
+        default=0,
+    )
+
+    total_orgs = models.PositiveIntegerField(
+        default=0,
+    )
+
+    total_track_subs = models.PositiveIntegerField(
+        default=0,
+    )
+
+    total_course_subs = models.PositiveIntegerField(
+        default=0,
+    )
+
+    # --------------------------------------------------------
+    # ROLLUP
+    # --------------------------------------------------------
+
+    metrics = models.JSONField(
+        default=dict,
+        blank=True,
+    )
+
+    computed_at = models.DateTimeField(
+        auto_now=True,
+    )
+
+    class Meta:
+        unique_together = (
+            ("kind", "date"),
+        )
+
+        ordering = (
+            "kind",
+            "-date",
+        )
+
+        verbose_name_plural = "Platform metrics"
+
+    def __str__(self):
+        return f"{self.get_kind_display()} metrics ({self.date})"
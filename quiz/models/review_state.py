@@ -0,0 +1,60 @@
+from django.conf import settings
+from django.db import models
+
+from .question import Question
+
+
+class QuestionReviewState(models.Model):
+    """
+    Spaced-repetition state of one question for one user.
+
+    Updated on every study plan answer (quiz.services.review_state)
+    and read by the adaptive engine.
+    """
+
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="question_reviews",
+    )
+
+    question = models.ForeignKey(
+        Question,
+        on_delete=models.CASCADE,
+        related_name="review_states",
+    )
+
+    last_seen_at = models.DateTimeField()
+
+    due_at = models.DateTimeField()
+
+    ease = models.FloatField(
+        default=2.5,
+    )
+
+    interval_minutes = models.PositiveIntegerField(
+        default=0,
+    )
+
+    repetitions = models.PositiveSmallIntegerField(
+        default=0,
+    )
+
+    mistake_count = models.PositiveSmallIntegerField(
+        default=0,
+    )
+
+    class Meta:
+        unique_together = (
+            "user",
+            "question",
+        )
+
+        indexes = [
+            models.Index(
+                fields=["user", "due_at"]
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.user} | Q{self.question_id} | due {self.due_at:%Y-%m-%d %H:%M}"
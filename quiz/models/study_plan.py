@@ -159,6 +159,57 @@ class StudyPlan(models.Model):
         default=False,
     )
 
+    # =====================================================
+    # DENORMALIZED SCORES
+    # =====================================================
+    # Stored copies of the scoring methods below so they can be
+    # filtered, sorted and aggregated in SQL. Kept in sync by
+    # save() (see refresh_scores).
+
+    readiness_score = models.FloatField(
+        default=0,
+        db_index=True,
+    )
+
+    weighted_mastery_score = models.FloatField(
+        default=0,
+    )
+
+    mastery_index_score = models.FloatField(
+        default=0,
+        db_index=True,
+    )
+
+    volatility_score = models.FloatField(
+        default=0,
+    )
+
+    competitive_score = models.FloatField(
+        default=0,
+    )
+
+    # Fields the scores are derived from
+    SCORE_SOURCE_FIELDS = frozenset({
+        "total_days",
+        "questions_per_day",
+        "extension_days",
+        "daily_progress",
+        "total_attempted",
+        "total_correct",
+        "difficulty_stats",
+        "performance_history",
+        "current_streak",
+        "xp",
+    })
+
+    SCORE_FIELDS = (
+        "readiness_score",
+        "weighted_mastery_score",
+        "mastery_index_score",
+        "volatility_score",
+        "competitive_score",
+    )
+
     # =====================================================
     # META
     # =====================================================
@@ -171,6 +222,9 @@ class StudyPlan(models.Model):
             models.Index(
                 fields=["user", "is_completed"]
             ),
+            models.Index(
+                fields=["is_active", "-competitive_score"]
+            ),
         ]
 
     # =====================================================
@@ -193,6 +247,31 @@ class StudyPlan(models.Model):
                 "question_ids must be a list."
             )
 
+    # =====================================================
+    # SAVE
+    # =====================================================
+
+    def refresh_scores(self):
+        self.readiness_score = self.certification_readiness()
+        self.weighted_mastery_score = self.difficulty_weighted_mastery()
+        self.mastery_index_score = self.mastery_index()
+        self.volatility_score = self.score_volatility()
+        self.competitive_score = self.global_competitive_score()
+
+    def save(self, *args, **kwargs):
+        update_fields = kwargs.get("update_fields")
+
+        if update_fields is None:
+            self.refresh_scores()
+
+        elif self.SCORE_SOURCE_FIELDS.intersection(update_fields):
+            self.refresh_scores()
+            kwargs["update_fields"] = (
+                set(update_fields) | set(self.SCORE_FIELDS)
+            )
+
+        super().save(*args, **kwargs)
+
     # =====================================================
     # PLAN CALCULATIONS
     # =====================================================
@@ -365,9 +444,12 @@ class StudyPlan(models.Model):
     # =====================================================
 
     def get_category_accuracy(self, category_id):
-        stats = self.category_stats or {}
+        from quiz.services.plan_stats import category_stats
 
-        data = stats.get(
+        data = category_stats(
+            self.id,
+            [category_id],
+        ).get(
             str(category_id)
         )
 
@@ -876,23 +958,21 @@ class StudyPlan(models.Model):
     # DAILY ANALYTICS SNAPSHOT
     # =====================================================
 
-    def save_daily_snapshot(self):
+    def build_daily_snapshot(self):
+        """
+        Unsaved StudyPlanAnalyticsSnapshot for today (see the
+        snapshot_study_plans command).
+        """
+
         from .study_plan_analytics import (
             StudyPlanAnalyticsSnapshot
         )
 
-        today = timezone.now().date()
-
-        if self.snapshots.filter(
-            date=today
-        ).exists():
-            return
-
         prediction = (
             self.certification_prediction()
         )
 
-        StudyPlanAnalyticsSnapshot.objects.create(
+        return StudyPlanAnalyticsSnapshot(
             plan=self,
             accuracy=self.accuracy_percentage(),
             readiness=self.certification_readiness(),
@@ -908,6 +988,16 @@ class StudyPlan(models.Model):
             level=self.level,
         )
 
+    def save_daily_snapshot(self):
+        today = timezone.now().date()
+
+        if self.snapshots.filter(
+            date=today
+        ).exists():
+            return
+
+        self.build_daily_snapshot().save()
+
     # =====================================================
     # MASTERY INDEX
     # =====================================================
@@ -4,6 +4,10 @@ from django.db import models
 class StudyPlanAnalyticsSnapshot(models.Model):
     """
     Daily analytics snapshot for a StudyPlan.
+
+    Written only by the snapshot_study_plans command, which must be
+    scheduled nightly (README.txt, "Scheduled jobs"); a day it does
+    not run has no snapshot.
     """
 
     plan = models.ForeignKey(
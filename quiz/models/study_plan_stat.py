@@ -0,0 +1,59 @@
+from django.db import models
+
+
+class StudyPlanStat(models.Model):
+    """
+    Answer counters of one study plan per (category, difficulty).
+
+    Incremented with F() expressions on every study plan answer
+    (quiz.services.plan_stats). Rows migrated from the legacy JSON
+    maps carry an empty difficulty, since those only held per-category
+    totals.
+    """
+
+    plan = models.ForeignKey(
+        "StudyPlan",
+        on_delete=models.CASCADE,
+        related_name="stat_rows",
+    )
+
+    category = models.ForeignKey(
+        "Category",
+        null=True,
+        blank=True,
+        on_delete=models.CASCADE,
+        related_name="study_plan_stats",
+    )
+
+    difficulty = models.CharField(
+        max_length=10,
+        blank=True,
+    )
+
+    attempted = models.PositiveIntegerField(
+        default=0,
+    )
+
+    correct = models.PositiveIntegerField(
+        default=0,
+    )
+
+    class Meta:
+        unique_together = (
+            "plan",
+            "category",
+            "difficulty",
+        )
+
+        indexes = [
+            models.Index(
+                fields=["category", "difficulty"]
+            ),
+        ]
+
+    def __str__(self):
+        return (
+            f"{self.plan_id} | "
+            f"{self.category_id} | "
+            f"{self.difficulty or '-'}"
+        )
@@ -89,6 +89,15 @@ class UserExam(SafeStrMixin, models.Model):
         default=0,
     )
 
+    # =====================================================
+    # AUTOSAVE
+    # =====================================================
+
+    autosave_seq = models.PositiveIntegerField(
+        default=0,
+        help_text="Last applied client autosave sequence number",
+    )
+
     # =====================================================
     # RESULT
     # =====================================================
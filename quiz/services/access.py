@@ -1,14 +1,14 @@
-from django.utils import timezone
-
-from quiz.models import (
-    ExamSubscription,
-    ExamTrackSubscription,
-)
+from quiz.services.access_resolver import get_access_resolver
 
 
 # ============================================================
 # EXAM ACCESS
 # ============================================================
+# Every check below is answered by the request-scoped
+# AccessResolver (quiz.services.access_resolver): the user's
+# subscription rows are loaded once per request, and expired
+# rows are deactivated by the deactivate_expired_subscriptions job
+# instead of on read.
 
 def can_access_exam(user, exam):
     """
@@ -20,114 +20,17 @@ def can_access_exam(user, exam):
 
         (False, reason)
             Access is denied.
-    """
 
-    now = timezone.now()
+    Rules:
 
-    # --------------------------------------------------------
-    # USER AUTHENTICATION
-    # --------------------------------------------------------
+    1. Login required, exam must be published.
+    2. Free exams are open.
+    3. Track-scoped exams need a valid ExamTrackSubscription
+       (gives access to all exams under that track).
+    4. Otherwise the exam needs a valid ExamSubscription.
+    """
 
-    if not user or not user.is_authenticated:
-        return False, "Login required"
-
-    # --------------------------------------------------------
-    # EXAM PUBLISHED CHECK
-    # --------------------------------------------------------
-
-    if not exam.is_published:
-        return False, "Exam is not published"
-
-    # --------------------------------------------------------
-    # FREE EXAM
-    # --------------------------------------------------------
-
-    if exam.is_free:
-        return True, None
-
-    # --------------------------------------------------------
-    # TRACK-LEVEL SUBSCRIPTION
-    #
-    # A valid track subscription gives access to
-    # all exams under that track.
-    # --------------------------------------------------------
-
-    if (
-        exam.track
-        and exam.track.subscription_scope
-        == exam.track.TRACK
-    ):
-        track_subscription = (
-            ExamTrackSubscription.objects.filter(
-                user=user,
-                track=exam.track,
-                is_active=True,
-            )
-            .first()
-        )
-
-        if not track_subscription:
-            return (
-                False,
-                "Subscription required for this track",
-            )
-
-        # ----------------------------------------------------
-        # CHECK EXPIRATION
-        # ----------------------------------------------------
-
-        if (
-            track_subscription.expires_at
-            and track_subscription.expires_at <= now
-        ):
-            track_subscription.is_active = False
-
-            track_subscription.save(
-                update_fields=["is_active"]
-            )
-
-            return False, "Subscription expired"
-
-        return True, None
-
-    # --------------------------------------------------------
-    # EXAM-LEVEL SUBSCRIPTION
-    #
-    # Used when the exam itself requires a subscription.
-    # --------------------------------------------------------
-
-    exam_subscription = (
-        ExamSubscription.objects.filter(
-            user=user,
-            exam=exam,
-            is_active=True,
-        )
-        .first()
-    )
-
-    if not exam_subscription:
-        return (
-            False,
-            "Subscription required for this exam",
-        )
-
-    # --------------------------------------------------------
-    # CHECK EXPIRATION
-    # --------------------------------------------------------
-
-    if (
-        exam_subscription.expires_at
-        and exam_subscription.expires_at <= now
-    ):
-        exam_subscription.is_active = False
-
-        exam_subscription.save(
-            update_fields=["is_active"]
-        )
-
-        return False, "Subscription expired"
-
-    return True, None
+    return get_access_resolver(user).can_access_exam(exam)
 
 
 # ============================================================
@@ -146,37 +49,7 @@ def has_active_track_subscription(user, track):
     if not track:
         return False
 
-    now = timezone.now()
-
-    subscription = (
-        ExamTrackSubscription.objects.filter(
-            user=user,
-            track=track,
-            is_active=True,
-        )
-        .first()
-    )
-
-    if not subscription:
-        return False
-
-    # --------------------------------------------------------
-    # CHECK EXPIRATION
-    # --------------------------------------------------------
-
-    if (
-        subscription.expires_at
-        and subscription.expires_at <= now
-    ):
-        subscription.is_active = False
-
-        subscription.save(
-            update_fields=["is_active"]
-        )
-
-        return False
-
-    return True
+    return get_access_resolver(user).has_track_subscription(track.id)
 
 
 # ============================================================
@@ -199,32 +72,4 @@ def user_has_course_access(user, course):
     ExamTrackSubscription.track points to ExamTrack.
     """
 
-    if not user or not user.is_authenticated:
-        return False
-
-    if not course:
-        return False
-
-    # --------------------------------------------------------
-    # ACTIVE SUBSCRIPTION PLANS
-    # --------------------------------------------------------
-
-    plans = course.subscription_plans.filter(
-        is_active=True
-    )
-
-    # --------------------------------------------------------
-    # FREE COURSE / TRACK
-    # --------------------------------------------------------
-
-    if not plans.exists():
-        return True
-
-    # --------------------------------------------------------
-    # PAID COURSE / TRACK
-    # --------------------------------------------------------
-
-    return has_active_track_subscription(
-        user=user,
-        track=course,
-    )
\ No newline at end of file
+    return get_access_resolver(user).user_has_course_access(course)
@@ -0,0 +1,181 @@
+# quiz/services/access_resolver.py
+
+from django.utils import timezone
+
+from quiz.services.entitlements import get_entitlements
+
+
+# ============================================================
+# PER-REQUEST ACCESS RESOLVER
+# ============================================================
+# All of a user's subscription / grant rows are loaded once and
+# every access question is answered from memory. The rows come
+# from the entitlement snapshot (quiz.services.entitlements),
+# cached across requests when a shared cache is configured.
+#
+# The resolver is stored on the user object, and request.user is
+# built per request, so its lifetime is one request.
+#
+# Expired rows are treated as invalid but never written here;
+# flipping `is_active` is left to the deactivate_expired_subscriptions
+# command (quiz.services.subscription_cleanup).
+
+_RESOLVER_ATTR = "_access_resolver"
+
+
+class AccessResolver:
+
+    def __init__(self, user):
+        self.user = user
+        self.now = timezone.now()
+        self._loaded = False
+        self._track_plans = {}
+
+    # --------------------------------------------------------
+    # LOAD (once per request)
+    # --------------------------------------------------------
+
+    def _load(self):
+        if self._loaded:
+            return
+
+        self._loaded = True
+
+        if not self.user or not self.user.is_authenticated:
+            snapshot = {}
+        else:
+            snapshot = get_entitlements(self.user.id)
+
+        self.exam_subs = snapshot.get("exam_subs", {})
+        self.track_subs = snapshot.get("track_subs", {})
+        self.course_subs = snapshot.get("course_subs", {})
+
+        self.org_exam_ids = snapshot.get("org_exam_ids", set())
+        self.org_track_ids = snapshot.get("org_track_ids", set())
+        self.org_course_ids = snapshot.get("org_course_ids", set())
+
+    def _is_valid(self, sub) -> bool:
+        if sub is None or not sub.is_active:
+            return False
+        return not (sub.expires_at and sub.expires_at <= self.now)
+
+    # --------------------------------------------------------
+    # ROW LOOKUPS
+    # --------------------------------------------------------
+
+    def track_subscription(self, track_id):
+        self._load()
+        return self.track_subs.get(track_id)
+
+    def exam_subscription(self, exam_id):
+        self._load()
+        return self.exam_subs.get(exam_id)
+
+    def course_subscription(self, course_id):
+        self._load()
+        return self.course_subs.get(course_id)
+
+    def active_course_subscriptions(self):
+        self._load()
+        return [s for s in self.course_subs.values() if s.is_active]
+
+    # --------------------------------------------------------
+    # VALIDITY
+    # --------------------------------------------------------
+
+    def has_track_subscription(self, track_id) -> bool:
+        return self._is_valid(self.track_subscription(track_id))
+
+    def has_exam_subscription(self, exam_id) -> bool:
+        return self._is_valid(self.exam_subscription(exam_id))
+
+    def has_course_subscription(self, course_id) -> bool:
+        return self._is_valid(self.course_subscription(course_id))
+
+    def has_org_exam_access(self, exam) -> bool:
+        self._load()
+        return (
+            exam.id in self.org_exam_ids
+            or (exam.track_id is not None and exam.track_id in self.org_track_ids)
+        )
+
+    def has_org_course_access(self, course_id) -> bool:
+        self._load()
+        return course_id in self.org_course_ids
+
+    # --------------------------------------------------------
+    # ACCESS QUESTIONS
+    # --------------------------------------------------------
+
+    def can_access_exam(self, exam):
+        """
+        Same rules and messages as quiz.services.access.can_access_exam.
+        """
+
+        if not self.user or not self.user.is_authenticated:
+            return False, "Login required"
+
+        if not exam.is_published:
+            return False, "Exam is not published"
+
+        if exam.is_free:
+            return True, None
+
+        track = exam.track
+
+        if track and track.subscription_scope == track.TRACK:
+            sub = self.track_subscription(track.id)
+            if sub is None or not sub.is_active:
+                return False, "Subscription required for this track"
+            if not self._is_valid(sub):
+                return False, "Subscription expired"
+            return True, None
+
+        sub = self.exam_subscription(exam.id)
+        if sub is None or not sub.is_active:
+            return False, "Subscription required for this exam"
+        if not self._is_valid(sub):
+            return False, "Subscription expired"
+        return True, None
+
+    def track_has_paid_plans(self, track) -> bool:
+        if track.id not in self._track_plans:
+            self._track_plans[track.id] = track.subscription_plans.filter(
+                is_active=True
+            ).exists()
+        return self._track_plans[track.id]
+
+    def user_has_course_access(self, course) -> bool:
+        """
+        `course` is the ExamTrack (see quiz.services.access).
+        """
+
+        if not self.user or not self.user.is_authenticated or not course:
+            return False
+
+        if not self.track_has_paid_plans(course):
+            return True
+
+        return self.has_track_subscription(course.id)
+
+
+# ============================================================
+# PUBLIC API
+# ============================================================
+
+def get_access_resolver(user) -> AccessResolver:
+    """
+    The request-scoped resolver for `user` (created on first use).
+    """
+
+    resolver = getattr(user, _RESOLVER_ATTR, None) if user else None
+
+    if resolver is None:
+        resolver = AccessResolver(user)
+        if user is not None:
+            try:
+                setattr(user, _RESOLVER_ATTR, resolver)
+            except AttributeError:
+                pass
+
+    return resolver
@@ -1,8 +1,14 @@
 import random
-import time
+from bisect import bisect_left
+from itertools import accumulate
 
+from django.utils import timezone
 
-def select_adaptive_question(plan, questions_queryset, request=None):
+from quiz.services.plan_stats import category_stats as get_category_stats
+from quiz.services.review_state import get_review_states
+
+
+def select_adaptive_question(plan, questions_queryset):
     """
     Advanced Adaptive Engine (Production Safe)
 
@@ -11,166 +17,185 @@ def select_adaptive_question(plan, questions_queryset, request=None):
     - Difficulty targeting based on mastery
     - Streak escalation
     - Mistake reinforcement
-    - Spaced repetition decay
+    - Spaced repetition decay (QuestionReviewState)
     - Exam mode simulation
     - Volatility stabilization
+
+    Scores compact (id, category_id, difficulty) rows: factors that
+    depend only on category / difficulty are computed once per group,
+    selection is a binary search over cumulative weights, and only
+    the winning Question is fetched (with the queryset's prefetches).
     """
 
-    questions = list(questions_queryset)
+    # Compact rows only: (id, category_id, difficulty)
+    rows = list(
+        questions_queryset
+        .order_by()
+        .prefetch_related(None)
+        .values_list("id", "category_id", "difficulty")
+    )
 
-    if not questions:
+    if not rows:
         return None
 
-    category_stats = plan.category_stats or {}
-    difficulty_stats = plan.difficulty_stats or {}
+    # Counters for the candidate categories only
+    category_stats = get_category_stats(
+        plan.id,
+        {category_id for _, category_id, _ in rows},
+    )
 
     mastery = plan.accuracy_percentage()
     streak = plan.current_streak or 0
 
-    # Session-based adaptive signals
-    mistakes = request.session.get("recent_mistakes", {}) if request else {}
-    history = request.session.get("question_history", {}) if request else {}
+    # Persistent review signals: {qid: (last_seen_at, due_at, mistakes)}
+    reviews = get_review_states(plan.user_id, [row[0] for row in rows])
     exam_mode = getattr(plan, "exam_mode", False)
 
     # Optional volatility stabilizer
     volatility = getattr(plan, "score_volatility", lambda: 0.1)()
     volatility_factor = 1 + min(volatility, 0.3)
 
-    weighted_pool = []
-    now = time.time()
-
-    for q in questions:
-
-        qid_str = str(q.id)
+    # ==========================================================
+    # 3️⃣ STREAK ESCALATION (same for every question)
+    # ==========================================================
+    streak_bonus = 1 + min(streak / 25, 0.4)
 
-        # ==========================================================
-        # 1️⃣ CATEGORY WEIGHT
-        # ==========================================================
-        cat_key = str(q.category_id)
-        cat_data = category_stats.get(cat_key, {})
+    # ==========================================================
+    # 1️⃣ 2️⃣ 6️⃣ GROUP WEIGHTS
+    # Category, difficulty and exam-mode factors depend only on
+    # (category_id, difficulty): computed once per group.
+    # ==========================================================
+    group_weights = {}
+
+    for _, category_id, difficulty in rows:
+        group = (category_id, difficulty)
+        if group not in group_weights:
+            group_weights[group] = (
+                _group_weight(
+                    category_stats.get(str(category_id), {}),
+                    difficulty,
+                    mastery,
+                    exam_mode,
+                )
+                * streak_bonus
+                * volatility_factor
+            )
+
+    now = timezone.now()
 
-        attempted = cat_data.get("attempted", 0)
-        correct = cat_data.get("correct", 0)
+    # ==========================================================
+    # 4️⃣ 5️⃣ PER-QUESTION SIGNALS + CUMULATIVE WEIGHTS
+    # ==========================================================
+    weights = []
 
-        if attempted > 0:
-            cat_accuracy = correct / attempted
-        else:
-            cat_accuracy = 0.5  # neutral
+    for qid, category_id, difficulty in rows:
+        weight = group_weights[(category_id, difficulty)]
 
-        # Weak categories boosted
-        category_weight = 1 + (1 - cat_accuracy) * 1.8
+        review = reviews.get(qid)
 
+        if review:
+            last_seen_at, due_at, mistakes = review
 
-        # ==========================================================
-        # 2️⃣ DIFFICULTY TARGETING
-        # ==========================================================
-        difficulty_weight = 1
+            if mistakes:
+                weight *= 1 + min(mistakes * 0.4, 2.0)
 
-        if mastery < 60:
-            if q.difficulty == "easy":
-                difficulty_weight = 1.6
-            elif q.difficulty == "medium":
-                difficulty_weight = 1.2
+            if due_at <= now:
+                weight *= 1.3
             else:
-                difficulty_weight = 0.7
-
-        elif mastery < 80:
-            if q.difficulty == "medium":
-                difficulty_weight = 1.5
-            elif q.difficulty == "hard":
-                difficulty_weight = 1.2
-
-        else:
-            if q.difficulty == "hard":
-                difficulty_weight = 1.6
-            elif q.difficulty == "medium":
-                difficulty_weight = 1.3
-
-
-        # ==========================================================
-        # 3️⃣ STREAK ESCALATION
-        # ==========================================================
-        streak_bonus = 1 + min(streak / 25, 0.4)
+                weight *= _spacing_weight(
+                    (now - last_seen_at).total_seconds()
+                )
 
+        # Prevent extreme explosion, then controlled randomness
+        weights.append(max(weight, 0.05) * random.uniform(0.92, 1.08))
 
-        # ==========================================================
-        # 4️⃣ MISTAKE REINFORCEMENT
-        # ==========================================================
-        mistake_weight = 1
+    cumulative = list(accumulate(weights))
 
-        if qid_str in mistakes:
-            mistake_weight += min(mistakes[qid_str] * 0.4, 2.0)
-
-
-        # ==========================================================
-        # 5️⃣ SPACED REPETITION DECAY
-        # ==========================================================
-        spacing_weight = 1
+    # ==========================================================
+    # WEIGHTED RANDOM SELECTION (binary search)
+    # ==========================================================
+    if cumulative[-1] <= 0:
+        winner = random.choice(rows)[0]
+    else:
+        i = bisect_left(cumulative, random.uniform(0, cumulative[-1]))
+        winner = rows[min(i, len(rows) - 1)][0]
 
-        if qid_str in history:
-            time_since = now - history[qid_str]
+    # Only the winner is loaded as a model instance
+    return questions_queryset.filter(id=winner).first()
 
-            if time_since < 300:
-                spacing_weight = 0.4
-            elif time_since < 1800:
-                spacing_weight = 0.7
-            elif time_since > 86400:
-                spacing_weight = 1.3
-            else:
-                spacing_weight = 1
 
+def _group_weight(cat_data, difficulty, mastery, exam_mode):
+    """
+    Category x difficulty x exam-mode factor of one
+    (category, difficulty) group.
+    """
 
-        # ==========================================================
-        # 6️⃣ EXAM MODE SIMULATION
-        # ==========================================================
-        exam_weight = 1
-
-        if exam_mode:
-            # Reduce reinforcement bias
-            category_weight = 1 + (1 - cat_accuracy)
+    # ==========================================================
+    # 1️⃣ CATEGORY WEIGHT
+    # ==========================================================
+    attempted = cat_data.get("attempted", 0)
+    correct = cat_data.get("correct", 0)
 
-            # Favor realistic exam difficulty
-            if q.difficulty == "hard":
-                exam_weight = 1.3
-            elif q.difficulty == "medium":
-                exam_weight = 1.2
+    if attempted > 0:
+        cat_accuracy = correct / attempted
+    else:
+        cat_accuracy = 0.5  # neutral
 
+    # Weak categories boosted
+    category_weight = 1 + (1 - cat_accuracy) * 1.8
 
-        # ==========================================================
-        # 7️⃣ FINAL WEIGHT
-        # ==========================================================
-        final_weight = (
-            category_weight *
-            difficulty_weight *
-            streak_bonus *
-            mistake_weight *
-            spacing_weight *
-            exam_weight *
-            volatility_factor
-        )
+    # ==========================================================
+    # 2️⃣ DIFFICULTY TARGETING
+    # ==========================================================
+    difficulty_weight = 1
 
-        # Prevent extreme explosion
-        final_weight = max(final_weight, 0.05)
+    if mastery < 60:
+        if difficulty == "easy":
+            difficulty_weight = 1.6
+        elif difficulty == "medium":
+            difficulty_weight = 1.2
+        else:
+            difficulty_weight = 0.7
 
-        # Controlled randomness
-        final_weight *= random.uniform(0.92, 1.08)
+    elif mastery < 80:
+        if difficulty == "medium":
+            difficulty_weight = 1.5
+        elif difficulty == "hard":
+            difficulty_weight = 1.2
 
-        weighted_pool.append((q, final_weight))
+    else:
+        if difficulty == "hard":
+            difficulty_weight = 1.6
+        elif difficulty == "medium":
+            difficulty_weight = 1.3
 
     # ==========================================================
-    # WEIGHTED RANDOM SELECTION
+    # 6️⃣ EXAM MODE SIMULATION
     # ==========================================================
-    total_weight = sum(w for _, w in weighted_pool)
+    exam_weight = 1
 
-    if total_weight <= 0:
-        return random.choice(questions)
+    if exam_mode:
+        # Reduce reinforcement bias
+        category_weight = 1 + (1 - cat_accuracy)
 
-    r = random.uniform(0, total_weight)
-    upto = 0
+        # Favor realistic exam difficulty
+        if difficulty == "hard":
+            exam_weight = 1.3
+        elif difficulty == "medium":
+            exam_weight = 1.2
 
-    for q, w in weighted_pool:
-        upto += w
-        if upto >= r:
-            return q
+    return category_weight * difficulty_weight * exam_weight
+
+
+def _spacing_weight(time_since):
+    """
+    5️⃣ Spaced repetition decay (review not yet due).
+    """
 
-    return questions[0]
\ No newline at end of file
+    if time_since < 300:
+        return 0.4
+    if time_since < 1800:
+        return 0.7
+    if time_since > 86400:
+        return 1.3
+    return 1
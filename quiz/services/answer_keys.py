@@ -0,0 +1,119 @@
+# quiz/services/answer_keys.py
+
+from typing import Dict, Iterable, Optional
+
+from django.core.cache import cache
+
+from core.utils.cache import is_shared_cache
+from quiz.models import Question, Choice
+
+
+# ============================================================
+# CACHE
+# ============================================================
+# Bump ANSWER_KEY_VERSION whenever the key layout below changes;
+# per-question entries are dropped by quiz.signals on every
+# Question / Choice save or delete.
+#
+# A corrected key must grade on every worker at once, so keys are
+# only cached across requests on a shared cache (see
+# core.utils.cache); otherwise each batch is built in two queries.
+
+ANSWER_KEY_VERSION = 1
+ANSWER_KEY_TIMEOUT = 60 * 60 * 24  # 24 hours
+
+
+def _cache_key(question_id) -> str:
+    return f"quiz:answer_key:v{ANSWER_KEY_VERSION}:{question_id}"
+
+
+def invalidate_answer_keys(question_ids: Iterable[int]) -> None:
+    cache.delete_many([_cache_key(qid) for qid in question_ids if qid])
+
+
+# ============================================================
+# BUILD
+# ============================================================
+
+def _build_answer_keys(qids) -> Dict[int, dict]:
+    keys = {
+        row["id"]: {
+            "question_type": row["question_type"],
+            "choice_ids": set(),
+            "correct_choice_ids": set(),
+            "correct_text": row["correct_text"],
+            "numeric_answer": row["numeric_answer"],
+            "tolerance": row["numeric_tolerance"] or 0.0,
+        }
+        for row in Question.objects.filter(id__in=qids).values(
+            "id",
+            "question_type",
+            "correct_text",
+            "numeric_answer",
+            "numeric_tolerance",
+        )
+    }
+
+    if keys:
+        choices = Choice.objects.filter(question_id__in=keys).values_list(
+            "id", "question_id", "is_correct"
+        )
+        for cid, qid, is_correct in choices:
+            keys[qid]["choice_ids"].add(cid)
+            if is_correct:
+                keys[qid]["correct_choice_ids"].add(cid)
+
+    return keys
+
+
+# ============================================================
+# PUBLIC API
+# ============================================================
+
+def get_answer_keys(qids) -> Dict[int, dict]:
+    """
+    Answer keys for a batch of questions:
+
+    {
+        question_id: {
+            "question_type": "single",
+            "choice_ids": {..},          # every choice of the question
+            "correct_choice_ids": {..},
+            "correct_text": "...",
+            "numeric_answer": 4.2,
+            "tolerance": 0.0,
+        }
+    }
+
+    Served from cache; misses are built in two queries and stored.
+    """
+
+    qids = [int(q) for q in qids]
+
+    if not is_shared_cache():
+        return _build_answer_keys(qids)
+
+    cached = cache.get_many([_cache_key(qid) for qid in qids])
+
+    keys = {}
+    missing = []
+    for qid in qids:
+        key = cached.get(_cache_key(qid))
+        if key is None:
+            missing.append(qid)
+        else:
+            keys[qid] = key
+
+    if missing:
+        built = _build_answer_keys(missing)
+        cache.set_many(
+            {_cache_key(qid): key for qid, key in built.items()},
+            ANSWER_KEY_TIMEOUT,
+        )
+        keys.update(built)
+
+    return keys
+
+
+def get_answer_key(question_id) -> Optional[dict]:
+    return get_answer_keys([question_id]).get(int(question_id))
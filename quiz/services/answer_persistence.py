@@ -1,115 +1,43 @@
 from django.db import transaction
+from django.http import QueryDict
 
 from quiz.models import (
     UserExam,
     UserAnswer,
-    Question,
-    Choice,
 )
+from quiz.services.answer_keys import get_answer_keys
 
 
-def autosave_answers(
-    ue: UserExam,
-    post_data,
-):
+ANSWER_FIELDS = [
+    "choice",
+    "selections",
+    "raw_answer",
+    "is_correct",
+]
+
+
+def _parse_posted(post_data):
     """
-    Persist partial answers safely.
-    - Autosave-safe (does not erase existing answers)
-    - Uses select_for_update to avoid race conditions
-    - Supports all question types including match/order
+    Split the posted form into:
+      - standard: {question_id: [values]}
+      - matches:  {question_id: {left_index: value}}
     """
 
-    # Build posted map: key -> list(values)
-    posted = {}
+    standard = {}
+    matches = {}
+
     for k in post_data.keys():
         if k == "csrfmiddlewaretoken":
             continue
-        posted[k] = post_data.getlist(k)
-
-    question_keys = [k for k in posted if k.startswith("question_")]
-    match_keys = [k for k in posted if k.startswith("match_")]
 
-    # ==================================================
-    # STANDARD QUESTION TYPES
-    # ==================================================
-    for qkey in question_keys:
-        try:
-            qid = int(qkey.split("_", 1)[1])
-        except Exception:
-            continue
-
-        try:
-            q = Question.objects.get(pk=qid)
-        except Question.DoesNotExist:
-            continue
+        if k.startswith("question_"):
+            try:
+                qid = int(k.split("_", 1)[1])
+            except Exception:
+                continue
+            standard[qid] = post_data.getlist(k)
 
-        ua, _ = UserAnswer.objects.get_or_create(
-            user_exam=ue,
-            question=q
-        )
-
-        with transaction.atomic():
-            ua = UserAnswer.objects.select_for_update().get(pk=ua.pk)
-            vals = posted.get(qkey) or []
-
-            # ----------------------------------------------
-            # SINGLE / DROPDOWN / TRUE-FALSE
-            # ----------------------------------------------
-            if q.question_type in ("single", "dropdown", "tf"):
-                if not vals:
-                    continue
-
-                try:
-                    choice_id = int(str(vals[0]).strip())
-                except Exception:
-                    continue
-
-                try:
-                    ch = Choice.objects.get(pk=choice_id, question=q)
-                except Choice.DoesNotExist:
-                    continue
-
-                ua.choice = ch
-                ua.selections = None
-                ua.raw_answer = None
-                ua.is_correct = bool(ch.is_correct)
-                ua.save()
-
-            # ----------------------------------------------
-            # MULTI SELECT
-            # ----------------------------------------------
-            elif q.question_type == "multi":
-                sel_ids = []
-                for v in vals:
-                    try:
-                        sel_ids.append(int(str(v).strip()))
-                    except Exception:
-                        pass
-
-                ua.selections = sel_ids
-                ua.choice = None
-                ua.raw_answer = None
-                ua.is_correct = None
-                ua.save()
-
-            # ----------------------------------------------
-            # FILL / NUMERIC / ORDER
-            # ----------------------------------------------
-            elif q.question_type in ("fill", "numeric", "order"):
-                raw = vals[0] if vals else ""
-                ua.raw_answer = (raw or "").strip()
-                ua.choice = None
-                ua.selections = None
-                ua.is_correct = None
-                ua.save()
-
-    # ==================================================
-    # MATCH TYPE (KEYED INPUTS)
-    # ==================================================
-    if match_keys:
-        match_by_q = {}
-
-        for k in match_keys:
+        elif k.startswith("match_"):
             parts = k.split("_")
             if len(parts) < 3:
                 continue
@@ -118,38 +46,216 @@ def autosave_answers(
                 li = int(parts[2])
             except Exception:
                 continue
+            vals = post_data.getlist(k)
+            matches.setdefault(qid, {})[li] = vals[0] if vals else ""
+
+    return standard, matches
 
-            match_by_q.setdefault(qid, {})[li] = posted.get(k)[0] if posted.get(k) else ""
 
-        for qid, mapping in match_by_q.items():
+def _apply_standard(ua: UserAnswer, key: dict, vals) -> bool:
+    """
+    Apply posted values to `ua` in memory.
+    Returns True when the row changed.
+    """
+
+    question_type = key["question_type"]
+    before = (ua.choice_id, ua.selections, ua.raw_answer, ua.is_correct)
+
+    # ----------------------------------------------
+    # SINGLE / DROPDOWN / TRUE-FALSE
+    # ----------------------------------------------
+    if question_type in ("single", "dropdown", "tf"):
+        if not vals:
+            return False
+
+        try:
+            choice_id = int(str(vals[0]).strip())
+        except Exception:
+            return False
+
+        if choice_id not in key["choice_ids"]:
+            return False
+
+        ua.choice_id = choice_id
+        ua.selections = None
+        ua.raw_answer = None
+        ua.is_correct = choice_id in key["correct_choice_ids"]
+
+    # ----------------------------------------------
+    # MULTI SELECT
+    # ----------------------------------------------
+    elif question_type == "multi":
+        sel_ids = []
+        for v in vals:
             try:
-                q = Question.objects.get(pk=qid)
-            except Question.DoesNotExist:
-                continue
+                sel_ids.append(int(str(v).strip()))
+            except Exception:
+                pass
+
+        ua.selections = sel_ids
+        ua.choice_id = None
+        ua.raw_answer = None
+        ua.is_correct = None
+
+    # ----------------------------------------------
+    # FILL / NUMERIC / ORDER
+    # ----------------------------------------------
+    elif question_type in ("fill", "numeric", "order"):
+        raw = vals[0] if vals else ""
+        ua.raw_answer = (raw or "").strip()
+        ua.choice_id = None
+        ua.selections = None
+        ua.is_correct = None
+
+    else:
+        return False
+
+    return before != (ua.choice_id, ua.selections, ua.raw_answer, ua.is_correct)
+
+
+def _apply_match(ua: UserAnswer, mapping) -> bool:
+    user_map = dict(ua.selections) if isinstance(ua.selections, dict) else {}
+    changed = False
+
+    for li, val in mapping.items():
+        if not val:
+            if str(li) in user_map:
+                user_map.pop(str(li), None)
+                changed = True
+        elif user_map.get(str(li)) != val:
+            user_map[str(li)] = val
+            changed = True
+
+    if changed:
+        ua.selections = user_map
+        ua.choice_id = None
+        ua.raw_answer = None
+        ua.is_correct = None
 
-            ua, _ = UserAnswer.objects.get_or_create(
-                user_exam=ue,
-                question=q
+    return changed
+
+
+def autosave_answers(
+    ue: UserExam,
+    post_data,
+):
+    """
+    Persist partial answers safely.
+    - Autosave-safe (does not erase existing answers)
+    - Locks the attempt's answer rows once (select_for_update)
+    - Writes only rows that actually changed, in one bulk_update
+    - Supports all question types including match/order
+
+    Returns the number of answers written.
+    """
+
+    standard, matches = _parse_posted(post_data)
+    if not standard and not matches:
+        return 0
+
+    allowed = {int(x) for x in (ue.question_order or [])}
+    posted_qids = set(standard) | set(matches)
+    if allowed:
+        posted_qids &= allowed
+
+    keys = get_answer_keys(posted_qids)
+    posted_qids &= set(keys)
+    if not posted_qids:
+        return 0
+
+    with transaction.atomic():
+        rows = {
+            ua.question_id: ua
+            for ua in (
+                UserAnswer.objects
+                .select_for_update()
+                .filter(user_exam=ue, question_id__in=posted_qids)
+            )
+        }
+
+        missing = posted_qids - set(rows)
+        if missing:
+            UserAnswer.objects.bulk_create(
+                [UserAnswer(user_exam=ue, question_id=qid) for qid in missing],
+                ignore_conflicts=True,
+            )
+            rows.update(
+                (ua.question_id, ua)
+                for ua in (
+                    UserAnswer.objects
+                    .select_for_update()
+                    .filter(user_exam=ue, question_id__in=missing)
+                )
+            )
+
+        changed = {}
+
+        # ==================================================
+        # STANDARD QUESTION TYPES
+        # ==================================================
+        for qid, vals in standard.items():
+            ua = rows.get(qid)
+            if ua is not None and _apply_standard(ua, keys[qid], vals):
+                changed[qid] = ua
+
+        # ==================================================
+        # MATCH TYPE (KEYED INPUTS)
+        # ==================================================
+        for qid, mapping in matches.items():
+            ua = rows.get(qid)
+            if ua is not None and _apply_match(ua, mapping):
+                changed[qid] = ua
+
+        if changed:
+            UserAnswer.objects.bulk_update(
+                list(changed.values()),
+                ANSWER_FIELDS,
+                batch_size=500,
+            )
+
+    return len(changed)
+
+
+# UserExam.autosave_seq is a PositiveIntegerField
+AUTOSAVE_SEQ_MAX = 2147483647
+
+
+def apply_autosave_delta(
+    ue: UserExam,
+    seq: int,
+    changes: dict,
+):
+    """
+    Apply a client delta ({"question_<id>": [..], "match_<id>_<i>": ".."})
+    tagged with a client sequence number.
+
+    A batch whose seq is not newer than the last applied one is
+    rejected unapplied (a late keepalive flush or a second tab used
+    the number); the client resends it after current_seq.
+
+    Returns (applied, current_seq).
+    """
+
+    data = QueryDict(mutable=True)
+    for k, v in (changes or {}).items():
+        data.setlist(str(k), [str(x) for x in v] if isinstance(v, list) else [str(v)])
+
+    with transaction.atomic():
+        claimed = UserExam.objects.filter(
+            pk=ue.pk,
+            autosave_seq__lt=seq,
+        ).update(autosave_seq=seq)
+
+        if not claimed:
+            current = (
+                UserExam.objects
+                .filter(pk=ue.pk)
+                .values_list("autosave_seq", flat=True)
+                .first()
             )
+            return False, current or 0
+
+        autosave_answers(ue, data)
 
-            with transaction.atomic():
-                ua = UserAnswer.objects.select_for_update().get(pk=ua.pk)
-
-                user_map = ua.selections or {}
-                changed = False
-
-                for li, val in mapping.items():
-                    if not val:
-                        if str(li) in user_map:
-                            user_map.pop(str(li), None)
-                            changed = True
-                    else:
-                        user_map[str(li)] = val
-                        changed = True
-
-                if changed:
-                    ua.selections = user_map
-                    ua.choice = None
-                    ua.raw_answer = None
-                    ua.is_correct = None
-                    ua.save()
+    ue.autosave_seq = seq
+    return True, seq
@@ -0,0 +1,125 @@
+# quiz/services/attempt_cache.py
+
+import json
+import random
+
+from django.core.cache import cache
+
+from quiz.models import Question
+
+
+# ============================================================
+# ATTEMPT CONTEXT CACHE
+# ============================================================
+# Questions + choices of an attempt never change once the attempt
+# has started (UserExam.question_order is immutable), so they are
+# loaded once and reused by every Next / Prev.
+
+ATTEMPT_CACHE_GRACE = 60 * 30  # kept 30 min past the exam duration
+
+CHOICE_TYPES = ("single", "multi", "tf", "dropdown")
+
+
+def _cache_key(user_exam_id) -> str:
+    return f"quiz:attempt:{user_exam_id}:questions"
+
+
+def _payload_key(user_exam_id) -> str:
+    return f"quiz:attempt:{user_exam_id}:payload"
+
+
+def _timeout(ue) -> int:
+    return int(ue.exam.duration_seconds or 0) + ATTEMPT_CACHE_GRACE
+
+
+def shuffle_choices(user_exam_id, question_id, choices) -> list:
+    """
+    Stable per-attempt shuffle: the same attempt always sees the
+    same option order for a question.
+    """
+    choices = list(choices)
+    random.Random(f"{user_exam_id}:{question_id}").shuffle(choices)
+    return choices
+
+
+def load_attempt_questions(ue) -> dict:
+    """
+    {question_id: (question, [shuffled choices])} for the attempt,
+    built with two queries.
+    """
+
+    q_ids = [int(x) for x in (ue.question_order or [])]
+
+    questions = (
+        Question.objects
+        .filter(id__in=q_ids)
+        .prefetch_related("choices")
+    )
+
+    context = {}
+    for q in questions:
+        choices = []
+        if q.question_type in CHOICE_TYPES:
+            choices = shuffle_choices(ue.id, q.id, q.choices.all())
+
+        # Drop the prefetch cache; the choice list is stored explicitly
+        q._prefetched_objects_cache = {}
+        context[q.id] = (q, choices)
+
+    return context
+
+
+def get_attempt_questions(ue) -> dict:
+    key = _cache_key(ue.id)
+    context = cache.get(key)
+
+    if context is None:
+        context = load_attempt_questions(ue)
+        cache.set(key, context, _timeout(ue))
+
+    return context
+
+
+def get_attempt_question(ue, question_id):
+    """
+    Return (question, choices) for one question of the attempt.
+    """
+    return get_attempt_questions(ue).get(int(question_id), (None, []))
+
+
+def get_attempt_questions_json(ue) -> str:
+    """
+    The attempt's ordered questions and shuffled choices serialized
+    once as JSON (single-payload delivery mode).
+    """
+
+    key = _payload_key(ue.id)
+    payload = cache.get(key)
+
+    if payload is None:
+        context = get_attempt_questions(ue)
+        questions = []
+
+        for qid in ue.question_order or []:
+            q, choices = context.get(int(qid), (None, []))
+            if q is None:
+                continue
+
+            questions.append({
+                "id": q.id,
+                "text": q.text,
+                "question_type": q.question_type,
+                "choices": [{"id": c.id, "text": c.text} for c in choices],
+            })
+
+        payload = json.dumps(questions, separators=(",", ":"))
+        cache.set(key, payload, _timeout(ue))
+
+    return payload
+
+
+def clear_attempt_cache(user_exam_id) -> None:
+    cache.delete_many([
+        _cache_key(user_exam_id),
+        _payload_key(user_exam_id),
+    ])
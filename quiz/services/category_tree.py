@@ -0,0 +1,188 @@
+# quiz/services/category_tree.py
+
+from django.core.cache import cache
+from django.db import transaction
+
+from core.utils.cache import cross_request_timeout
+from quiz.models import Category, CategoryClosure
+
+
+# ============================================================
+# CACHE
+# ============================================================
+# Descendant lists are stored under the tree version, bumped by
+# quiz.signals on every Category change. On a process-local cache
+# the timeout is capped (core.utils.cache).
+
+TREE_VERSION_KEY = "quiz:category_tree:version"
+TREE_CACHE_TIMEOUT = 60 * 60 * 6  # 6 hours
+
+
+def _tree_version() -> int:
+    version = cache.get(TREE_VERSION_KEY)
+    if version is None:
+        version = 1
+        cache.add(TREE_VERSION_KEY, version, None)
+    return version
+
+
+def invalidate_category_tree() -> None:
+    try:
+        cache.incr(TREE_VERSION_KEY)
+    except ValueError:
+        cache.set(TREE_VERSION_KEY, _tree_version() + 1, None)
+
+
+# ============================================================
+# LOOKUPS
+# ============================================================
+
+def _walk_descendant_ids(category_id):
+    """
+    Level-by-level walk (one query per depth), used only when the
+    closure table has no rows for this node yet.
+    """
+    ids = [category_id]
+    frontier = [category_id]
+
+    while frontier:
+        frontier = list(
+            Category.objects
+            .filter(parent_id__in=frontier)
+            .exclude(id__in=ids)
+            .values_list("id", flat=True)
+        )
+        ids.extend(frontier)
+
+    return ids
+
+
+def get_descendant_ids(category_id) -> list:
+    """
+    Return category_id together with all descendant IDs.
+    """
+    key = f"quiz:category_tree:{_tree_version()}:desc:{category_id}"
+    ids = cache.get(key)
+
+    if ids is None:
+        ids = list(
+            CategoryClosure.objects
+            .filter(ancestor_id=category_id)
+            .order_by("depth", "descendant_id")
+            .values_list("descendant_id", flat=True)
+        )
+        if not ids:
+            ids = _walk_descendant_ids(category_id)
+
+        cache.set(key, ids, cross_request_timeout(TREE_CACHE_TIMEOUT))
+
+    return ids
+
+
+# ============================================================
+# SYNC (called from quiz.signals)
+# ============================================================
+
+def sync_category_closure(category) -> None:
+    """
+    Keep closure rows of `category` (and its subtree) in line with
+    its current parent. No-op when the parent did not change.
+    """
+
+    cid = category.id
+
+    with transaction.atomic():
+        current = dict(
+            CategoryClosure.objects
+            .filter(descendant_id=cid)
+            .values_list("ancestor_id", "depth")
+        )
+
+        parent_ancestors = []
+        if category.parent_id:
+            parent_ancestors = list(
+                CategoryClosure.objects
+                .filter(descendant_id=category.parent_id)
+                .values_list("ancestor_id", "depth")
+            )
+
+        # ------------------------------
+        # New node
+        # ------------------------------
+        if not current:
+            CategoryClosure.objects.bulk_create(
+                [CategoryClosure(ancestor_id=cid, descendant_id=cid, depth=0)]
+                + [
+                    CategoryClosure(ancestor_id=a, descendant_id=cid, depth=d + 1)
+                    for a, d in parent_ancestors
+                ],
+                ignore_conflicts=True,
+            )
+            return
+
+        current_parent = next(
+            (a for a, d in current.items() if d == 1),
+            None,
+        )
+        if current_parent == category.parent_id:
+            return
+
+        # ------------------------------
+        # Moved node → relink subtree
+        # ------------------------------
+        subtree = dict(
+            CategoryClosure.objects
+            .filter(ancestor_id=cid)
+            .values_list("descendant_id", "depth")
+        )
+
+        # Cycle (parent inside own subtree): keep the existing links
+        if category.parent_id in subtree:
+            return
+
+        CategoryClosure.objects.filter(
+            descendant_id__in=subtree,
+        ).exclude(
+            ancestor_id__in=subtree,
+        ).delete()
+
+        CategoryClosure.objects.bulk_create(
+            [
+                CategoryClosure(
+                    ancestor_id=a,
+                    descendant_id=desc_id,
+                    depth=d + desc_depth + 1,
+                )
+                for a, d in parent_ancestors
+                for desc_id, desc_depth in subtree.items()
+            ],
+            ignore_conflicts=True,
+        )
+
+
+def rebuild_category_closure() -> int:
+    """
+    Rebuild the whole closure table from Category.parent.
+    Returns the number of rows written.
+    """
+
+    parents = dict(Category.objects.values_list("id", "parent_id"))
+    rows = []
+
+    for cid in parents:
+        node, depth, seen = cid, 0, set()
+        while node is not None and node not in seen:
+            seen.add(node)
+            rows.append(
+                CategoryClosure(ancestor_id=node, descendant_id=cid, depth=depth)
+            )
+            node = parents.get(node)
+            depth += 1
+
+    with transaction.atomic():
+        CategoryClosure.objects.all().delete()
+        CategoryClosure.objects.bulk_create(rows, batch_size=1000)
+
+    invalidate_category_tree()
+    return len(rows)
+
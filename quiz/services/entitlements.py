@@ -0,0 +1,149 @@
+# quiz/services/entitlements.py
+
+from django.core.cache import cache
+from django.utils import timezone
+
+from core.utils.cache import is_shared_cache
+from quiz.models import (
+    ExamSubscription,
+    ExamTrackSubscription,
+)
+from courses.models import CourseSubscription
+from organizations.models.access import ResourceAccess
+
+
+# ============================================================
+# CACHE
+# ============================================================
+# One snapshot per user holding every subscription row and
+# organization grant the AccessResolver needs.
+#
+# Per-user entries are dropped by quiz.signals on every save /
+# delete of the subscription models and ResourceAccess; queryset
+# .update() callers invalidate explicitly. Bulk jobs bump the
+# version so every snapshot is rebuilt lazily.
+#
+# A revocation must reach every worker at once, so the snapshot
+# is only cached across requests on a shared cache (see
+# core.utils.cache); otherwise the AccessResolver loads it once
+# per request.
+
+ENTITLEMENT_VERSION_KEY = "quiz:entitlements:version"
+ENTITLEMENT_TIMEOUT = 60 * 60  # 1 hour
+
+
+def _version() -> int:
+    version = cache.get(ENTITLEMENT_VERSION_KEY)
+    if version is None:
+        version = 1
+        cache.set(ENTITLEMENT_VERSION_KEY, version, None)
+    return version
+
+
+def _cache_key(user_id) -> str:
+    return f"quiz:entitlements:{_version()}:user:{user_id}"
+
+
+def invalidate_user_entitlements(user_id) -> None:
+    if user_id:
+        cache.delete(_cache_key(user_id))
+
+
+def invalidate_all_entitlements() -> None:
+    try:
+        cache.incr(ENTITLEMENT_VERSION_KEY)
+    except ValueError:
+        cache.set(ENTITLEMENT_VERSION_KEY, 2, None)
+
+
+# ============================================================
+# BUILD
+# ============================================================
+
+def build_entitlements(user_id) -> dict:
+    """
+    {
+        "exam_subs":   {exam_id: ExamSubscription},
+        "track_subs":  {track_id: ExamTrackSubscription},
+        "course_subs": {course_id: CourseSubscription},
+        "org_exam_ids":   {..},
+        "org_track_ids":  {..},
+        "org_course_ids": {..},
+    }
+
+    Built in four queries.
+    """
+
+    snapshot = {
+        "exam_subs": {
+            s.exam_id: s
+            for s in ExamSubscription.objects.filter(user_id=user_id)
+        },
+        "track_subs": {
+            s.track_id: s
+            for s in ExamTrackSubscription.objects.filter(user_id=user_id)
+        },
+        "course_subs": {
+            s.course_id: s
+            for s in (
+                CourseSubscription.objects
+                .filter(user_id=user_id)
+                .select_related("course")
+            )
+        },
+        "org_exam_ids": set(),
+        "org_track_ids": set(),
+        "org_course_ids": set(),
+    }
+
+    grants = ResourceAccess.objects.filter(
+        user_id=user_id,
+        source="organization",
+        is_active=True,
+    ).values_list("resource_type", "exam_id", "track_id", "course_id")
+
+    for resource_type, exam_id, track_id, course_id in grants:
+        if resource_type == "exam" and exam_id:
+            snapshot["org_exam_ids"].add(exam_id)
+        elif resource_type == "track" and track_id:
+            snapshot["org_track_ids"].add(track_id)
+        elif resource_type == "course" and course_id:
+            snapshot["org_course_ids"].add(course_id)
+
+    return snapshot
+
+
+def _snapshot_timeout(snapshot) -> int:
+    """
+    Never keep a snapshot past the next expiry it contains, so an
+    expiring subscription is reloaded right after it lapses.
+    """
+
+    now = timezone.now()
+    timeout = ENTITLEMENT_TIMEOUT
+
+    for group in ("exam_subs", "track_subs", "course_subs"):
+        for sub in snapshot[group].values():
+            if sub.is_active and sub.expires_at and sub.expires_at > now:
+                seconds = int((sub.expires_at - now).total_seconds()) + 1
+                timeout = min(timeout, seconds)
+
+    return max(timeout, 1)
+
+
+# ============================================================
+# PUBLIC API
+# ============================================================
+
+def get_entitlements(user_id) -> dict:
+    if not is_shared_cache():
+        return build_entitlements(user_id)
+
+    key = _cache_key(user_id)
+    snapshot = cache.get(key)
+
+    if snapshot is None:
+        snapshot = build_entitlements(user_id)
+        cache.set(key, snapshot, _snapshot_timeout(snapshot))
+
+    return snapshot
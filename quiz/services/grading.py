@@ -1,12 +1,13 @@
 from typing import Tuple
+
+from django.db import transaction
 from django.utils import timezone
 
 from quiz.models import (
     UserExam,
     UserAnswer,
-    Question,
-    Choice,
 )
+from quiz.services.answer_keys import get_answer_keys
 
 # --------------------------------------------------
 # Helpers
@@ -18,10 +19,16 @@ def normalize_text(s: str) -> str:
 
 def grade_answer(
     ua: UserAnswer,
+    key: dict,
     post_data=None,
 ) -> float:
+    """
+    Grade one answer in memory against its answer key.
+    The caller persists `ua` (see grade_exam).
+    """
 
-    q: Question = ua.question
+    qid = ua.question_id
+    question_type = key["question_type"]
     score = 0.0
 
     # Detect if grading from POST or from saved DB
@@ -30,20 +37,21 @@ def grade_answer(
     # -----------------------------
     # SINGLE / DROPDOWN / TRUE-FALSE
     # -----------------------------
-    if q.question_type in ("single", "dropdown", "tf"):
+    if question_type in ("single", "dropdown", "tf"):
 
         if use_post:
-            choice_id = post_data.get(f"question_{q.id}")
+            choice_id = post_data.get(f"question_{qid}")
             if choice_id:
                 try:
-                    ch = Choice.objects.get(pk=int(choice_id), question=q)
-                    ua.choice = ch
-                except Exception:
-                    pass
+                    choice_id = int(choice_id)
+                except (TypeError, ValueError):
+                    choice_id = None
+                if choice_id in key["choice_ids"]:
+                    ua.choice_id = choice_id
 
         # Grade from saved choice
-        if ua.choice:
-            ua.is_correct = bool(ua.choice.is_correct)
+        if ua.choice_id:
+            ua.is_correct = ua.choice_id in key["correct_choice_ids"]
             score = 1.0 if ua.is_correct else 0.0
         else:
             ua.is_correct = False
@@ -55,24 +63,17 @@ def grade_answer(
     # -----------------------------
     # MULTI SELECT
     # -----------------------------
-    elif q.question_type == "multi":
+    elif question_type == "multi":
 
         if use_post:
-            posted_selections = post_data.getlist(f"question_{q.id}")
+            posted_selections = post_data.getlist(f"question_{qid}")
             try:
                 ua.selections = [int(x) for x in posted_selections if x]
             except ValueError:
                 ua.selections = []
 
-        sel_ids = ua.selections or []
-
-        correct_ids = list(
-            q.choices.filter(is_correct=True)
-            .values_list("id", flat=True)
-        )
-
-        selected_set = set(sel_ids)
-        correct_set = set(correct_ids)
+        selected_set = set(ua.selections or [])
+        correct_set = key["correct_choice_ids"]
 
         if not selected_set:
             ua.is_correct = False
@@ -96,44 +97,45 @@ def grade_answer(
                 / max(1, len(correct_set))
             )
 
-        ua.choice = None
+        ua.choice_id = None
         ua.raw_answer = None
 
     # -----------------------------
     # FILL IN THE BLANK
     # -----------------------------
-    elif q.question_type == "fill":
+    elif question_type == "fill":
 
         if use_post:
-            raw = (post_data.get(f"question_{q.id}") or "").strip()
+            raw = (post_data.get(f"question_{qid}") or "").strip()
             ua.raw_answer = raw
 
         raw = (ua.raw_answer or "").strip()
+        correct_text = key["correct_text"]
 
-        if q.correct_text and normalize_text(raw) == normalize_text(q.correct_text):
+        if correct_text and normalize_text(raw) == normalize_text(correct_text):
             ua.is_correct = True
             score = 1.0
         else:
             ua.is_correct = False
 
-        ua.choice = None
+        ua.choice_id = None
         ua.selections = None
 
     # -----------------------------
     # NUMERIC
     # -----------------------------
-    elif q.question_type == "numeric":
+    elif question_type == "numeric":
 
         if use_post:
-            raw = (post_data.get(f"question_{q.id}") or "").strip()
+            raw = (post_data.get(f"question_{qid}") or "").strip()
             ua.raw_answer = raw
 
         raw = (ua.raw_answer or "").strip()
 
         try:
             val = float(raw)
-            tol = q.numeric_tolerance or 0.0
-            if q.numeric_answer is not None and abs(val - q.numeric_answer) <= tol:
+            expected = key["numeric_answer"]
+            if expected is not None and abs(val - expected) <= key["tolerance"]:
                 ua.is_correct = True
                 score = 1.0
             else:
@@ -141,14 +143,18 @@ def grade_answer(
         except Exception:
             ua.is_correct = False
 
-        ua.choice = None
+        ua.choice_id = None
         ua.selections = None
 
-    ua.save()
     return score
 
 
-from django.http import QueryDict
+GRADED_FIELDS = [
+    "choice",
+    "selections",
+    "raw_answer",
+    "is_correct",
+]
 
 
 def grade_exam(
@@ -157,6 +163,11 @@ def grade_exam(
     *,
     is_mock: bool = False,
 ) -> Tuple[float, bool]:
+    """
+    Grade a whole attempt in a fixed number of queries:
+    answers, one bulk_update and the attempt row (answer keys
+    come from the cached answer-key service).
+    """
 
     if ue.question_order:
         qids = [int(x) for x in ue.question_order]
@@ -165,25 +176,51 @@ def grade_exam(
             ue.answers.values_list("question_id", flat=True)
         )
 
-    total = 0
-    score_acc = 0.0
+    keys = get_answer_keys(qids)
 
-    for qid in qids:
-        ua, _ = UserAnswer.objects.get_or_create(
-            user_exam=ue,
-            question_id=qid
-        )
+    with transaction.atomic():
+        answers = {
+            ua.question_id: ua
+            for ua in ue.answers.filter(question_id__in=qids)
+        }
+
+        missing = [qid for qid in qids if qid not in answers]
+        if missing:
+            UserAnswer.objects.bulk_create(
+                [UserAnswer(user_exam=ue, question_id=qid) for qid in missing],
+                ignore_conflicts=True,
+            )
+            answers.update(
+                (ua.question_id, ua)
+                for ua in ue.answers.filter(question_id__in=missing)
+            )
+
+        total = 0
+        score_acc = 0.0
+        graded = []
+
+        for qid in qids:
+            ua = answers.get(qid)
+            if ua is None:
+                continue
+
+            total += 1
+            key = keys.get(qid)
+            if key is None:
+                continue
+
+            score_acc += grade_answer(ua, key, post_data)
+            graded.append(ua)
 
-        total += 1
-        score_acc += grade_answer(ua, post_data)
+        UserAnswer.objects.bulk_update(graded, GRADED_FIELDS, batch_size=500)
 
-    score_percent = round((score_acc / total) * 100, 2) if total else 0.0
+        score_percent = round((score_acc / total) * 100, 2) if total else 0.0
 
-    passed = None if is_mock else score_percent >= (ue.exam.passing_score or 0)
+        passed = None if is_mock else score_percent >= (ue.exam.passing_score or 0)
 
-    ue.score = score_percent
-    ue.passed = passed
-    ue.submitted_at = timezone.now()
-    ue.save()
+        ue.score = score_percent
+        ue.passed = passed
+        ue.submitted_at = timezone.now()
+        ue.save(update_fields=["score", "passed", "submitted_at"])
 
-    return score_percent, passed
\ No newline at end of file
+    return score_percent, passed
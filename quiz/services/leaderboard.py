@@ -0,0 +1,311 @@
+# quiz/services/leaderboard.py
+
+from django.db import transaction
+from django.utils import timezone
+
+from quiz.models import LeaderboardEntry, LeaderboardSnapshot, StudyPlan
+
+
+# ============================================================
+# INCREMENTAL LEADERBOARD
+# ============================================================
+# LeaderboardEntry keeps one row per user with the competitive
+# score of their best active study plan. Rows are refreshed when a
+# plan's stats change (quiz.signals / the practice view), so a rank
+# is two indexed COUNTs on `score` instead of scoring every active
+# plan in Python. Scores come from the denormalized
+# StudyPlan.competitive_score column.
+
+
+def _best_active_plan(user_id):
+    """
+    (plan_id, score) of the user's best active plan, or (None, None).
+    """
+
+    best = (
+        StudyPlan.objects
+        .filter(user_id=user_id, is_active=True)
+        .order_by("-competitive_score", "id")
+        .values_list("id", "competitive_score")
+        .first()
+    )
+
+    return best or (None, None)
+
+
+def update_leaderboard_entry(user_id) -> None:
+    """
+    Recompute the user's row; users without an active plan are
+    removed from the board.
+    """
+
+    if not user_id:
+        return
+
+    plan_id, score = _best_active_plan(user_id)
+
+    if plan_id is None:
+        LeaderboardEntry.objects.filter(user_id=user_id).delete()
+        return
+
+    updated = LeaderboardEntry.objects.filter(user_id=user_id).update(
+        plan_id=plan_id,
+        score=score,
+    )
+
+    if not updated:
+        LeaderboardEntry.objects.update_or_create(
+            user_id=user_id,
+            defaults={"plan_id": plan_id, "score": score},
+        )
+
+
+def _partition_plans(domain_id=None, season=None):
+    """
+    Active plans competing on a domain / season board.
+    """
+
+    plans = StudyPlan.objects.filter(is_active=True)
+
+    if domain_id:
+        plans = plans.filter(domain_id=domain_id)
+
+    if season:
+        year, month = season.split("-")
+        plans = plans.filter(created_at__year=year, created_at__month=month)
+
+    return plans
+
+
+def rank_for_score(score, domain_id=None, season=None):
+    """
+    (rank, percentile) of `score` on the board, or (None, 0) when
+    the board is empty.
+
+    The global board counts LeaderboardEntry rows; a domain / season
+    board counts users by their best plan within it.
+    """
+
+    if domain_id or season:
+        plans = _partition_plans(domain_id, season)
+        users = plans.values("user_id").distinct()
+
+        total = users.count()
+        above = plans.filter(competitive_score__gt=score).values("user_id").distinct()
+    else:
+        total = LeaderboardEntry.objects.count()
+        above = LeaderboardEntry.objects.filter(score__gt=score)
+
+    if total == 0:
+        return None, 0
+
+    rank = min(above.count() + 1, total)
+    percentile = round(((total - rank) / total) * 100, 2)
+
+    return rank, percentile
+
+
+def get_plan_rank(plan, domain_id=None):
+    """
+    Live rank of an active plan; inactive plans are not ranked.
+    """
+
+    if not plan.is_active:
+        return None, 0
+
+    return rank_for_score(plan.competitive_score, domain_id)
+
+
+# ============================================================
+# FULL REBUILD
+# ============================================================
+
+def rebuild_leaderboard() -> int:
+    """
+    Recompute every row from the active plans and store the ranks.
+    Returns the number of ranked users.
+    """
+
+    best = {}
+
+    plans = (
+        StudyPlan.objects
+        .filter(is_active=True)
+        .order_by("-competitive_score", "id")
+        .values_list("user_id", "id", "competitive_score")
+    )
+
+    # Highest score first: the first plan seen per user is the best
+    for user_id, plan_id, score in plans.iterator(chunk_size=2000):
+        best.setdefault(user_id, (plan_id, score))
+
+    ranked = list(best.items())
+
+    with transaction.atomic():
+        LeaderboardEntry.objects.exclude(user_id__in=best.keys()).delete()
+
+        existing = {
+            entry.user_id: entry
+            for entry in LeaderboardEntry.objects.filter(user_id__in=best.keys())
+        }
+
+        to_create, to_update = [], []
+
+        for rank, (user_id, (plan_id, score)) in enumerate(ranked, start=1):
+            entry = existing.get(user_id)
+
+            if entry is None:
+                to_create.append(LeaderboardEntry(
+                    user_id=user_id,
+                    plan_id=plan_id,
+                    score=score,
+                    rank=rank,
+                ))
+            else:
+                entry.plan_id = plan_id
+                entry.score = score
+                entry.rank = rank
+                to_update.append(entry)
+
+        LeaderboardEntry.objects.bulk_create(to_create, batch_size=500)
+        LeaderboardEntry.objects.bulk_update(
+            to_update,
+            ["plan", "score", "rank"],
+            batch_size=500,
+        )
+
+    return len(ranked)
+
+
+# ============================================================
+# PARTITIONED SNAPSHOTS
+# ============================================================
+# Domain and monthly-season boards are stored as ranked
+# LeaderboardSnapshot rows, so a page is an indexed slice of one
+# partition. Each partition ranks users by their best active plan
+# within it, and all of them are rebuilt in one pass over the
+# active plans by the rebuild_leaderboard command.
+#
+# Boards are only as fresh as its last run, so it must be scheduled
+# (README.txt, "Scheduled jobs"). get_snapshot_rows() builds them
+# in-request only once, on an empty table; a new season's board
+# stays empty until the next scheduled run.
+
+GLOBAL_PARTITION = "global"
+
+
+def current_season() -> str:
+    return timezone.localtime().strftime("%Y-%m")
+
+
+def partition_key(domain_id=None, season=None) -> str:
+    parts = []
+
+    if domain_id:
+        parts.append(f"domain:{domain_id}")
+
+    if season:
+        parts.append(f"season:{season}")
+
+    return ":".join(parts) or GLOBAL_PARTITION
+
+
+def _plan_partitions(plan) -> list:
+    season = timezone.localtime(plan.created_at).strftime("%Y-%m")
+
+    keys = [
+        GLOBAL_PARTITION,
+        partition_key(season=season),
+    ]
+
+    if plan.domain_id:
+        keys.append(partition_key(domain_id=plan.domain_id))
+        keys.append(partition_key(domain_id=plan.domain_id, season=season))
+
+    return keys
+
+
+def refresh_leaderboard_snapshots() -> int:
+    """
+    Replace every partition with freshly ranked rows.
+    Returns the number of rows written.
+    """
+
+    partitions = {}
+
+    plans = (
+        StudyPlan.objects
+        .filter(is_active=True)
+        .order_by("-competitive_score", "user_id", "id")
+        .only(
+            "user_id",
+            "domain_id",
+            "created_at",
+            "competitive_score",
+            "readiness_score",
+            "xp",
+            "longest_streak",
+            "level",
+        )
+    )
+
+    # Highest score first: the first plan seen per user in a
+    # partition is their best one there
+    for plan in plans.iterator(chunk_size=1000):
+        for key in _plan_partitions(plan):
+            members = partitions.setdefault(key, {})
+            members.setdefault(plan.user_id, plan)
+
+    rows = []
+
+    for key, members in partitions.items():
+        total = len(members)
+
+        for rank, plan in enumerate(members.values(), start=1):
+            rows.append(LeaderboardSnapshot(
+                partition=key,
+                rank=rank,
+                user_id=plan.user_id,
+                score=plan.competitive_score,
+                percentile=round(((total - rank) / total) * 100, 2),
+                readiness=plan.readiness_score,
+                xp=plan.xp,
+                streak=plan.longest_streak,
+                level=plan.level,
+            ))
+
+    with transaction.atomic():
+        LeaderboardSnapshot.objects.all().delete()
+        LeaderboardSnapshot.objects.bulk_create(rows, batch_size=1000)
+
+    return len(rows)
+
+
+def get_snapshot_rows(partition):
+    """
+    Ranked rows of one partition (slice it / paginate it). The
+    snapshots are built on first use if the job has never run;
+    after that they only change when rebuild_leaderboard runs.
+    """
+
+    if not LeaderboardSnapshot.objects.exists():
+        refresh_leaderboard_snapshots()
+
+    return (
+        LeaderboardSnapshot.objects
+        .filter(partition=partition)
+        .select_related("user")
+        .order_by("rank")
+    )
+
+
+def get_snapshot_row(user_id, partition):
+    """
+    The user's own row in a partition (rank badge), or None.
+    """
+
+    return (
+        LeaderboardSnapshot.objects
+        .filter(partition=partition, user_id=user_id)
+        .first()
+    )
@@ -0,0 +1,58 @@
+# quiz/services/notification_service.py
+
+from collections import defaultdict
+
+from accounts.services.notification_inbox import send_notification
+
+
+class NotificationService:
+    """
+    Notification delivery in bulk (see
+    accounts.services.notification_inbox).
+    """
+
+    # -------------------------------------------------
+    # TARGETED / BROADCAST
+    # -------------------------------------------------
+    @staticmethod
+    def notify_users(*, user_ids, title, message):
+        return send_notification(
+            title=title,
+            message=message,
+            user_ids=user_ids,
+        )
+
+    @staticmethod
+    def broadcast(*, title, message):
+        return send_notification(
+            title=title,
+            message=message,
+        )
+
+    # -------------------------------------------------
+    # EXPIRY REMINDERS
+    # -------------------------------------------------
+    @staticmethod
+    def notify_expiry(reminders):
+        """
+        `reminders` is an iterable of (user_id, title, message).
+
+        Users receiving the same text share one notification, so
+        the queries grow with the number of distinct messages, not
+        with the number of users. Returns the number of notified
+        users.
+        """
+
+        groups = defaultdict(list)
+
+        for user_id, title, message in reminders:
+            groups[(title, message)].append(user_id)
+
+        for (title, message), user_ids in groups.items():
+            send_notification(
+                title=title,
+                message=message,
+                user_ids=user_ids,
+            )
+
+        return sum(len(user_ids) for user_ids in groups.values())
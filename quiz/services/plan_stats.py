@@ -0,0 +1,109 @@
+# quiz/services/plan_stats.py
+
+from django.db import IntegrityError, transaction
+from django.db.models import F, Sum
+
+from quiz.models import StudyPlanStat
+
+
+# ============================================================
+# PER-PLAN ANSWER COUNTERS
+# ============================================================
+# StudyPlanStat holds (plan, category, difficulty) -> attempted /
+# correct. Readers fetch only the rows they need and SQL can
+# aggregate across plans. The JSON maps on StudyPlan are still
+# written alongside (difficulty_weighted_mastery reads
+# difficulty_stats in memory when scores are recomputed); the
+# helpers below return the same {key: {"attempted", "correct"}}
+# shape.
+
+
+def record_stat(plan_id, category_id, difficulty, is_correct) -> None:
+    """
+    Increment one counter row (created on first answer).
+    """
+
+    rows = StudyPlanStat.objects.filter(
+        plan_id=plan_id,
+        category_id=category_id,
+        difficulty=difficulty or "",
+    )
+
+    changes = {"attempted": F("attempted") + 1}
+    if is_correct:
+        changes["correct"] = F("correct") + 1
+
+    if rows.update(**changes):
+        return
+
+    try:
+        with transaction.atomic():
+            StudyPlanStat.objects.create(
+                plan_id=plan_id,
+                category_id=category_id,
+                difficulty=difficulty or "",
+                attempted=1,
+                correct=1 if is_correct else 0,
+            )
+    except IntegrityError:
+        # Concurrent first answer created the row
+        rows.update(**changes)
+
+
+def _as_map(rows, key) -> dict:
+    return {
+        str(row[key]): {
+            "attempted": row["attempted"],
+            "correct": row["correct"],
+        }
+        for row in rows
+    }
+
+
+def category_stats(plan_id, category_ids=None) -> dict:
+    """
+    {category_id (str): {"attempted", "correct"}}, optionally only
+    for `category_ids`.
+    """
+
+    qs = StudyPlanStat.objects.filter(
+        plan_id=plan_id,
+        category__isnull=False,
+    )
+
+    if category_ids is not None:
+        qs = qs.filter(category_id__in=category_ids)
+
+    return _as_map(
+        qs.values("category_id")
+        .annotate(attempted=Sum("attempted"), correct=Sum("correct"))
+        .order_by(),
+        "category_id",
+    )
+
+
+def category_breakdown(plan_id) -> list:
+    """
+    Per-category rows with names and accuracy, for the plan
+    dashboard / detail pages (one query).
+    """
+
+    rows = (
+        StudyPlanStat.objects
+        .filter(plan_id=plan_id, category__isnull=False)
+        .values("category_id", "category__name")
+        .annotate(attempted=Sum("attempted"), correct=Sum("correct"))
+        .filter(attempted__gt=0)
+        .order_by("category_id")
+    )
+
+    return [
+        {
+            "id": row["category_id"],
+            "name": row["category__name"],
+            "attempted": row["attempted"],
+            "correct": row["correct"],
+            "accuracy": round((row["correct"] / row["attempted"]) * 100, 2),
+        }
+        for row in rows
+    ]
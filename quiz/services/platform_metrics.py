@@ -0,0 +1,393 @@
+# quiz/services/platform_metrics.py
+
+from datetime import timedelta
+from decimal import Decimal
+
+from django.contrib.auth.models import User
+from django.db.models import Avg, Count, Exists, F, OuterRef, Q, Sum
+from django.utils import timezone
+
+from courses.models import Course, CourseEnrollment, CourseSubscription
+from organizations.models.membership import OrganizationMember
+from organizations.models.organization import Organization
+from quiz.models import (
+    Exam,
+    ExamSubscription,
+    ExamTrack,
+    ExamTrackSubscription,
+    PlatformMetrics,
+    UserExam,
+)
+
+
+# ============================================================
+# PLATFORM METRICS ROLLUP
+# ============================================================
+# The admin dashboard and user monitoring KPIs are computed by
+# the rollup_platform_metrics command into PlatformMetrics: the
+# "now" row the dashboards read, and one "daily" row per day for
+# trends.
+#
+# Plain row counts are additionally kept current between rollups
+# with F() increments (quiz.signals -> bump_counter). Bulk
+# creates / deletes bypass signals; the next rollup corrects them.
+#
+# Everything else is as fresh as the last rollup, and trends need
+# one run per day, so the command must be scheduled (README.txt,
+# "Scheduled jobs"). get_platform_metrics() only computes in-request
+# when no "now" row exists yet.
+
+COUNTER_MODELS = {
+    "total_users": User,
+    "total_user_exams": UserExam,
+    "total_courses": Course,
+    "total_enrollments": CourseEnrollment,
+    "total_orgs": Organization,
+    "total_track_subs": ExamTrackSubscription,
+    "total_course_subs": CourseSubscription,
+}
+
+COUNTER_FIELDS = {model: field for field, model in COUNTER_MODELS.items()}
+
+# Metrics compared against an earlier daily row on the dashboard
+TREND_METRICS = (
+    "total_users",
+    "active_users_7d",
+    "total_attempts",
+    "total_enrollments",
+    "paid_subs",
+    "total_revenue",
+)
+
+
+def _money(value) -> str:
+    return str(Decimal(value or 0).quantize(Decimal("0.01")))
+
+
+def _percent(part, whole) -> float:
+    return round((part / whole) * 100, 2) if whole else 0
+
+
+def _named(obj):
+    return {"id": obj.id, "title": obj.title} if obj else None
+
+
+# ============================================================
+# COMPUTE
+# ============================================================
+
+def compute_metrics(now=None) -> dict:
+    """
+    Every dashboard KPI in one dict: the COUNTER_MODELS fields plus
+    "metrics" (JSON-safe).
+
+    Related counts are folded into one aggregate per table.
+    """
+
+    now = now or timezone.now()
+    seven_days_ago = now - timedelta(days=7)
+    thirty_days_ago = now - timedelta(days=30)
+
+    # ---------------- Users ----------------
+
+    users = User.objects.aggregate(
+        total=Count("id"),
+        active=Count("id", filter=Q(is_active=True)),
+        active_7d=Count("id", filter=Q(last_login__gte=seven_days_ago)),
+        new_7d=Count("id", filter=Q(date_joined__gte=seven_days_ago)),
+    )
+
+    users_with_no_attempts = User.objects.filter(
+        ~Exists(UserExam.objects.filter(user=OuterRef("pk")))
+    ).count()
+
+    churn_risk_users = User.objects.filter(
+        track_subscriptions__is_active=True,
+        last_login__lt=thirty_days_ago,
+    ).distinct().count()
+
+    # ---------------- Exams ----------------
+
+    attempts = UserExam.objects.aggregate(
+        total=Count("id"),
+        submitted=Count("id", filter=Q(submitted_at__isnull=False)),
+        passed=Count("id", filter=Q(passed=True)),
+        avg_score=Avg("score"),
+    )
+
+    most_attempted_exam = (
+        Exam.objects
+        .annotate(attempts=Count("userexam"))
+        .order_by("-attempts")
+        .only("id", "title")
+        .first()
+    )
+
+    # ---------------- Courses ----------------
+
+    courses = Course.objects.aggregate(
+        total=Count("id"),
+        published=Count("id", filter=Q(is_published=True)),
+        pending=Count("id", filter=Q(approval_status=Course.APPROVAL_PENDING)),
+        platform=Count("id", filter=Q(owner_type="platform")),
+        organization=Count("id", filter=Q(owner_type="organization")),
+    )
+
+    total_enrollments = CourseEnrollment.objects.count()
+
+    most_popular_course = (
+        Course.objects
+        .annotate(enroll_count=Count("enrollments"))
+        .order_by("-enroll_count")
+        .only("id", "title")
+        .first()
+    )
+
+    # ---------------- Organizations ----------------
+
+    orgs = Organization.objects.aggregate(
+        total=Count("id"),
+        active=Count("id", filter=Q(is_active=True)),
+    )
+
+    members = OrganizationMember.objects.filter(is_active=True).aggregate(
+        total=Count("id"),
+        students=Count("id", filter=Q(role="student")),
+        admins=Count("id", filter=Q(role="org_admin")),
+    )
+
+    # ---------------- Track subscriptions ----------------
+
+    track_subs = ExamTrackSubscription.objects.aggregate(
+        total=Count("id"),
+        active=Count("id", filter=Q(is_active=True, expires_at__gte=now)),
+        expired=Count("id", filter=Q(is_active=True, expires_at__lt=now)),
+        trial=Count("id", filter=Q(is_trial=True)),
+        paid=Count("id", filter=Q(payment_required=True)),
+        revenue=Sum("amount", filter=Q(payment_required=True)),
+        revenue_30d=Sum(
+            "amount",
+            filter=Q(payment_required=True, subscribed_at__gte=thirty_days_ago),
+        ),
+    )
+
+    total_revenue = track_subs["revenue"] or 0
+
+    active_exam_subs = ExamSubscription.objects.filter(
+        is_active=True,
+        expires_at__gte=now,
+    ).count()
+
+    track_rows = [
+        {
+            "track_id": track.id,
+            "title": track.title,
+            "enrolled": track.enrolled,
+            "revenue": _money(track.revenue),
+        }
+        for track in (
+            ExamTrack.objects
+            .annotate(
+                enrolled=Count(
+                    "subscriptions__user",
+                    filter=Q(subscriptions__is_active=True),
+                    distinct=True,
+                ),
+                revenue=Sum(
+                    "subscriptions__amount",
+                    filter=Q(subscriptions__payment_required=True),
+                ),
+            )
+            .only("id", "title")
+        )
+    ]
+
+    # ---------------- Course subscriptions ----------------
+
+    course_subs = CourseSubscription.objects.aggregate(
+        total=Count("id"),
+        active=Count("id", filter=Q(is_active=True)),
+        expired=Count("id", filter=Q(is_active=True, expires_at__lt=now)),
+        trial=Count("id", filter=Q(payment_required=False)),
+        paid=Count("id", filter=Q(payment_required=True)),
+        revenue=Sum("amount", filter=Q(payment_required=True)),
+    )
+
+    source_breakdown = list(
+        CourseSubscription.objects
+        .values("source")
+        .annotate(count=Count("id"))
+        .order_by("source")
+    )
+
+    most_subscribed_course = (
+        Course.objects
+        .annotate(sub_count=Count("subscriptions"))
+        .order_by("-sub_count")
+        .only("id", "title")
+        .first()
+    )
+
+    return {
+        "total_users": users["total"],
+        "total_user_exams": attempts["total"],
+        "total_courses": courses["total"],
+        "total_enrollments": total_enrollments,
+        "total_orgs": orgs["total"],
+        "total_track_subs": track_subs["total"],
+        "total_course_subs": course_subs["total"],
+        "metrics": {
+            # Users
+            "active_users": users["active"],
+            "active_users_7d": users["active_7d"],
+            "new_users_7d": users["new_7d"],
+            "users_with_no_attempts": users_with_no_attempts,
+            "churn_risk_users": churn_risk_users,
+
+            # Exams
+            "total_attempts": attempts["submitted"],
+            "pass_rate": _percent(attempts["passed"], attempts["submitted"]),
+            "avg_score": (
+                round(attempts["avg_score"], 2)
+                if attempts["avg_score"]
+                else None
+            ),
+            "most_attempted_exam": _named(most_attempted_exam),
+
+            # Courses
+            "published_courses": courses["published"],
+            "pending_course_reviews": courses["pending"],
+            "platform_courses": courses["platform"],
+            "org_courses": courses["organization"],
+            "most_popular_course": _named(most_popular_course),
+
+            # Organizations
+            "active_orgs": orgs["active"],
+            "total_org_members": members["total"],
+            "org_student_count": members["students"],
+            "org_admin_count": members["admins"],
+
+            # Subscriptions
+            "active_exam_subs": active_exam_subs,
+            "active_track_subs": track_subs["active"],
+            "expired_track_subs": track_subs["expired"],
+            "trial_subs": track_subs["trial"],
+            "paid_subs": track_subs["paid"],
+            "conversion_rate": _percent(track_subs["paid"], track_subs["trial"]),
+            "track_rows": track_rows,
+
+            # Revenue
+            "total_revenue": _money(total_revenue),
+            "revenue_30d": _money(track_subs["revenue_30d"]),
+            "arpu": _money(
+                total_revenue / track_subs["paid"]
+                if track_subs["paid"]
+                else 0
+            ),
+
+            # Course subscriptions
+            "active_course_subs": course_subs["active"],
+            "expired_course_subs": course_subs["expired"],
+            "trial_course_subs": course_subs["trial"],
+            "paid_course_subs": course_subs["paid"],
+            "course_conversion_rate": _percent(
+                course_subs["paid"],
+                course_subs["trial"],
+            ),
+            "course_revenue": _money(course_subs["revenue"]),
+            "source_breakdown": source_breakdown,
+            "most_subscribed_course": _named(most_subscribed_course),
+        },
+    }
+
+
+# ============================================================
+# ROLLUP
+# ============================================================
+
+def refresh_platform_metrics(now=None) -> PlatformMetrics:
+    """
+    Recompute every KPI into the "now" row and today's "daily" row.
+    """
+
+    now = now or timezone.now()
+    values = compute_metrics(now)
+    today = timezone.localdate(now)
+
+    PlatformMetrics.objects.update_or_create(
+        kind=PlatformMetrics.DAILY,
+        date=today,
+        defaults=values,
+    )
+
+    row, _ = PlatformMetrics.objects.update_or_create(
+        kind=PlatformMetrics.NOW,
+        defaults={"date": today, **values},
+    )
+
+    return row
+
+
+def get_platform_metrics() -> PlatformMetrics:
+    """
+    The "now" row (computed on first use if the rollup never ran).
+    """
+
+    row = PlatformMetrics.objects.filter(kind=PlatformMetrics.NOW).first()
+    return row or refresh_platform_metrics()
+
+
+def bump_counter(model, delta) -> None:
+    """
+    Apply a +1 / -1 row count change of `model` to the "now" row.
+    """
+
+    field = COUNTER_FIELDS.get(model)
+    if field is None:
+        return
+
+    qs = PlatformMetrics.objects.filter(kind=PlatformMetrics.NOW)
+    if delta < 0:
+        qs = qs.filter(**{f"{field}__gte": -delta})
+
+    qs.update(**{field: F(field) + delta})
+
+
+# ============================================================
+# TRENDS
+# ============================================================
+
+def _metric(row, name):
+    if name in COUNTER_MODELS:
+        return getattr(row, name)
+    return row.metrics.get(name)
+
+
+def get_metric_trends(row, days=7) -> dict:
+    """
+    {metric: change since the daily row `days` ago} for
+    TREND_METRICS; empty until that much history exists.
+    """
+
+    since = timezone.localdate() - timedelta(days=days)
+
+    previous = (
+        PlatformMetrics.objects
+        .filter(kind=PlatformMetrics.DAILY, date__lte=since)
+        .order_by("-date")
+        .first()
+    )
+
+    if previous is None:
+        return {}
+
+    trends = {}
+
+    for name in TREND_METRICS:
+        current, before = _metric(row, name), _metric(previous, name)
+        if current is None or before is None:
+            continue
+        trends[name] = Decimal(str(current)) - Decimal(str(before))
+
+    return trends
+
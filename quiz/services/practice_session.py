@@ -0,0 +1,163 @@
+# quiz/services/practice_session.py
+
+import random
+
+
+# ============================================================
+# PRACTICE SESSION STATE
+# ============================================================
+# Practice screens walk a cached question pool
+# (quiz.services.question_sampler) in a per-session shuffled
+# order. The order is never stored: position `cursor` maps to
+# pool index shuffled_index(cursor, len(pool), seed), a keyed
+# permutation of range(len(pool)).
+#
+# The session therefore only holds {seed, cursor, total} per
+# scope, however long the user keeps practicing, and "next
+# question" is O(1).
+
+SESSION_KEY = "practice_state"
+
+# Scopes
+SCOPE_PRACTICE = "p"
+SCOPE_EXPRESS = "pe"
+
+
+def _round(value, seed, rnd, mask):
+    """
+    Feistel round function (cheap integer mix).
+    """
+    x = (value * 0x9E3779B1 + seed + rnd * 0x85EBCA6B) & 0xFFFFFFFF
+    x ^= x >> 15
+    x = (x * 0x2C1B3C6D) & 0xFFFFFFFF
+    x ^= x >> 12
+    return x & mask
+
+
+def shuffled_index(position, size, seed, rounds=4):
+    """
+    Map `position` (0 <= position < size) to its slot in a
+    pseudo-random permutation of range(size) keyed by `seed`.
+
+    Balanced Feistel network over the next power of four with
+    cycle-walking; expected < 4 iterations per call.
+    """
+
+    if size <= 1:
+        return 0
+
+    half_bits = max(1, ((size - 1).bit_length() + 1) // 2)
+    mask = (1 << half_bits) - 1
+
+    x = position
+    while True:
+        left, right = x >> half_bits, x & mask
+        for rnd in range(rounds):
+            left, right = right, left ^ _round(right, seed, rnd, mask)
+        x = (left << half_bits) | right
+        if x < size:
+            return x
+
+
+class PracticeSession:
+    """
+    Constant-size cursor over a question pool for one scope of a
+    browser session.
+    """
+
+    def __init__(self, session, scope):
+        self.session = session
+        self.scope = scope
+
+        state = (session.get(SESSION_KEY) or {}).get(scope) or {}
+        self.seed = state.get("seed")
+        self.cursor = state.get("cursor", 0)
+        self.total = state.get("total", 0)
+
+    @property
+    def started(self) -> bool:
+        return self.seed is not None
+
+    def reset(self, total) -> None:
+        self.seed = random.getrandbits(32)
+        self.cursor = 0
+        self.total = total
+        self.save()
+
+    def current(self, pool):
+        """
+        Question ID at the cursor, or None once the pool is exhausted.
+
+        If the pool changed size since reset() (questions added or
+        removed), the old permutation no longer covers it: the walk
+        restarts over the new pool.
+        """
+        if not self.started:
+            return None
+        if len(pool) != self.total:
+            self.reset(len(pool))
+        if self.cursor >= len(pool):
+            return None
+        return pool[shuffled_index(self.cursor, len(pool), self.seed)]
+
+    def advance(self) -> None:
+        self.cursor += 1
+        self.save()
+
+    def save(self) -> None:
+        states = dict(self.session.get(SESSION_KEY) or {})
+        states[self.scope] = {
+            "seed": self.seed,
+            "cursor": self.cursor,
+            "total": self.total,
+        }
+        self.session[SESSION_KEY] = states
+
+    def clear(self) -> None:
+        states = dict(self.session.get(SESSION_KEY) or {})
+        if states.pop(self.scope, None) is not None:
+            self.session[SESSION_KEY] = states
+        self.seed = None
+        self.cursor = 0
+        self.total = 0
+
+
+def current_question(state, pool, queryset):
+    """
+    Question at the cursor, moving past pool IDs whose question is
+    gone from `queryset` (deleted / disabled since the pool was
+    cached). None once the pool is exhausted.
+    """
+
+    while True:
+        qid = state.current(pool)
+        if qid is None:
+            return None
+
+        question = queryset.filter(id=qid).first()
+        if question is not None:
+            return question
+
+        state.advance()
+
+
+# ============================================================
+# DAILY BITMAP (study plan practice)
+# ============================================================
+# A study plan day has a fixed, short list of question IDs; the
+# answered ones are kept as a bitmask over their positions.
+
+def get_done_mask(session, key) -> int:
+    try:
+        return int(session.get(key) or "0", 16)
+    except (TypeError, ValueError):
+        return 0
+
+
+def set_done(session, key, position) -> None:
+    mask = get_done_mask(session, key) | (1 << position)
+    session[key] = format(mask, "x")
+
+
+def remaining_ids(ids, mask) -> list:
+    return [qid for i, qid in enumerate(ids) if not (mask >> i) & 1]
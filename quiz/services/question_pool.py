@@ -0,0 +1,280 @@
+# quiz/services/question_pool.py
+
+import math
+import random
+from array import array
+from collections import defaultdict
+
+from django.core.cache import cache
+
+from core.utils.cache import cross_request_timeout
+from quiz.models import Question
+
+
+# ============================================================
+# CACHE KEYS
+# ============================================================
+# Every exam pool index is stored under the current pool version.
+# Bumping the version (question / category changes) makes every
+# cached index stale at once; allocation changes only drop the
+# affected exam. On a process-local cache the timeout is capped
+# (core.utils.cache), so other workers pick up a change within a
+# minute.
+
+POOL_VERSION_KEY = "quiz:question_pool:version"
+POOL_CACHE_TIMEOUT = 60 * 60 * 6  # 6 hours
+
+
+def _pool_version() -> int:
+    version = cache.get(POOL_VERSION_KEY)
+    if version is None:
+        version = 1
+        cache.add(POOL_VERSION_KEY, version, None)
+    return version
+
+
+def pool_cache_key(suffix) -> str:
+    """
+    Cache key for any question-ID pool that must be dropped
+    together with the exam pools (see quiz.services.question_sampler).
+    """
+    return f"quiz:question_pool:{_pool_version()}:{suffix}"
+
+
+def _exam_pool_key(exam_id) -> str:
+    return f"quiz:question_pool:{_pool_version()}:exam:{exam_id}"
+
+
+def _scope_pool_key(organization_id) -> str:
+    scope = organization_id or "global"
+    return f"quiz:question_pool:{_pool_version()}:scope:{scope}"
+
+
+def invalidate_question_pools() -> None:
+    """
+    Drop every cached pool (question or category changed).
+    """
+    try:
+        cache.incr(POOL_VERSION_KEY)
+    except ValueError:
+        cache.set(POOL_VERSION_KEY, _pool_version() + 1, None)
+
+
+def invalidate_exam_pool(exam_id) -> None:
+    """
+    Drop the cached pool of a single exam (allocation changed).
+    """
+    if exam_id:
+        cache.delete(_exam_pool_key(exam_id))
+
+
+# ============================================================
+# INDEX BUILD (runs only on cache miss)
+# ============================================================
+
+def _scope_queryset(organization_id):
+    """
+    Active questions visible to an exam of this tenant.
+    🔐 Org exams → that org only, public exams → global only.
+    """
+    qs = Question.objects.active()
+
+    if organization_id:
+        return qs.filter(organization_id=organization_id)
+
+    return qs.filter(organization__isnull=True)
+
+
+def _category_ids(category):
+    try:
+        return category.get_descendants_include_self()
+    except Exception:
+        return [category.id]
+
+
+def build_exam_pool_index(exam) -> dict:
+    """
+    Build the pool index of an exam:
+
+    {
+        "allocations": [(allocation_id, fixed_count, percentage), ...],
+        "pools": {allocation_id: array([question_id, ...])},
+        "category": array([...]),   # legacy exam.category fallback
+    }
+
+    One query for the tenant's (id, category_id) pairs, grouped
+    in memory per allocation.
+    """
+
+    by_category = defaultdict(list)
+
+    rows = (
+        _scope_queryset(exam.organization_id)
+        .order_by("id")
+        .values_list("id", "category_id")
+    )
+    for qid, cid in rows:
+        by_category[cid].append(qid)
+
+    def pool_for(category):
+        ids = array("q")
+        for cid in _category_ids(category):
+            ids.extend(by_category.get(cid, ()))
+        return ids
+
+    allocations = list(exam.allocations.select_related("category"))
+
+    return {
+        "allocations": [
+            (a.id, a.fixed_count, a.percentage) for a in allocations
+        ],
+        "pools": {a.id: pool_for(a.category) for a in allocations},
+        "category": pool_for(exam.category) if exam.category_id else array("q"),
+    }
+
+
+def get_exam_pool_index(exam) -> dict:
+    key = _exam_pool_key(exam.id)
+    index = cache.get(key)
+
+    if index is None:
+        index = build_exam_pool_index(exam)
+        cache.set(key, index, cross_request_timeout(POOL_CACHE_TIMEOUT))
+
+    return index
+
+
+def get_scope_pool(organization_id) -> array:
+    """
+    Every active question ID of the tenant (final fallback only).
+    """
+    key = _scope_pool_key(organization_id)
+    pool = cache.get(key)
+
+    if pool is None:
+        pool = array(
+            "q",
+            _scope_queryset(organization_id)
+            .order_by("id")
+            .values_list("id", flat=True)
+        )
+        cache.set(key, pool, cross_request_timeout(POOL_CACHE_TIMEOUT))
+
+    return pool
+
+
+# ============================================================
+# SAMPLING (pure in-memory)
+# ============================================================
+
+def _draw(pool, count, exclude, rng):
+    """
+    Uniformly draw up to `count` IDs from `pool` that are not in
+    `exclude`, touching at most count + len(exclude) entries.
+    """
+    if count <= 0 or not pool:
+        return []
+
+    size = min(len(pool), count + len(exclude))
+    picked = []
+
+    for i in rng.sample(range(len(pool)), size):
+        qid = pool[i]
+        if qid in exclude:
+            continue
+        picked.append(qid)
+        if len(picked) == count:
+            break
+
+    return picked
+
+
+def allocate_question_ids(exam, seed=None) -> list:
+    """
+    Resolve the question IDs of a new attempt from the cached pool.
+
+    - Supports fixed + percentage allocation
+    - Deterministic if seed is provided (recommended: user_exam.id)
+    - Prevents over-allocation
+    - Uses active questions only
+    - 🔐 Multi-tenant safe
+    """
+
+    total_needed = int(exam.question_count)
+    if total_needed <= 0:
+        return []
+
+    rng = random.Random(seed) if seed is not None else random
+    index = get_exam_pool_index(exam)
+    pools = index["pools"]
+
+    # -------------------------------------------------
+    # 0️⃣ Guard: fixed_count overflow
+    # -------------------------------------------------
+    fixed_total = sum(fixed or 0 for _, fixed, _ in index["allocations"])
+    if fixed_total > total_needed:
+        raise ValueError(
+            f"Fixed allocation ({fixed_total}) exceeds exam.question_count ({total_needed})"
+        )
+
+    selected = []
+    selected_ids = set()
+
+    def take(pool, count):
+        chosen = _draw(pool, count, selected_ids, rng)
+        selected.extend(chosen)
+        selected_ids.update(chosen)
+        return len(chosen)
+
+    # -------------------------------------------------
+    # 1️⃣ FIXED COUNT ALLOCATION
+    # -------------------------------------------------
+    remaining_needed = total_needed
+    percent_allocs = []
+    percent_sum = 0
+
+    for alloc_id, fixed, percentage in index["allocations"]:
+        if fixed:
+            remaining_needed -= take(pools.get(alloc_id, ()), fixed)
+        else:
+            percent_allocs.append((alloc_id, percentage))
+            percent_sum += percentage
+
+    # -------------------------------------------------
+    # 2️⃣ PERCENTAGE ALLOCATION
+    # -------------------------------------------------
+    if percent_allocs and remaining_needed > 0 and percent_sum > 0:
+        raw = []
+
+        for alloc_id, percentage in percent_allocs:
+            scaled = (percentage / percent_sum) * remaining_needed
+            raw.append((alloc_id, math.floor(scaled), scaled % 1))
+
+        percent_counts = {alloc_id: cnt for alloc_id, cnt, _ in raw}
+        left = remaining_needed - sum(percent_counts.values())
+
+        # Distribute remainder fairly
+        for alloc_id, _, remainder in sorted(raw, key=lambda x: x[2], reverse=True):
+            if left <= 0:
+                break
+            percent_counts[alloc_id] += 1
+            left -= 1
+
+        for alloc_id, _ in percent_allocs:
+            take(pools.get(alloc_id, ()), percent_counts.get(alloc_id, 0))
+
+    # -------------------------------------------------
+    # 3️⃣ FALLBACK: legacy category
+    # -------------------------------------------------
+    if len(selected) < total_needed:
+        take(index["category"], total_needed - len(selected))
+
+    # -------------------------------------------------
+    # 4️⃣ FINAL FALLBACK (within allowed tenant scope only)
+    # -------------------------------------------------
+    if len(selected) < total_needed:
+        take(get_scope_pool(exam.organization_id), total_needed - len(selected))
+
+    rng.shuffle(selected)
+
+    return selected[:total_needed]
@@ -0,0 +1,97 @@
+# quiz/services/question_sampler.py
+
+from array import array
+
+from django.core.cache import cache
+
+from core.utils.cache import cross_request_timeout
+from quiz.models import Question
+from quiz.services.category_tree import get_descendant_ids
+from quiz.services.question_pool import POOL_CACHE_TIMEOUT, pool_cache_key
+
+
+# ============================================================
+# PRACTICE QUESTION SAMPLER
+# ============================================================
+# Practice screens pick "a random unseen question" on every click.
+# Instead of ORDER BY RAND() over the filtered bank, the matching
+# IDs are cached once per filter (domain / category / difficulty)
+# and walked in memory by quiz.services.practice_session.
+#
+# Pools share the question-pool version, so the Question / Category
+# signals that invalidate exam pools drop these as well (on a
+# per-process cache, only in that worker: see core.utils.cache).
+
+PRACTICE = "practice"
+EXPRESS = "express"
+
+PRACTICE_TYPES = (
+    Question.SINGLE,
+    Question.MULTI,
+    Question.TRUE_FALSE,
+)
+
+
+def _base_queryset(kind):
+    if kind == PRACTICE:
+        return Question.objects.filter(
+            question_type__in=PRACTICE_TYPES,
+            is_active=True,
+            is_deleted=False,
+        )
+
+    if kind == EXPRESS:
+        return Question.objects.filter(
+            category__isnull=False,
+            is_active=True,
+        )
+
+    raise ValueError(f"Unknown practice pool: {kind}")
+
+
+def _as_id(value):
+    if value is None:
+        return None
+    value = str(value)
+    return int(value) if value.isdigit() else None
+
+
+def get_practice_pool(
+    kind,
+    *,
+    domain_id=None,
+    category_id=None,
+    difficulty=None,
+) -> array:
+    """
+    Sorted array of question IDs matching a practice filter.
+
+    `category_id` is expected to be validated by the caller
+    (active, in the selected domain); its descendants are included.
+    """
+
+    domain_id = _as_id(domain_id)
+    category_id = _as_id(category_id)
+    difficulty = difficulty or None
+
+    key = pool_cache_key(
+        f"{kind}:d{domain_id or ''}:c{category_id or ''}:{difficulty or ''}"
+    )
+    pool = cache.get(key)
+
+    if pool is None:
+        qs = _base_queryset(kind)
+
+        if domain_id:
+            qs = qs.filter(category__domain_id=domain_id)
+
+        if category_id:
+            qs = qs.filter(category_id__in=get_descendant_ids(category_id))
+
+        if difficulty:
+            qs = qs.filter(difficulty=difficulty)
+
+        pool = array("q", qs.order_by("id").values_list("id", flat=True))
+        cache.set(key, pool, cross_request_timeout(POOL_CACHE_TIMEOUT))
+
+    return pool
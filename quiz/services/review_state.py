@@ -0,0 +1,128 @@
+# quiz/services/review_state.py
+
+from datetime import timedelta
+
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+
+from quiz.models import QuestionReviewState
+
+
+# ============================================================
+# SPACED REPETITION (SM-2 style)
+# ============================================================
+# Correct answers push the next review out (1 day, 6 days, then
+# interval x ease); a mistake brings the question back after
+# RELEARN_MINUTES and lowers its ease.
+
+MIN_EASE = 1.3
+RELEARN_MINUTES = 10
+DAY_MINUTES = 60 * 24
+
+
+def _schedule(state: QuestionReviewState, is_correct: bool, now) -> None:
+    if is_correct:
+        state.repetitions += 1
+
+        if state.repetitions == 1:
+            state.interval_minutes = DAY_MINUTES
+        elif state.repetitions == 2:
+            state.interval_minutes = 6 * DAY_MINUTES
+        else:
+            state.interval_minutes = int(
+                max(state.interval_minutes, DAY_MINUTES) * state.ease
+            )
+
+        state.ease = round(state.ease + 0.1, 2)
+
+    else:
+        state.repetitions = 0
+        state.mistake_count += 1
+        state.interval_minutes = RELEARN_MINUTES
+        state.ease = round(max(MIN_EASE, state.ease - 0.2), 2)
+
+    state.last_seen_at = now
+    state.due_at = now + timedelta(minutes=state.interval_minutes)
+
+
+def record_review(user, question_id, is_correct: bool) -> QuestionReviewState:
+    """
+    Update (or create) the review state after an answer.
+    """
+
+    now = timezone.now()
+
+    with transaction.atomic():
+        state = (
+            QuestionReviewState.objects
+            .select_for_update()
+            .filter(user=user, question_id=question_id)
+            .first()
+        )
+
+        if state is None:
+            state = QuestionReviewState(
+                user=user,
+                question_id=question_id,
+            )
+            _schedule(state, is_correct, now)
+
+            try:
+                with transaction.atomic():
+                    state.save()
+                return state
+            except IntegrityError:
+                # Concurrent first answer: fall through to the update
+                state = (
+                    QuestionReviewState.objects
+                    .select_for_update()
+                    .get(user=user, question_id=question_id)
+                )
+
+        _schedule(state, is_correct, now)
+        state.save(update_fields=[
+            "last_seen_at",
+            "due_at",
+            "ease",
+            "interval_minutes",
+            "repetitions",
+            "mistake_count",
+        ])
+
+    return state
+
+
+def get_review_states(user_id, question_ids) -> dict:
+    """
+    {question_id: (last_seen_at, due_at, mistake_count)} for the
+    given questions, in one indexed query.
+    """
+
+    if not user_id or not question_ids:
+        return {}
+
+    return {
+        qid: (last_seen_at, due_at, mistakes)
+        for qid, last_seen_at, due_at, mistakes in (
+            QuestionReviewState.objects
+            .filter(user_id=user_id, question_id__in=question_ids)
+            .values_list("question_id", "last_seen_at", "due_at", "mistake_count")
+        )
+    }
+
+
+def due_question_ids(user_id, question_ids=None, now=None) -> list:
+    """
+    IDs whose review is due, most overdue first (uses the
+    (user, due_at) index).
+    """
+
+    qs = QuestionReviewState.objects.filter(
+        user_id=user_id,
+        due_at__lte=now or timezone.now(),
+    )
+
+    if question_ids is not None:
+        qs = qs.filter(question_id__in=question_ids)
+
+    return list(qs.order_by("due_at").values_list("question_id", flat=True))
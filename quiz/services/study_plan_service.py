@@ -3,6 +3,7 @@
 from django.utils import timezone
 from django.db import transaction
 from quiz.models import StudyPlan, Question
+from quiz.services.plan_stats import record_stat
 
 
 PLAN_CONFIG = {
@@ -92,4 +93,61 @@ def handle_missed_day(plan):
     # but plan not completed → extend
     if today_index >= plan.total_plan_days() and not plan.is_completed:
         plan.extension_days += 1
-        plan.save(update_fields=["extension_days"])
\ No newline at end of file
+        plan.save(update_fields=["extension_days"])
+
+
+def _bump(stats, key, is_correct):
+    row = stats.setdefault(key, {"attempted": 0, "correct": 0})
+    row["attempted"] += 1
+    if is_correct:
+        row["correct"] += 1
+
+
+def record_plan_answer(plan_id, *, category_id, difficulty, is_correct):
+    """
+    Record one study plan answer.
+
+    The plan row is locked, so answers from concurrent tabs are
+    serialized instead of overwriting each other, and totals,
+    category / difficulty stats, today's progress and the
+    completion flags are written in a single UPDATE, followed by
+    the StudyPlanStat counter.
+    """
+
+    with transaction.atomic():
+        plan = StudyPlan.objects.select_for_update().get(id=plan_id)
+
+        plan.total_attempted += 1
+        if is_correct:
+            plan.total_correct += 1
+
+        plan.category_stats = plan.category_stats or {}
+        _bump(plan.category_stats, str(category_id), is_correct)
+
+        plan.difficulty_stats = plan.difficulty_stats or {}
+        _bump(plan.difficulty_stats, difficulty, is_correct)
+
+        day_index = str(plan.get_day_index())
+        plan.daily_progress = plan.daily_progress or {}
+        plan.daily_progress[day_index] = (
+            plan.daily_progress.get(day_index, 0) + 1
+        )
+
+        fields = [
+            "total_attempted",
+            "total_correct",
+            "category_stats",
+            "difficulty_stats",
+            "daily_progress",
+        ]
+
+        if sum(plan.daily_progress.values()) >= plan.total_questions():
+            plan.is_completed = True
+            plan.is_active = False
+            fields += ["is_completed", "is_active"]
+
+        plan.save(update_fields=fields)
+
+        record_stat(plan.id, category_id, difficulty, is_correct)
+
+    return plan
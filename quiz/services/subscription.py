@@ -1,25 +1,16 @@
-from django.utils import timezone
-from quiz.models import ExamSubscription, ExamTrackSubscription
+from quiz.services.access_resolver import get_access_resolver
+
 
 def has_valid_subscription(user, exam):
     track = exam.track
+    resolver = get_access_resolver(user)
 
     # Track-level subscription
     if track and track.subscription_scope == "track":
-        sub = ExamTrackSubscription.objects.filter(
-            user=user,
-            track=track,
-            is_active=True
-        ).first()
-        return sub and sub.is_valid()
+        return resolver.has_track_subscription(track.id)
 
     # Exam-level subscription
-    sub = ExamSubscription.objects.filter(
-        user=user,
-        exam=exam,
-        is_active=True
-    ).first()
-    return sub and sub.is_valid()
+    return resolver.has_exam_subscription(exam.id)
 
 
 
@@ -1,20 +1,42 @@
 from django.utils import timezone
 from quiz.models import ExamSubscription, ExamTrackSubscription
+from courses.models import CourseSubscription
+from quiz.services.entitlements import invalidate_all_entitlements
 
 
 def expire_old_subscriptions():
+    """
+    Deactivate every subscription past its expires_at.
+
+    Access checks (quiz.services.access_resolver) already treat
+    expired rows as invalid, so this is the only place the
+    `is_active` flag is flipped.
+    """
     now = timezone.now()
+    expired = {}
 
     # --------- EXAM SUBSCRIPTIONS ---------
-    ExamSubscription.objects.filter(
+    expired["exam"] = ExamSubscription.objects.filter(
         is_active=True,
         expires_at__isnull=False,
         expires_at__lt=now
     ).update(is_active=False)
 
     # --------- TRACK SUBSCRIPTIONS ---------
-    ExamTrackSubscription.objects.filter(
+    expired["track"] = ExamTrackSubscription.objects.filter(
+        is_active=True,
+        expires_at__isnull=False,
+        expires_at__lt=now
+    ).update(is_active=False)
+
+    # --------- COURSE SUBSCRIPTIONS ---------
+    expired["course"] = CourseSubscription.objects.filter(
         is_active=True,
         expires_at__isnull=False,
         expires_at__lt=now
     ).update(is_active=False)
+
+    if any(expired.values()):
+        invalidate_all_entitlements()
+
+    return expired
@@ -1,20 +1,11 @@
-from quiz.models import ExamSubscription, ExamTrackSubscription
-from django.utils import timezone
+from quiz.services.access_resolver import get_access_resolver
 
 
 def has_active_exam_subscription(user, exam):
-    return ExamSubscription.objects.filter(
-        user=user,
-        exam=exam,
-        is_active=True
-    ).filter(
-        expires_at__isnull=True
-        | models.Q(expires_at__gt=timezone.now())
-    ).exists()
-
+    if not user or not user.is_authenticated or not exam:
+        return False
 
-from django.utils import timezone
-from quiz.models import ExamTrackSubscription
+    return get_access_resolver(user).has_exam_subscription(exam.id)
 
 
 def has_active_track_subscription(user, track) -> bool:
@@ -23,19 +14,7 @@ def has_active_track_subscription(user, track) -> bool:
     to the given track.
     """
 
-    sub = ExamTrackSubscription.objects.filter(
-        user=user,
-        track=track,
-        is_active=True
-    ).first()
-
-    if not sub:
-        return False
-
-    # ⏳ Expiry check
-    if sub.expires_at and sub.expires_at < timezone.now():
-        sub.is_active = False
-        sub.save(update_fields=["is_active"])
+    if not user or not user.is_authenticated or not track:
         return False
 
-    return True
+    return get_access_resolver(user).has_track_subscription(track.id)
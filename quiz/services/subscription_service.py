@@ -2,10 +2,12 @@ from django.db import transaction
 from django.utils import timezone
 
 from quiz.models import (
+    ExamSubscription,
     ExamTrack,
     ExamTrackSubscription,
     SubscriptionPlan,
 )
+from quiz.services.entitlements import invalidate_user_entitlements
 from quiz.services.payment_service import PaymentService
 
 
@@ -49,6 +51,7 @@ class SubscriptionService:
             track=track,
             is_active=True,
         ).update(is_active=False)
+        invalidate_user_entitlements(user.id)
 
         # Create new one via payment service
         PaymentService.apply_payment(
@@ -72,3 +75,26 @@ class SubscriptionService:
         # Minimal implementation (future-proof)
         sub.next_plan = new_plan  # optional future field
         sub.save(update_fields=["next_plan"])
+
+    # -------------------------------------------------
+    # EXPIRING (reminders)
+    # -------------------------------------------------
+    @staticmethod
+    def get_expiring_subscriptions(days):
+        """
+        Active track and exam subscriptions expiring on the day
+        `days` from today.
+        """
+        target = timezone.localdate() + timezone.timedelta(days=days)
+
+        track_subs = ExamTrackSubscription.objects.filter(
+            is_active=True,
+            expires_at__date=target,
+        ).select_related("track")
+
+        exam_subs = ExamSubscription.objects.filter(
+            is_active=True,
+            expires_at__date=target,
+        ).select_related("exam")
+
+        return track_subs, exam_subs
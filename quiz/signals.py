@@ -1,15 +1,142 @@
 # quiz/signals.py
 from django.db.models.signals import post_save, post_delete
+from django.contrib.auth.models import User
 from django.dispatch import receiver
-from .models import Category
+from courses.models import Course, CourseEnrollment, CourseSubscription
+from organizations.models.access import ResourceAccess
+from organizations.models.organization import Organization
+from .models import (
+    Category,
+    Choice,
+    Exam,
+    ExamCategoryAllocation,
+    ExamSubscription,
+    ExamTrackSubscription,
+    Question,
+    StudyPlan,
+    UserExam,
+)
+from .services.answer_keys import invalidate_answer_keys
+from .services.entitlements import invalidate_user_entitlements
+from .services.leaderboard import update_leaderboard_entry
+from .services.platform_metrics import bump_counter
+from .services.category_tree import invalidate_category_tree, sync_category_closure
+from .services.question_pool import invalidate_exam_pool, invalidate_question_pools
 from .utils import clear_leaf_category_cache
 
 @receiver(post_save, sender=Category)
 def _on_category_save(sender, instance, **kwargs):
+    sync_category_closure(instance)
+    invalidate_category_tree()
     clear_leaf_category_cache()
+    invalidate_question_pools()
 
 @receiver(post_delete, sender=Category)
 def _on_category_delete(sender, instance, **kwargs):
+    invalidate_category_tree()
     clear_leaf_category_cache()
+    invalidate_question_pools()
 
 
+# ============================================================
+# EXAM QUESTION POOLS
+# ============================================================
+
+@receiver(post_save, sender=Question)
+@receiver(post_delete, sender=Question)
+def _on_question_change(sender, instance, **kwargs):
+    invalidate_question_pools()
+
+@receiver(post_save, sender=ExamCategoryAllocation)
+@receiver(post_delete, sender=ExamCategoryAllocation)
+def _on_allocation_change(sender, instance, **kwargs):
+    invalidate_exam_pool(instance.exam_id)
+
+@receiver(post_save, sender=Exam)
+def _on_exam_save(sender, instance, **kwargs):
+    invalidate_exam_pool(instance.id)
+
+
+# ============================================================
+# ANSWER KEYS
+# ============================================================
+
+@receiver(post_save, sender=Question)
+@receiver(post_delete, sender=Question)
+def _on_question_answer_change(sender, instance, **kwargs):
+    invalidate_answer_keys([instance.id])
+
+@receiver(post_save, sender=Choice)
+@receiver(post_delete, sender=Choice)
+def _on_choice_change(sender, instance, **kwargs):
+    invalidate_answer_keys([instance.question_id])
+
+
+# ============================================================
+# ENTITLEMENTS
+# ============================================================
+
+@receiver(post_save, sender=ExamSubscription)
+@receiver(post_delete, sender=ExamSubscription)
+@receiver(post_save, sender=ExamTrackSubscription)
+@receiver(post_delete, sender=ExamTrackSubscription)
+@receiver(post_save, sender=CourseSubscription)
+@receiver(post_delete, sender=CourseSubscription)
+@receiver(post_save, sender=ResourceAccess)
+@receiver(post_delete, sender=ResourceAccess)
+def _on_entitlement_change(sender, instance, **kwargs):
+    invalidate_user_entitlements(instance.user_id)
+
+
+# ============================================================
+# LEADERBOARD
+# ============================================================
+# Stats-only saves (answers, daily progress) refresh the entry
+# explicitly from the practice view, once per answer.
+
+LEADERBOARD_FIELDS = {
+    "is_active",
+    "is_completed",
+    "total_days",
+    "extension_days",
+    "xp",
+    "current_streak",
+}
+
+
+@receiver(post_save, sender=StudyPlan)
+def _on_study_plan_save(sender, instance, created, update_fields=None, **kwargs):
+    if created or update_fields is None or LEADERBOARD_FIELDS & set(update_fields):
+        update_leaderboard_entry(instance.user_id)
+
+
+@receiver(post_delete, sender=StudyPlan)
+def _on_study_plan_delete(sender, instance, **kwargs):
+    update_leaderboard_entry(instance.user_id)
+
+
+# ============================================================
+# PLATFORM METRICS COUNTERS
+# ============================================================
+
+@receiver(post_save, sender=User)
+@receiver(post_save, sender=UserExam)
+@receiver(post_save, sender=Course)
+@receiver(post_save, sender=CourseEnrollment)
+@receiver(post_save, sender=Organization)
+@receiver(post_save, sender=ExamTrackSubscription)
+@receiver(post_save, sender=CourseSubscription)
+def _on_counted_save(sender, instance, created, **kwargs):
+    if created:
+        bump_counter(sender, 1)
+
+
+@receiver(post_delete, sender=User)
+@receiver(post_delete, sender=UserExam)
+@receiver(post_delete, sender=Course)
+@receiver(post_delete, sender=CourseEnrollment)
+@receiver(post_delete, sender=Organization)
+@receiver(post_delete, sender=ExamTrackSubscription)
+@receiver(post_delete, sender=CourseSubscription)
+def _on_counted_delete(sender, instance, **kwargs):
+    bump_counter(sender, -1)
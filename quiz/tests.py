@@ -0,0 +1,611 @@
+import json
+from types import SimpleNamespace
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db import connection
+from django.http import QueryDict
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from core.utils.cache import LOCAL_CACHE_TIMEOUT, cross_request_timeout
+from quiz.models import (
+    Category,
+    Choice,
+    Domain,
+    Exam,
+    ExamCategoryAllocation,
+    ExamTrack,
+    ExamTrackSubscription,
+    LeaderboardEntry,
+    Question,
+    StudyPlan,
+    UserAnswer,
+    UserExam,
+)
+from quiz.services.answer_keys import get_answer_key
+from quiz.services.answer_persistence import AUTOSAVE_SEQ_MAX
+from quiz.services.category_tree import get_descendant_ids
+from quiz.services.entitlements import get_entitlements
+from quiz.services.grading import grade_exam
+from quiz.services.leaderboard import (
+    GLOBAL_PARTITION,
+    current_season,
+    get_plan_rank,
+    get_snapshot_rows,
+    partition_key,
+    rank_for_score,
+)
+from quiz.services.practice_session import (
+    SCOPE_PRACTICE,
+    PracticeSession,
+    current_question,
+    shuffled_index,
+)
+from quiz.services.question_pool import get_exam_pool_index
+
+
+# ============================================================
+# CACHE POLICY
+# ============================================================
+
+class CachePolicyTests(TestCase):
+
+    @mock.patch("core.utils.cache.is_shared_cache", return_value=False)
+    def test_timeouts_are_capped_on_a_local_cache(self, _shared):
+        self.assertEqual(cross_request_timeout(None), LOCAL_CACHE_TIMEOUT)
+        self.assertEqual(cross_request_timeout(60 * 60), LOCAL_CACHE_TIMEOUT)
+        self.assertEqual(cross_request_timeout(10), 10)
+
+    @mock.patch("core.utils.cache.is_shared_cache", return_value=True)
+    def test_timeouts_are_kept_on_a_shared_cache(self, _shared):
+        self.assertEqual(cross_request_timeout(60 * 60), 60 * 60)
+
+
+# ============================================================
+# ENTITLEMENTS
+# ============================================================
+
+class EntitlementCacheTests(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create(username="student")
+        self.track = ExamTrack.objects.create(title="Track", slug="track")
+        self.sub = ExamTrackSubscription.objects.create(
+            user=self.user,
+            track=self.track,
+        )
+
+    def test_revocation_is_seen_at_once_on_a_local_cache(self):
+        self.assertTrue(get_entitlements(self.user.id)["track_subs"][self.track.id].is_active)
+
+        # Another worker revoked it: no invalidation reaches this one
+        ExamTrackSubscription.objects.filter(pk=self.sub.pk).update(is_active=False)
+
+        self.assertFalse(get_entitlements(self.user.id)["track_subs"][self.track.id].is_active)
+
+    @mock.patch("quiz.services.entitlements.is_shared_cache", return_value=True)
+    def test_snapshot_is_cached_on_a_shared_cache(self, _shared):
+        get_entitlements(self.user.id)
+
+        with self.assertNumQueries(0):
+            get_entitlements(self.user.id)
+
+
+# ============================================================
+# ANSWER KEYS
+# ============================================================
+
+class AnswerKeyCacheTests(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.question = Question.objects.create(
+            text="2 + 2?",
+            difficulty="easy",
+            question_type=Question.SINGLE,
+        )
+        self.right = Choice.objects.create(question=self.question, text="4", is_correct=True)
+        self.wrong = Choice.objects.create(question=self.question, text="5", is_correct=False)
+
+    def _correct_ids(self):
+        return get_answer_key(self.question.id)["correct_choice_ids"]
+
+    def test_correction_on_another_worker_grades_at_once_on_a_local_cache(self):
+        self.assertEqual(self._correct_ids(), {self.right.id})
+
+        # No signal reaches this process's cache
+        Choice.objects.filter(pk=self.wrong.pk).update(is_correct=True)
+
+        self.assertEqual(self._correct_ids(), {self.right.id, self.wrong.id})
+
+    @mock.patch("quiz.services.answer_keys.is_shared_cache", return_value=True)
+    def test_choice_save_invalidates_the_shared_key(self, _shared):
+        self._correct_ids()
+
+        with self.assertNumQueries(0):
+            self._correct_ids()
+
+        self.right.is_correct = False
+        self.right.save()
+        self.wrong.is_correct = True
+        self.wrong.save()
+
+        self.assertEqual(self._correct_ids(), {self.wrong.id})
+
+
+# ============================================================
+# QUESTION POOLS
+# ============================================================
+
+def _question(category, text="Q", **kwargs):
+    return Question.objects.create(**{
+        "text": text,
+        "difficulty": "easy",
+        "question_type": Question.SINGLE,
+        "category": category,
+        **kwargs,
+    })
+
+
+class QuestionPoolCacheTests(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.category = Category.objects.create(name="Networking", slug="networking")
+        self.exam = Exam.objects.create(title="Exam", duration_seconds=600, question_count=2)
+        self.allocation = ExamCategoryAllocation.objects.create(
+            exam=self.exam,
+            category=self.category,
+            fixed_count=2,
+        )
+        self.question = _question(self.category)
+
+    def _pool(self):
+        return list(get_exam_pool_index(self.exam)["pools"][self.allocation.id])
+
+    def test_new_question_joins_the_cached_pool(self):
+        self.assertEqual(self._pool(), [self.question.id])
+
+        added = _question(self.category, "Q2")
+
+        self.assertEqual(self._pool(), [self.question.id, added.id])
+
+    def test_disabled_question_leaves_the_cached_pool(self):
+        self._pool()
+
+        self.question.is_active = False
+        self.question.save()
+
+        self.assertEqual(self._pool(), [])
+
+    def test_allocation_change_drops_the_exam_pool(self):
+        self._pool()
+
+        other = Category.objects.create(name="Security", slug="security")
+        moved = _question(other, "Q2")
+        self.allocation.category = other
+        self.allocation.save()
+
+        self.assertEqual(self._pool(), [moved.id])
+
+
+# ============================================================
+# CATEGORY TREE
+# ============================================================
+
+class CategoryTreeTests(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.root = Category.objects.create(name="Root", slug="root")
+        self.child = Category.objects.create(name="Child", slug="child", parent=self.root)
+        self.leaf = Category.objects.create(name="Leaf", slug="leaf", parent=self.child)
+        self.other = Category.objects.create(name="Other", slug="other")
+
+    def test_descendants_include_the_whole_subtree(self):
+        self.assertEqual(
+            get_descendant_ids(self.root.id),
+            [self.root.id, self.child.id, self.leaf.id],
+        )
+
+    def test_move_invalidates_cached_descendants(self):
+        get_descendant_ids(self.root.id)
+        get_descendant_ids(self.other.id)
+
+        self.child.parent = self.other
+        self.child.save()
+
+        self.assertEqual(get_descendant_ids(self.root.id), [self.root.id])
+        self.assertEqual(
+            get_descendant_ids(self.other.id),
+            [self.other.id, self.child.id, self.leaf.id],
+        )
+
+    def test_cycle_keeps_the_subtree_attached(self):
+        self.child.parent = self.leaf
+        self.child.save()
+
+        self.assertEqual(
+            get_descendant_ids(self.root.id),
+            [self.root.id, self.child.id, self.leaf.id],
+        )
+
+
+# ============================================================
+# PRACTICE CURSOR
+# ============================================================
+
+class PracticeCursorTests(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.domain = Domain.objects.create(name="Snowflake", slug="snowflake")
+        self.category = Category.objects.create(
+            name="Warehouses",
+            slug="warehouses",
+            domain=self.domain,
+        )
+        self.questions = [
+            _question(self.category, f"Warehouse question {i}")
+            for i in range(3)
+        ]
+
+    def _start(self, filters):
+        session = self.client.session
+        session["p_filters"] = filters
+        session.save()
+
+    def _state(self):
+        return PracticeSession(self.client.session, SCOPE_PRACTICE)
+
+    def _next(self):
+        """
+        POST practice_next_ajax; "html" is the picked question's text.
+        """
+        with mock.patch(
+            "quiz.views.practice.render_to_string",
+            side_effect=lambda name, context, **kw: (
+                context["question"].text if "question" in context else "completed"
+            ),
+        ):
+            return self.client.post(reverse("quiz:practice_next_ajax")).json()
+
+    def test_walk_skips_questions_removed_from_the_cached_pool(self):
+        pool = [q.id for q in self.questions]
+        gone = self.questions[1]
+        Question.objects.filter(pk=gone.pk).update(is_deleted=True)
+
+        state = PracticeSession({}, SCOPE_PRACTICE)
+        state.reset(len(pool))
+
+        live = Question.objects.filter(is_deleted=False)
+        seen = []
+        while (question := current_question(state, pool, live)) is not None:
+            seen.append(question.id)
+            state.advance()
+
+        self.assertEqual(sorted(seen), sorted(set(pool) - {gone.id}))
+
+    def test_walk_restarts_when_the_pool_grows(self):
+        pool = [q.id for q in self.questions]
+        state = PracticeSession({}, SCOPE_PRACTICE)
+        state.reset(len(pool))
+        state.current(pool)
+        state.advance()
+
+        added = _question(self.category, "New warehouse question")
+        pool.append(added.id)
+
+        seen = []
+        while (qid := state.current(pool)) is not None:
+            seen.append(qid)
+            state.advance()
+
+        self.assertEqual(state.total, 4)
+        self.assertEqual(sorted(seen), sorted(pool))
+
+    def test_walk_restarts_when_the_pool_shrinks(self):
+        pool = [q.id for q in self.questions]
+        state = PracticeSession({}, SCOPE_PRACTICE)
+        state.reset(len(pool))
+        state.advance()
+        state.advance()
+
+        pool.pop()
+
+        self.assertIn(state.current(pool), pool)
+        self.assertEqual((state.cursor, state.total), (0, 2))
+
+    def test_next_ignores_a_category_outside_the_domain(self):
+        other = Domain.objects.create(name="Tableau", slug="tableau")
+        foreign = Category.objects.create(name="Dashboards", slug="dashboards", domain=other)
+        _question(foreign, "Dashboard question")
+
+        self._start({"domain": str(self.domain.id), "category": str(foreign.id)})
+
+        self.assertIn("Warehouse question", self._next()["html"])
+
+    def test_next_past_a_deleted_question_does_not_complete(self):
+        self._start({"domain": str(self.domain.id)})
+        self._next()
+
+        # Delete the question the cursor moves to next
+        state = self._state()
+        pool = sorted(q.id for q in self.questions)
+        upcoming = pool[shuffled_index(state.cursor + 1, len(pool), state.seed)]
+        Question.objects.filter(pk=upcoming).update(is_deleted=True)
+
+        last = pool[shuffled_index(state.cursor + 2, len(pool), state.seed)]
+        self.assertEqual(self._next()["html"], Question.objects.get(pk=last).text)
+        self.assertEqual(self._next()["html"], "completed")
+
+    @mock.patch("quiz.views.practice.track_practice_completion", return_value=1)
+    @mock.patch(
+        "quiz.views.practice.get_course_context",
+        return_value=("course", SimpleNamespace(id=1), 1),
+    )
+    def test_threshold_redirect_still_advances_the_cursor(self, _context, _track):
+        state = PracticeSession(self.client.session, SCOPE_PRACTICE)
+        state.reset(3)
+        state.session.save()
+
+        self.assertIn("redirect", self._next())
+        self.assertEqual(self._state().cursor, 1)
+
+
+# ============================================================
+# AUTOSAVE SEQ PROTOCOL
+# ============================================================
+
+class AutosaveSeqTests(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create(username="candidate")
+        self.client.force_login(self.user)
+
+        self.question = _question(Category.objects.create(name="Sets", slug="sets"))
+        self.right = Choice.objects.create(question=self.question, text="A", is_correct=True)
+        self.wrong = Choice.objects.create(question=self.question, text="B", is_correct=False)
+
+        exam = Exam.objects.create(title="Exam", duration_seconds=600, question_count=1)
+        self.ue = UserExam.objects.create(
+            user=self.user,
+            exam=exam,
+            question_order=[self.question.id],
+        )
+
+    def _save(self, seq, choice):
+        return self.client.post(
+            reverse("quiz:exam_autosave", args=[self.ue.id]),
+            data=json.dumps({
+                "seq": seq,
+                "changes": {f"question_{self.question.id}": [str(choice.id)]},
+            }),
+            content_type="application/json",
+        )
+
+    def _answer(self):
+        return UserAnswer.objects.get(user_exam=self.ue, question=self.question).choice_id
+
+    def test_newer_seq_is_applied(self):
+        self.assertEqual(self._save(1, self.wrong).json(), {"status": "ok", "seq": 1})
+        self.assertEqual(self._save(2, self.right).json(), {"status": "ok", "seq": 2})
+
+        self.assertEqual(self._answer(), self.right.id)
+
+    def test_stale_seq_is_refused_with_the_current_seq(self):
+        self._save(5, self.right)
+
+        response = self._save(3, self.wrong)
+
+        self.assertEqual(response.status_code, 409)
+        self.assertEqual(response.json(), {"status": "stale_seq", "seq": 5})
+        self.assertEqual(self._answer(), self.right.id)
+
+    def test_out_of_range_seq_is_a_terminal_bad_request(self):
+        for seq in (0, -1, AUTOSAVE_SEQ_MAX + 1, "x"):
+            response = self._save(seq, self.right)
+
+            self.assertEqual(response.status_code, 400)
+            self.assertTrue(response.json()["terminal"])
+
+        self.assertEqual(self._save(AUTOSAVE_SEQ_MAX, self.right).status_code, 200)
+
+    def test_submitted_attempt_is_terminal(self):
+        UserExam.objects.filter(pk=self.ue.pk).update(submitted_at=timezone.now())
+
+        response = self._save(1, self.right)
+
+        self.assertEqual(response.status_code, 409)
+        self.assertEqual(
+            response.json(),
+            {"status": "attempt_already_submitted", "terminal": True},
+        )
+
+
+# ============================================================
+# GRADING
+# ============================================================
+
+class GradeExamTests(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create(username="grader")
+        self.category = Category.objects.create(name="Maths", slug="maths")
+        self.exam = Exam.objects.create(
+            title="Exam",
+            duration_seconds=600,
+            question_count=6,
+            passing_score=50,
+        )
+
+    def _choice_question(self, question_type, correct, wrong):
+        question = _question(self.category, question_type=question_type)
+        right_ids = [
+            Choice.objects.create(question=question, text=t, is_correct=True).id
+            for t in correct
+        ]
+        wrong_ids = [
+            Choice.objects.create(question=question, text=t, is_correct=False).id
+            for t in wrong
+        ]
+        return question, right_ids, wrong_ids
+
+    def _attempt(self, questions):
+        return UserExam.objects.create(
+            user=self.user,
+            exam=self.exam,
+            question_order=[q.id for q in questions],
+        )
+
+    def test_every_question_type_is_scored_as_before(self):
+        single, (single_ok,), _ = self._choice_question(Question.SINGLE, ["4"], ["5"])
+        multi, (m1, _m2), (m3,) = self._choice_question(Question.MULTI, ["a", "b"], ["c"])
+        tf, _, (tf_wrong,) = self._choice_question(Question.TRUE_FALSE, ["True"], ["False"])
+        fill = _question(self.category, question_type=Question.FILL_BLANK, correct_text="Hello World")
+        numeric = _question(
+            self.category,
+            question_type=Question.NUMERIC,
+            numeric_answer=3.14,
+            numeric_tolerance=0.01,
+        )
+        unanswered, _, _ = self._choice_question(Question.SINGLE, ["x"], ["y"])
+
+        ue = self._attempt([single, multi, tf, fill, numeric, unanswered])
+
+        post = QueryDict(mutable=True)
+        post[f"question_{single.id}"] = str(single_ok)
+        post.setlist(f"question_{multi.id}", [str(m1), str(m3)])
+        post[f"question_{tf.id}"] = str(tf_wrong)
+        post[f"question_{fill.id}"] = "  hello   WORLD "
+        post[f"question_{numeric.id}"] = "3.145"
+
+        score, passed = grade_exam(ue, post)
+
+        # 1 + (1 - 0.5) / 2 + 0 + 1 + 1 + 0 out of 6
+        self.assertEqual(score, 54.17)
+        self.assertTrue(passed)
+
+        answers = {ua.question_id: ua for ua in UserAnswer.objects.filter(user_exam=ue)}
+        self.assertEqual(len(answers), 6)
+        self.assertTrue(answers[single.id].is_correct)
+        self.assertIsNone(answers[multi.id].is_correct)
+        self.assertEqual(answers[multi.id].selections, [m1, m3])
+        self.assertFalse(answers[tf.id].is_correct)
+        self.assertTrue(answers[fill.id].is_correct)
+        self.assertTrue(answers[numeric.id].is_correct)
+        self.assertFalse(answers[unanswered.id].is_correct)
+
+    def test_saved_answers_are_graded_without_a_post(self):
+        question, (right,), _ = self._choice_question(Question.SINGLE, ["4"], ["5"])
+        ue = self._attempt([question])
+        UserAnswer.objects.create(user_exam=ue, question=question, choice_id=right)
+
+        self.assertEqual(grade_exam(ue, None), (100.0, True))
+
+    def test_mock_exams_have_no_pass_result(self):
+        question, _, (wrong,) = self._choice_question(Question.SINGLE, ["4"], ["5"])
+        ue = self._attempt([question])
+
+        self.assertEqual(
+            grade_exam(ue, QueryDict(f"question_{question.id}={wrong}"), is_mock=True),
+            (0.0, None),
+        )
+
+    def test_query_count_does_not_grow_with_the_attempt(self):
+        def queries(size):
+            questions = [
+                self._choice_question(Question.SINGLE, ["4"], ["5"])[0]
+                for _ in range(size)
+            ]
+            ue = self._attempt(questions)
+            cache.clear()
+            with CaptureQueriesContext(connection) as ctx:
+                grade_exam(ue, QueryDict())
+            return len(ctx.captured_queries)
+
+        self.assertEqual(queries(2), queries(20))
+
+
+# ============================================================
+# LEADERBOARD
+# ============================================================
+
+class LeaderboardRankTests(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.domain_a = Domain.objects.create(name="Snowflake", slug="snowflake")
+        self.domain_b = Domain.objects.create(name="Tableau", slug="tableau")
+        self.user = User.objects.create(username="both")
+        self.other = User.objects.create(username="only-a")
+
+        # "both" is strongest overall (B), but weakest in A
+        self.user_a = self._plan(self.user, self.domain_a, xp=100)
+        self.user_b = self._plan(self.user, self.domain_b, xp=5000)
+        self.other_a = self._plan(self.other, self.domain_a, xp=900)
+
+    def _plan(self, user, domain, xp):
+        return StudyPlan.objects.create(
+            user=user,
+            domain=domain,
+            plan_type=7,
+            total_days=7,
+            questions_per_day=4,
+            question_ids=[],
+            start_date=timezone.localdate(),
+            xp=xp,
+        )
+
+    def test_domain_rank_uses_the_best_plan_in_that_domain(self):
+        self.assertEqual(get_plan_rank(self.other_a, self.domain_a.id)[0], 1)
+        self.assertEqual(get_plan_rank(self.user_a, self.domain_a.id)[0], 2)
+        self.assertEqual(get_plan_rank(self.user_b, self.domain_b.id)[0], 1)
+
+    def test_global_rank_uses_each_users_best_plan(self):
+        self.assertEqual(get_plan_rank(self.user_b)[0], 1)
+        self.assertEqual(get_plan_rank(self.other_a)[0], 2)
+
+    def test_entry_follows_the_best_active_plan(self):
+        entry = LeaderboardEntry.objects.get(user=self.user)
+        self.assertEqual(entry.plan_id, self.user_b.id)
+
+        self.user_b.is_active = False
+        self.user_b.save()
+
+        entry.refresh_from_db()
+        self.assertEqual(entry.plan_id, self.user_a.id)
+        self.assertEqual(rank_for_score(entry.score), (2, 0.0))
+
+    def _board(self, partition):
+        return [
+            (row.rank, row.user.username, row.percentile)
+            for row in get_snapshot_rows(partition)
+        ]
+
+    def test_snapshot_partitions_rank_each_users_best_plan_there(self):
+        domain_a = partition_key(domain_id=self.domain_a.id)
+
+        self.assertEqual(
+            self._board(domain_a),
+            [(1, "only-a", 50.0), (2, "both", 0.0)],
+        )
+        self.assertEqual(
+            self._board(partition_key(domain_id=self.domain_a.id, season=current_season())),
+            self._board(domain_a),
+        )
+        self.assertEqual(
+            self._board(partition_key(domain_id=self.domain_b.id)),
+            [(1, "both", 0.0)],
+        )
+        self.assertEqual(
+            self._board(GLOBAL_PARTITION),
+            [(1, "both", 50.0), (2, "only-a", 0.0)],
+        )
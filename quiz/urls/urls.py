@@ -144,6 +144,18 @@ urlpatterns = [
         name="exam_autosave",
     ),
 
+    path(
+        "exam/attempt/<int:user_exam_id>/single/",
+        exam_take_single,
+        name="exam_take_single",
+    ),
+
+    path(
+        "exam/attempt/<int:user_exam_id>/payload/",
+        exam_payload,
+        name="exam_payload",
+    ),
+
     path(
         "exam/attempt/<int:user_exam_id>/submit/",
         exam_submit,
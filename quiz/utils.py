@@ -238,48 +238,13 @@ def calculate_global_percentile(plan):
 
 def calculate_live_rank(plan, domain_id=None):
     """
-    Calculate real-time global rank & percentile
-    among active users.
+    Real-time global rank & percentile among active users.
     Optionally filter by domain.
-    """
-
-    from .models import StudyPlan
-
-    # Only compare active competitive plans
-    plans = StudyPlan.objects.filter(is_active=True)
-
-    if domain_id:
-        plans = plans.filter(domain_id=domain_id)
-
-    plans = list(plans)
-
-    if not plans:
-        return None, 0
 
-    # Compute competitive score safely
-    scored = []
-
-    for p in plans:
-        try:
-            score = p.global_competitive_score()
-        except Exception:
-            score = 0
-        scored.append((p.id, score))
-
-    # Sort highest score first
-    scored.sort(key=lambda x: x[1], reverse=True)
-
-    total_users = len(scored)
-
-    # Find rank
-    for index, (pid, _) in enumerate(scored, start=1):
-        if pid == plan.id:
-
-            percentile = round(
-                ((total_users - index) / total_users) * 100,
-                2
-            ) if total_users > 0 else 0
+    Answered from the incrementally maintained LeaderboardEntry
+    table (quiz.services.leaderboard).
+    """
 
-            return index, percentile
+    from .services.leaderboard import get_plan_rank
 
-    return None, 0
\ No newline at end of file
+    return get_plan_rank(plan, domain_id)
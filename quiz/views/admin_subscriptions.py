@@ -26,6 +26,7 @@ from quiz.models import (
     PaymentRecord,
 )
 
+from quiz.services.entitlements import invalidate_user_entitlements
 from quiz.services.payment_service import PaymentService
 from quiz.services.subscription_service import SubscriptionService
 
@@ -175,6 +176,10 @@ def admin_revoke_track(request):
         is_active=False
     )
 
+    invalidate_user_entitlements(
+        request.POST.get("user_id")
+    )
+
     return JsonResponse(
         {
             "success": True,
@@ -230,6 +235,10 @@ def admin_revoke_exam(request):
         is_active=False
     )
 
+    invalidate_user_entitlements(
+        request.POST.get("user_id")
+    )
+
     return JsonResponse(
         {
             "success": True,
@@ -596,6 +605,8 @@ def admin_update_exam_expiry(request):
             is_active=True,
         )
 
+    invalidate_user_entitlements(user_id)
+
     return JsonResponse(
         {
             "success": True,
@@ -652,6 +663,8 @@ def admin_update_track_expiry(request):
             is_active=True,
         )
 
+    invalidate_user_entitlements(user_id)
+
     return JsonResponse(
         {
             "success": True,
@@ -95,6 +95,7 @@ from quiz.models import (
 from courses.models import Course, CourseEnrollment
 from organizations.models.organization import Organization
 from organizations.models.membership import OrganizationMember
+from quiz.services.platform_metrics import get_metric_trends, get_platform_metrics
 
 
 
@@ -104,492 +105,26 @@ from organizations.models.membership import OrganizationMember
 
 @staff_member_required
 def admin_dashboard(request):
+    """
+    Reads the pre-aggregated KPIs (quiz.services.platform_metrics);
+    run `rollup_platform_metrics` periodically to refresh them.
+    """
 
-    now = timezone.now()
-
-    seven_days_ago = now - timedelta(days=7)
-    thirty_days_ago = now - timedelta(days=30)
-
-    # =====================================================
-    # USER INTELLIGENCE
-    # =====================================================
-
-    total_users = User.objects.count()
-
-    active_users_7d = User.objects.filter(
-        last_login__gte=seven_days_ago
-    ).count()
-
-    new_users_7d = User.objects.filter(
-        date_joined__gte=seven_days_ago
-    ).count()
-
-    users_with_no_attempts = User.objects.annotate(
-        attempts=Count("exam_attempts")
-    ).filter(
-        attempts=0
-    ).count()
-
-
-    # =====================================================
-    # EXAM INTELLIGENCE
-    # =====================================================
-
-    total_attempts = UserExam.objects.filter(
-        submitted_at__isnull=False
-    ).count()
-
-    passed_attempts = UserExam.objects.filter(
-        passed=True
-    ).count()
-
-    avg_score = UserExam.objects.aggregate(
-        avg=Avg("score")
-    )["avg"]
-
-    pass_rate = (
-        (passed_attempts / total_attempts) * 100
-        if total_attempts
-        else 0
-    )
-
-    most_attempted_exam = (
-        Exam.objects
-        .annotate(
-            attempts=Count("userexam")
-        )
-        .order_by("-attempts")
-        .first()
-    )
-
-
-    # =====================================================
-    # COURSE INTELLIGENCE
-    # =====================================================
-
-    total_courses = Course.objects.count()
-
-    published_courses = Course.objects.filter(
-        is_published=True,
-    ).count()
-
-    # NEW:
-    # Courses waiting for administrator moderation
-    pending_course_reviews = Course.objects.filter(
-        approval_status=Course.APPROVAL_PENDING,
-    ).count()
-
-    platform_courses = Course.objects.filter(
-        owner_type="platform"
-    ).count()
-
-    org_courses = Course.objects.filter(
-        owner_type="organization"
-    ).count()
-
-    total_enrollments = CourseEnrollment.objects.count()
-
-    most_popular_course = (
-        Course.objects
-        .annotate(
-            enroll_count=Count("enrollments")
-        )
-        .order_by("-enroll_count")
-        .first()
-    )
-
-
-    # =====================================================
-    # ORGANIZATION INTELLIGENCE
-    # =====================================================
-
-    total_orgs = Organization.objects.count()
-
-    active_orgs = Organization.objects.filter(
-        is_active=True
-    ).count()
-
-    total_org_members = OrganizationMember.objects.filter(
-        is_active=True
-    ).count()
-
-    org_student_count = OrganizationMember.objects.filter(
-        role="student",
-        is_active=True
-    ).count()
-
-    org_admin_count = OrganizationMember.objects.filter(
-        role="org_admin",
-        is_active=True
-    ).count()
-
-
-    # =====================================================
-    # SUBSCRIPTION INTELLIGENCE
-    # =====================================================
-
-    total_track_subs = ExamTrackSubscription.objects.count()
-
-    active_track_subs = ExamTrackSubscription.objects.filter(
-        is_active=True,
-        expires_at__gte=now
-    ).count()
-
-    expired_track_subs = ExamTrackSubscription.objects.filter(
-        is_active=True,
-        expires_at__lt=now
-    ).count()
-
-    trial_subs = ExamTrackSubscription.objects.filter(
-        is_trial=True
-    ).count()
-
-    paid_subs = ExamTrackSubscription.objects.filter(
-        payment_required=True
-    ).count()
-
-    conversion_rate = (
-        (paid_subs / trial_subs) * 100
-        if trial_subs
-        else 0
-    )
-
-
-    # =====================================================
-    # REVENUE INTELLIGENCE
-    # =====================================================
-
-    total_revenue = (
-        ExamTrackSubscription.objects
-        .filter(
-            payment_required=True
-        )
-        .aggregate(
-            total=Sum("amount")
-        )["total"]
-    ) or 0
-
-    revenue_30d = (
-        ExamTrackSubscription.objects
-        .filter(
-            payment_required=True,
-            subscribed_at__gte=thirty_days_ago
-        )
-        .aggregate(
-            total=Sum("amount")
-        )["total"]
-    ) or 0
-
-    arpu = (
-        total_revenue / paid_subs
-        if paid_subs
-        else 0
-    )
-
-
-    # =====================================================
-    # BUSINESS HEALTH
-    # =====================================================
-
-    churn_risk_users = User.objects.filter(
-        track_subscriptions__is_active=True,
-        last_login__lt=thirty_days_ago
-    ).distinct().count()
-
-
-    # =====================================================
-    # TRACK ANALYTICS
-    # =====================================================
-
-    tracks = (
-        ExamTrack.objects
-        .annotate(
-            enrolled=Count(
-                "subscriptions__user",
-                filter=Q(
-                    subscriptions__is_active=True
-                ),
-                distinct=True
-            ),
-            revenue=Sum(
-                "subscriptions__amount",
-                filter=Q(
-                    subscriptions__payment_required=True
-                )
-            )
-        )
-    )
-
-    track_rows = []
-
-    for track in tracks:
-
-        track_rows.append({
-            "track": track,
-            "enrolled": track.enrolled,
-            "revenue": track.revenue or 0,
-        })
-
-
-    # =====================================================
-    # COURSE SUBSCRIPTIONS
-    # =====================================================
-
-    total_course_subs = (
-        CourseSubscription.objects.count()
-    )
-
-    active_course_subs = (
-        CourseSubscription.objects.filter(
-            is_active=True
-        ).count()
-    )
-
-    expired_course_subs = (
-        CourseSubscription.objects.filter(
-            is_active=True,
-            expires_at__lt=now
-        ).count()
-    )
-
-    trial_course_subs = (
-        CourseSubscription.objects.filter(
-            payment_required=False
-        ).count()
-    )
-
-    paid_course_subs = (
-        CourseSubscription.objects.filter(
-            payment_required=True
-        ).count()
-    )
-
-    course_conversion_rate = (
-        (paid_course_subs / trial_course_subs) * 100
-        if trial_course_subs
-        else 0
-    )
-
-    course_revenue = (
-        CourseSubscription.objects
-        .filter(
-            payment_required=True
-        )
-        .aggregate(
-            total=Sum("amount")
-        )["total"]
-    ) or 0
-
-    source_breakdown = (
-        CourseSubscription.objects
-        .values("source")
-        .annotate(
-            count=Count("id")
-        )
-    )
-
-    most_subscribed_course = (
-        Course.objects
-        .annotate(
-            sub_count=Count("subscriptions")
-        )
-        .order_by("-sub_count")
-        .first()
-    )
-
-
-    # =====================================================
-    # CONTEXT
-    # =====================================================
+    row = get_platform_metrics()
 
     context = {
-
-        # -------------------------------------------------
-        # User Intelligence
-        # -------------------------------------------------
-
-        "total_users": total_users,
-        "active_users_7d": active_users_7d,
-        "new_users_7d": new_users_7d,
-        "users_with_no_attempts": users_with_no_attempts,
-
-
-        # -------------------------------------------------
-        # Exam Intelligence
-        # -------------------------------------------------
-
-        "total_attempts": total_attempts,
-        "pass_rate": round(
-            pass_rate,
-            2
-        ),
-        "avg_score": (
-            round(avg_score, 2)
-            if avg_score
-            else None
-        ),
-        "most_attempted_exam": (
-            most_attempted_exam
-        ),
-
-
-        # -------------------------------------------------
-        # Course Intelligence
-        # -------------------------------------------------
-
-        "total_courses": total_courses,
-
-        "published_courses": (
-            published_courses
-        ),
-
-        # NEW
-        "pending_course_reviews": (
-            pending_course_reviews
-        ),
-
-        "platform_courses": (
-            platform_courses
-        ),
-
-        "org_courses": (
-            org_courses
-        ),
-
-        "total_enrollments": (
-            total_enrollments
-        ),
-
-        "most_popular_course": (
-            most_popular_course
-        ),
-
-
-        # -------------------------------------------------
-        # Organization Intelligence
-        # -------------------------------------------------
-
-        "total_orgs": total_orgs,
-
-        "active_orgs": active_orgs,
-
-        "total_org_members": (
-            total_org_members
-        ),
-
-        "org_student_count": (
-            org_student_count
-        ),
-
-        "org_admin_count": (
-            org_admin_count
-        ),
-
-
-        # -------------------------------------------------
-        # Subscription Intelligence
-        # -------------------------------------------------
-
-        "total_track_subs": (
-            total_track_subs
-        ),
-
-        "active_track_subs": (
-            active_track_subs
-        ),
-
-        "expired_track_subs": (
-            expired_track_subs
-        ),
-
-        "trial_subs": (
-            trial_subs
-        ),
-
-        "paid_subs": (
-            paid_subs
-        ),
-
-        "conversion_rate": round(
-            conversion_rate,
-            2
-        ),
-
-
-        # -------------------------------------------------
-        # Revenue
-        # -------------------------------------------------
-
-        "total_revenue": (
-            total_revenue
-        ),
-
-        "revenue_30d": (
-            revenue_30d
-        ),
-
-        "arpu": round(
-            arpu,
-            2
-        ),
-
-
-        # -------------------------------------------------
-        # Business Health
-        # -------------------------------------------------
-
-        "churn_risk_users": (
-            churn_risk_users
-        ),
-
-
-        # -------------------------------------------------
-        # Tracks
-        # -------------------------------------------------
-
-        "track_rows": track_rows,
-
-
-        # -------------------------------------------------
-        # Course Subscription KPIs
-        # -------------------------------------------------
-
-        "total_course_subs": (
-            total_course_subs
-        ),
-
-        "active_course_subs": (
-            active_course_subs
-        ),
-
-        "expired_course_subs": (
-            expired_course_subs
-        ),
-
-        "trial_course_subs": (
-            trial_course_subs
-        ),
-
-        "paid_course_subs": (
-            paid_course_subs
-        ),
-
-        "course_conversion_rate": round(
-            course_conversion_rate,
-            2
-        ),
-
-        "course_revenue": (
-            course_revenue
-        ),
-
-        "source_breakdown": (
-            source_breakdown
-        ),
-
-        "most_subscribed_course": (
-            most_subscribed_course
-        ),
+        **row.metrics,
+
+        # Live counters
+        "total_users": row.total_users,
+        "total_courses": row.total_courses,
+        "total_enrollments": row.total_enrollments,
+        "total_orgs": row.total_orgs,
+        "total_track_subs": row.total_track_subs,
+        "total_course_subs": row.total_course_subs,
+
+        "metrics_computed_at": row.computed_at,
+        "trends": get_metric_trends(row, days=7),
     }
 
     return render(
@@ -611,7 +146,7 @@ from quiz.models import Exam, UserExam
 from organizations.models.assignment import ResourceAssignment
 from organizations.models.access import ResourceAccess
 
-from courses.models.subscription import CourseSubscription
+from quiz.services.access_resolver import get_access_resolver
 from courses.models.progress import LessonProgress
 
 from core.utils.memory import get_memory_usage_mb
@@ -662,43 +197,9 @@ def student_dashboard(request):
     # SUBSCRIPTIONS
     # --------------------------------------------------
 
-    track_subs = {
-        s.track_id: s
-        for s in ExamTrackSubscription.objects.filter(user=user)
-    }
-
-    exam_subs = {
-        s.exam_id: s
-        for s in ExamSubscription.objects.filter(user=user)
-    }
-
-    # --------------------------------------------------
-    # ORGANIZATION ASSIGNMENTS
-    # --------------------------------------------------
-# --------------------------------------------------
-# ORGANIZATION RESOURCE ACCESS
-# --------------------------------------------------
-
-    resource_access = (
-    ResourceAccess.objects
-    .filter(
-        user=user,
-        source="organization",
-        is_active=True
-    )
-    .select_related("track", "exam")
-    )
-
-    org_track_ids = set()
-    org_exam_ids = set()
-
-    for access in resource_access:
-
-        if access.resource_type == "track" and access.track:
-            org_track_ids.add(access.track_id)
-
-        elif access.resource_type == "exam" and access.exam:
-            org_exam_ids.add(access.exam_id)
+    # Subscriptions and organization grants are loaded once
+    # by the request-scoped access resolver.
+    resolver = get_access_resolver(user)
     # --------------------------------------------------
     # PRELOAD USER ATTEMPTS (PERFORMANCE)
     # --------------------------------------------------
@@ -754,25 +255,22 @@ def student_dashboard(request):
         if not track:
             continue
 
-        track_sub = track_subs.get(track.id)
-        exam_sub = exam_subs.get(exam.id)
+        track_sub = resolver.track_subscription(track.id)
+        exam_sub = resolver.exam_subscription(exam.id)
 
         # ---------------- ACCESS LOGIC ----------------
 
         has_valid_subscription = (
-            (track_sub and track_sub.is_valid()) or
-            (exam_sub and exam_sub.is_valid())
+            resolver.has_track_subscription(track.id) or
+            resolver.has_exam_subscription(exam.id)
         )
 
         has_expired_subscription = (
-            (track_sub and not track_sub.is_valid()) or
-            (exam_sub and not exam_sub.is_valid())
+            (track_sub and not resolver.has_track_subscription(track.id)) or
+            (exam_sub and not resolver.has_exam_subscription(exam.id))
         )
 
-        has_org_access = (
-            exam.id in org_exam_ids or
-            track.id in org_track_ids
-        )
+        has_org_access = resolver.has_org_exam_access(exam)
 
         if not has_valid_subscription and not has_org_access and not has_expired_subscription:
             continue
@@ -930,11 +428,7 @@ def student_dashboard(request):
     # PERSONAL COURSE SUBSCRIPTIONS
     # --------------------------------------------------
 
-    course_subs = (
-        CourseSubscription.objects
-        .filter(user=user, is_active=True)
-        .select_related("course")
-    )
+    course_subs = resolver.active_course_subscriptions()
 
     courses_data = []
 
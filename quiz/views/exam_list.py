@@ -4,14 +4,14 @@ from django.contrib.auth.decorators import login_required
 from django.shortcuts import render
 from quiz.models import (
     ExamTrack,
-    ExamSubscription,
-    ExamTrackSubscription,
     UserExam,
 )
-from courses.models import Course, CourseSubscription
+from quiz.services.access_resolver import get_access_resolver
+from courses.models import Course
 @login_required
 def exam_list(request):
     user = request.user
+    resolver = get_access_resolver(user)
 
     # ================================
     # COURSES (PLATFORM ONLY)
@@ -21,18 +21,10 @@ def exam_list(request):
         organization__isnull=True,   # ✅ THIS is the key filter
     ).order_by("-created_at")
 
-    subscribed_course_ids = set(
-        CourseSubscription.objects.filter(
-            user=user,
-            is_active=True,
-            course__organization__isnull=True
-        ).values_list("course_id", flat=True)
-    )
-
     courses = [
         {
             "course": course,
-            "is_subscribed": course.id in subscribed_course_ids,
+            "is_subscribed": resolver.has_course_subscription(course.id),
         }
         for course in courses_qs
     ]
@@ -50,22 +42,6 @@ def exam_list(request):
         .order_by("title")
     )
 
-    track_subs = {
-        s.track_id: s
-        for s in ExamTrackSubscription.objects.filter(
-            user=user,
-            is_active=True
-        )
-    }
-
-    exam_subs = {
-        s.exam_id: s
-        for s in ExamSubscription.objects.filter(
-            user=user,
-            is_active=True
-        )
-    }
-
     passed_exam_ids = set(
         UserExam.objects.filter(
             user=user,
@@ -85,11 +61,10 @@ def exam_list(request):
         if not exams.exists():
             continue
 
-        track_subscription = track_subs.get(track.id)
-        is_track_subscribed = (
-            track_subscription is not None
-            and track_subscription.is_valid()
-        )
+        track_subscription = resolver.track_subscription(track.id)
+        if track_subscription and not track_subscription.is_active:
+            track_subscription = None
+        is_track_subscribed = resolver.has_track_subscription(track.id)
 
         items = []
 
@@ -112,11 +87,10 @@ def exam_list(request):
                 if not has_prev:
                     locked_reason = f"Pass Level {exam.level - 1} first"
 
-            exam_subscription = exam_subs.get(exam.id)
-            is_exam_subscribed = (
-                exam_subscription is not None
-                and exam_subscription.is_valid()
-            )
+            exam_subscription = resolver.exam_subscription(exam.id)
+            if exam_subscription and not exam_subscription.is_active:
+                exam_subscription = None
+            is_exam_subscribed = resolver.has_exam_subscription(exam.id)
 
             can_subscribe = (
                 track.subscription_scope == ExamTrack.EXAM
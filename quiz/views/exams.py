@@ -1,3 +1,4 @@
+import json
 import math
 import random
 import logging
@@ -35,12 +36,13 @@ from django.core.mail import send_mail
 from django.core.paginator import Paginator
 from django.db import IntegrityError, transaction
 from django.db.models import Avg, Count, Q, Sum
-from django.http import HttpResponseBadRequest, JsonResponse
+from django.http import HttpResponse, HttpResponseBadRequest, JsonResponse
 from django.shortcuts import get_object_or_404, redirect, render
 from django.urls import reverse_lazy
 from django.utils import timezone
 from django.utils.dateformat import DateFormat
 from django.utils.formats import get_format
+from django.views.decorators.gzip import gzip_page
 from django.views.decorators.http import require_GET, require_POST
 from django.views.generic import CreateView, DetailView, TemplateView, UpdateView
 
@@ -62,7 +64,18 @@ from quiz.services.pricing import apply_coupon
 from quiz.services.subscription import has_valid_subscription
 from quiz.utils import get_leaf_category_name
 from quiz.services.grading import grade_exam
-from quiz.services.answer_persistence import autosave_answers
+from quiz.services.answer_persistence import (
+    AUTOSAVE_SEQ_MAX,
+    apply_autosave_delta,
+    autosave_answers,
+)
+from quiz.services.answer_keys import get_answer_keys
+from quiz.services.attempt_cache import (
+    clear_attempt_cache,
+    get_attempt_question,
+    get_attempt_questions_json,
+)
+from quiz.services.question_pool import allocate_question_ids
 
 
 
@@ -157,17 +170,17 @@ def exam_start(request, exam_id):
                 exam=exam
             )
 
-            questions = allocate_questions_for_exam(exam, seed=ue.id)
-            if not questions:
+            question_ids = allocate_questions_for_exam(exam, seed=ue.id)
+            if not question_ids:
                 raise ValueError("No questions allocated")
 
-            ue.question_order = [q.id for q in questions]
+            ue.question_order = question_ids
             ue.current_index = 0
-            ue.save()
+            ue.save(update_fields=["question_order", "current_index"])
 
             UserAnswer.objects.bulk_create([
-                UserAnswer(user_exam=ue, question=q)
-                for q in questions
+                UserAnswer(user_exam=ue, question_id=qid)
+                for qid in question_ids
             ])
 
     except Exception:
@@ -195,7 +208,11 @@ def exam_question(request, user_exam_id, index):
     if mem is not None:
         logger.info(f"Exam Question page memory usage: {mem} MB")
 
-    ue = get_object_or_404(UserExam, pk=user_exam_id, user=request.user)
+    ue = get_object_or_404(
+        UserExam.objects.select_related("exam"),
+        pk=user_exam_id,
+        user=request.user,
+    )
 
     if ue.submitted_at:
         return redirect('quiz:exam_result', user_exam_id=ue.id)
@@ -210,8 +227,13 @@ def exam_question(request, user_exam_id, index):
         return redirect('quiz:exam_take', user_exam_id=ue.id)
 
     q_id = q_ids[index]
+
+    # Questions + shuffled choices come from the attempt cache
+    q, choices = get_attempt_question(ue, q_id)
+    if q is None:
+        return redirect('quiz:exam_take', user_exam_id=ue.id)
+
     ua = ue.answers.get(question_id=q_id)
-    q = ua.question
 
     # -------------------------------
     # ✅ SAVE ANSWER (POST HANDLING)
@@ -241,7 +263,7 @@ def exam_question(request, user_exam_id, index):
             ua.choice = None
             ua.selections = None
 
-        ua.save()
+        ua.save(update_fields=["choice", "selections", "raw_answer"])
 
         nav = request.POST.get("nav")
 
@@ -258,12 +280,9 @@ def exam_question(request, user_exam_id, index):
     # DISPLAY QUESTION
     # -------------------------------
 
-    choices = list(q.choices.all()) if q.question_type in ('single', 'multi', 'tf', 'dropdown') else []
-    if choices:
-        random.shuffle(choices)
-
-    ue.current_index = index
-    ue.save()
+    if ue.current_index != index:
+        ue.current_index = index
+        ue.save(update_fields=["current_index"])
 
     progress = int(((index + 1) / len(q_ids)) * 100) if q_ids else 0
 
@@ -283,10 +302,11 @@ def exam_question(request, user_exam_id, index):
 def autosave(request, user_exam_id):
     ue = get_object_or_404(UserExam, pk=user_exam_id, user=request.user)
 
-    # refuse autosave after submit
+    # refuse autosave after submit; "terminal": the client stops
+    # autosaving instead of retrying
     if ue.submitted_at:
         return JsonResponse(
-            {"status": "attempt_already_submitted"},
+            {"status": "attempt_already_submitted", "terminal": True},
             status=409
         )
 
@@ -296,6 +316,31 @@ def autosave(request, user_exam_id):
             status=405
         )
 
+    # -------------------------------
+    # JSON DELTA PROTOCOL
+    # {"seq": 7, "changes": {"question_12": ["34"], ...}}
+    # -------------------------------
+    if request.content_type == "application/json":
+        try:
+            payload = json.loads(request.body or b"{}")
+            seq = int(payload.get("seq"))
+            changes = payload.get("changes") or {}
+        except (TypeError, ValueError, AttributeError):
+            return JsonResponse({"status": "bad_request", "terminal": True}, status=400)
+
+        if not 0 < seq <= AUTOSAVE_SEQ_MAX or not isinstance(changes, dict):
+            return JsonResponse({"status": "bad_request", "terminal": True}, status=400)
+
+        applied, current_seq = apply_autosave_delta(ue, seq, changes)
+
+        if not applied:
+            return JsonResponse(
+                {"status": "stale_seq", "seq": current_seq},
+                status=409
+            )
+
+        return JsonResponse({"status": "ok", "seq": current_seq})
+
     autosave_answers(ue, request.POST)
 
     return JsonResponse({"status": "ok"})
@@ -303,6 +348,77 @@ def autosave(request, user_exam_id):
 
 
 
+@login_required
+def exam_take_single(request, user_exam_id):
+    """
+    Single-payload mode: the page downloads the whole attempt once
+    (exam_payload) and navigates client-side; autosave is the only
+    server traffic until submit.
+    """
+
+    ue = get_object_or_404(
+        UserExam.objects.select_related("exam"),
+        pk=user_exam_id,
+        user=request.user,
+    )
+
+    if ue.submitted_at:
+        return redirect('quiz:exam_result', user_exam_id=ue.id)
+
+    remaining = ue.time_remaining()
+    if remaining <= 0:
+        return redirect('quiz:exam_submit', user_exam_id=ue.id)
+
+    return render(request, 'quiz/student/exam/exam_single.html', {
+        'user_exam': ue,
+        'remaining': remaining,
+        'start_index': ue.current_index or 0,
+    })
+
+
+@login_required
+@gzip_page
+@require_GET
+def exam_payload(request, user_exam_id):
+    ue = get_object_or_404(
+        UserExam.objects.select_related("exam"),
+        pk=user_exam_id,
+        user=request.user,
+    )
+
+    if ue.submitted_at:
+        return JsonResponse(
+            {"status": "attempt_already_submitted"},
+            status=409
+        )
+
+    answers = {
+        str(qid): {
+            "choice_id": choice_id,
+            "selections": selections,
+            "raw_answer": raw_answer,
+        }
+        for qid, choice_id, selections, raw_answer in ue.answers.values_list(
+            "question_id", "choice_id", "selections", "raw_answer"
+        )
+    }
+
+    # Questions are serialized once per attempt; only the answers
+    # are encoded per request.
+    body = (
+        '{"attempt_id":%d,"remaining":%d,"seq":%d,"answers":%s,"questions":%s}'
+        % (
+            ue.id,
+            ue.time_remaining(),
+            ue.autosave_seq,
+            json.dumps(answers, separators=(",", ":")),
+            get_attempt_questions_json(ue),
+        )
+    )
+
+    return HttpResponse(body, content_type="application/json")
+
+
 @login_required
 def exam_submit(request, user_exam_id):
 
@@ -318,6 +434,8 @@ def exam_submit(request, user_exam_id):
     else:
         grade_exam(ue, None, is_mock=is_mock)
 
+    clear_attempt_cache(ue.id)
+
     return redirect('quiz:exam_result', user_exam_id=ue.id)
 
 
@@ -420,33 +538,33 @@ def exam_result(request, user_exam_id):
     # =====================================================
     # BUILD ANSWER DISPLAY DATA
     # =====================================================
+    answer_keys = get_answer_keys([a.question_id for a in answers])
+
     for ans in answers:
         q = ans.question
         ans.user_answers_display = []
         ans.correct_answers_display = []
 
+        # Prefetched choices + cached key (no per-answer queries)
+        choices = list(q.choices.all())
+        correct_ids = answer_keys[q.id]["correct_choice_ids"]
+
         if q.question_type in ('single', 'dropdown', 'tf'):
             if ans.choice:
                 ans.user_answers_display = [ans.choice.text]
-            correct = q.choices.filter(is_correct=True).first()
+            correct = next((c for c in choices if c.id in correct_ids), None)
             if correct:
                 ans.correct_answers_display = [correct.text]
 
         elif q.question_type == 'multi':
             selected_ids = set(ans.selections or [])
-            correct_ids = set(
-                q.choices.filter(is_correct=True)
-                .values_list('id', flat=True)
-            )
 
-            ans.user_answers_display = list(
-                q.choices.filter(id__in=selected_ids)
-                .values_list('text', flat=True)
-            )
-            ans.correct_answers_display = list(
-                q.choices.filter(is_correct=True)
-                .values_list('text', flat=True)
-            )
+            ans.user_answers_display = [
+                c.text for c in choices if c.id in selected_ids
+            ]
+            ans.correct_answers_display = [
+                c.text for c in choices if c.id in correct_ids
+            ]
 
             if selected_ids == correct_ids:
                 ans.is_correct = True
@@ -672,170 +790,15 @@ def start_trial(request, track_id):
     return redirect("quiz:student_dashboard")
 
 def allocate_questions_for_exam(exam, seed=None):
-    mem = get_memory_usage_mb()
-    if mem is not None:
-        logger.info(f"Allocate Question for Exam page memory usage: {mem} MB")
-
-    """
-    Enterprise-grade allocation engine.
-    - Supports fixed + percentage allocation
-    - Deterministic if seed is provided (recommended: user_exam.id)
-    - Prevents over-allocation
-    - Uses active questions only
-    - 🔐 Multi-tenant safe
     """
+    Resolve the question IDs of a new attempt.
 
-    total_needed = int(exam.question_count)
-    if total_needed <= 0:
-        return []
-
-    rng = random.Random(seed) if seed is not None else random
-    allocations = list(exam.allocations.select_related("category").all())
-
-    # =====================================================
-    # 🔐 MULTI-TENANT QUESTION ISOLATION (CRITICAL FIX)
-    # =====================================================
-    base_qs = Question.objects.filter(
-        is_active=True,
-        is_deleted=False,
-    )
-
-    if exam.organization:
-        # Organization exam → ONLY that org's questions
-        base_qs = base_qs.filter(
-            organization=exam.organization
-        )
-    else:
-        # Public exam → ONLY global questions
-        base_qs = base_qs.filter(
-            organization__isnull=True
-        )
-
-    selected_qs = []
-    selected_ids = set()
-
-    # -------------------------------------------------
-    # 0️⃣ Guard: fixed_count overflow
-    # -------------------------------------------------
-    fixed_total = sum(a.fixed_count or 0 for a in allocations)
-    if fixed_total > total_needed:
-        raise ValueError(
-            f"Fixed allocation ({fixed_total}) exceeds exam.question_count ({total_needed})"
-        )
-
-    remaining_needed = total_needed
-
-    # -------------------------------------------------
-    # 1️⃣ FIXED COUNT ALLOCATION
-    # -------------------------------------------------
-    percent_allocs = []
-    percent_sum = 0
-
-    for a in allocations:
-        if a.fixed_count:
-            try:
-                cat_ids = a.category.get_descendants_include_self()
-            except Exception:
-                cat_ids = [a.category.id]
-
-            pool = list(
-                base_qs.filter(category_id__in=cat_ids)
-                .exclude(id__in=selected_ids)
-            )
-
-            rng.shuffle(pool)
-
-            take = min(len(pool), a.fixed_count)
-            chosen = pool[:take]
-
-            selected_qs.extend(chosen)
-            selected_ids.update(q.id for q in chosen)
-            remaining_needed -= take
-        else:
-            percent_allocs.append(a)
-            percent_sum += a.percentage
-
-    # -------------------------------------------------
-    # 2️⃣ PERCENTAGE ALLOCATION
-    # -------------------------------------------------
-    if percent_allocs and remaining_needed > 0 and percent_sum > 0:
-        raw = []
-
-        for a in percent_allocs:
-            scaled = (a.percentage / percent_sum) * remaining_needed
-            raw.append((a, math.floor(scaled), scaled % 1))
-
-        percent_counts = {a.id: cnt for a, cnt, _ in raw}
-        allocated = sum(percent_counts.values())
-        left = remaining_needed - allocated
-
-        # Distribute remainder fairly
-        for a, _, remainder in sorted(raw, key=lambda x: x[2], reverse=True):
-            if left <= 0:
-                break
-            percent_counts[a.id] += 1
-            left -= 1
-
-        for a in percent_allocs:
-            cnt = percent_counts.get(a.id, 0)
-            if cnt <= 0:
-                continue
-
-            try:
-                cat_ids = a.category.get_descendants_include_self()
-            except Exception:
-                cat_ids = [a.category.id]
-
-            pool = list(
-                base_qs.filter(category_id__in=cat_ids)
-                .exclude(id__in=selected_ids)
-            )
-
-            rng.shuffle(pool)
-
-            chosen = pool[:cnt]
-            selected_qs.extend(chosen)
-            selected_ids.update(q.id for q in chosen)
-
-    # -------------------------------------------------
-    # 3️⃣ FALLBACK: legacy category
-    # -------------------------------------------------
-    if len(selected_qs) < total_needed and exam.category:
-        needed = total_needed - len(selected_qs)
-
-        try:
-            cat_ids = exam.category.get_descendants_include_self()
-        except Exception:
-            cat_ids = [exam.category.id]
-
-        pool = list(
-            base_qs.filter(category_id__in=cat_ids)
-            .exclude(id__in=selected_ids)
-        )
-
-        rng.shuffle(pool)
-        selected_qs.extend(pool[:needed])
-        selected_ids.update(q.id for q in pool[:needed])
-
-    # -------------------------------------------------
-    # 4️⃣ FINAL FALLBACK (within allowed tenant scope only)
-    # -------------------------------------------------
-    if len(selected_qs) < total_needed:
-        needed = total_needed - len(selected_qs)
-
-        pool = list(
-            base_qs.exclude(id__in=selected_ids)
-        )
-
-        rng.shuffle(pool)
-        selected_qs.extend(pool[:needed])
-
-    # -------------------------------------------------
-    # FINAL SHUFFLE
-    # -------------------------------------------------
-    rng.shuffle(selected_qs)
+    Sampling runs against the cached per-exam pool index
+    (quiz.services.question_pool), so starting an attempt does not
+    scan the question bank.
+    """
 
-    return selected_qs[:total_needed]
+    return allocate_question_ids(exam, seed=seed)
 
 
 
@@ -936,24 +899,24 @@ def mock_exam_start(request, exam_id):
                 passed=None      # ✅ Explicit mock marker
             )
 
-            questions = allocate_questions_for_exam(
+            question_ids = allocate_questions_for_exam(
                 exam,
                 seed=ue.id       # deterministic
             )
 
-            if not questions:
+            if not question_ids:
                 raise ValueError("No questions allocated")
 
-            ue.question_order = [q.id for q in questions]
+            ue.question_order = question_ids
             ue.current_index = 0
-            ue.save()
+            ue.save(update_fields=["question_order", "current_index"])
 
             UserAnswer.objects.bulk_create([
                 UserAnswer(
                     user_exam=ue,
-                    question=q
+                    question_id=qid
                 )
-                for q in questions
+                for qid in question_ids
             ])
 
         # Session marker (optional, safe)
@@ -48,6 +48,14 @@ from quiz.services.access import can_access_exam
 from quiz.services.pricing import apply_coupon
 from quiz.services.subscription import has_valid_subscription
 from quiz.utils import get_leaf_category_name
+from accounts.models import Notification
+from accounts.services.notification_inbox import (
+    is_unread,
+    mark_all_read,
+    mark_read,
+    unread_ids,
+    visible_notifications,
+)
 
 
 # Re-assign User in case a custom user model is used (overrides the imported User if needed)
@@ -68,63 +76,37 @@ def notifications_list(request):
     A notification is visible when:
 
         1. It is a broadcast notification
-           (users field is empty)
+           (no recipients)
 
         OR
 
         2. The notification explicitly targets
            the current user.
+
+    Read state comes from the user's receipts and broadcast
+    watermark (accounts.services.notification_inbox).
     """
 
-    notifications = (
-        Notification.objects
+    visible = list(
+        visible_notifications(request.user.id)
         .order_by("-created_at")
     )
 
-    visible = []
-
-    for notification in notifications:
-
-        # ----------------------------------------------------
-        # Determine visibility
-        # ----------------------------------------------------
-
-        is_visible = (
-            not notification.users.exists()
-            or notification.users.filter(
-                id=request.user.id
-            ).exists()
-        )
-
-        if not is_visible:
-            continue
-
-        # ----------------------------------------------------
-        # Add transient template property
-        # ----------------------------------------------------
-
-        notification.is_unread = (
-            notification.unread_for(request.user)
-        )
-
-        visible.append(notification)
+    unread = unread_ids(request.user.id, visible)
 
     # --------------------------------------------------------
-    # Unread count
+    # Add transient template property
     # --------------------------------------------------------
 
-    unread_count = sum(
-        1
-        for notification in visible
-        if notification.is_unread
-    )
+    for notification in visible:
+        notification.is_unread = notification.id in unread
 
     return render(
         request,
         "quiz/notifications_list.html",
         {
             "notifications": visible,
-            "unread_count": unread_count,
+            "unread_count": len(unread),
         },
     )
 
@@ -149,9 +131,9 @@ def notification_read(request, pk):
     # --------------------------------------------------------
 
     is_visible = (
-        not notification.users.exists()
-        or notification.users.filter(
-            id=request.user.id
+        notification.is_broadcast
+        or notification.receipts.filter(
+            user=request.user
         ).exists()
     )
 
@@ -164,9 +146,11 @@ def notification_read(request, pk):
     # Mark read
     # --------------------------------------------------------
 
-    notification.mark_read(
-        request.user
-    )
+    if is_unread(notification, request.user):
+        mark_read(
+            notification,
+            request.user,
+        )
 
     return render(
         request,
@@ -192,34 +176,13 @@ def notifications_mark_all(request):
             "quiz:notifications_list"
         )
 
-    notifications = (
-        Notification.objects
-        .order_by("-created_at")[:200]
+    mark_all_read(
+        request.user.id
     )
 
-    for notification in notifications:
-
-        is_visible = (
-            not notification.users.exists()
-            or notification.users.filter(
-                id=request.user.id
-            ).exists()
-        )
-
-        if not is_visible:
-            continue
-
-        if notification.unread_for(
-            request.user
-        ):
-
-            notification.mark_read(
-                request.user
-            )
-
     return redirect(
         request.META.get(
             "HTTP_REFERER",
             "/",
         )
-    )
\ No newline at end of file
+    )
@@ -80,7 +80,17 @@ from quiz.models import (
 )
 
 from quiz.services.access import can_access_exam
+from quiz.services.answer_keys import get_answer_key
 from quiz.services.pricing import apply_coupon
+from quiz.services.practice_session import (
+    SCOPE_PRACTICE,
+    PracticeSession,
+    current_question,
+)
+from quiz.services.question_sampler import (
+    PRACTICE,
+    get_practice_pool,
+)
 from quiz.services.subscription import has_valid_subscription
 from quiz.utils import get_leaf_category_name
 
@@ -108,6 +118,55 @@ User = get_user_model()
 logger = logging.getLogger("django")
 
 
+# ============================================================
+# PRACTICE POOL
+# ============================================================
+
+def _practice_pool(domain_id, category_id, difficulty):
+    """
+    (selected domain, cached question ID pool) for the practice
+    filters. Unknown or inactive domains / categories are ignored,
+    as is a category outside the selected domain.
+    """
+
+    selected_domain = None
+    pool_category_id = None
+
+    if domain_id and str(domain_id).isdigit():
+        selected_domain = Domain.objects.filter(
+            id=domain_id,
+            is_active=True
+        ).first()
+
+    if category_id and str(category_id).isdigit() and selected_domain:
+        cat = Category.objects.filter(
+            id=category_id,
+            domain=selected_domain,
+            is_active=True
+        ).first()
+
+        if cat:
+            pool_category_id = cat.id
+
+    # Cached ID array per filter (no ORDER BY RAND())
+    pool = get_practice_pool(
+        PRACTICE,
+        domain_id=selected_domain.id if selected_domain else None,
+        category_id=pool_category_id,
+        difficulty=difficulty,
+    )
+
+    return selected_domain, pool
+
+
+def _practice_questions():
+    return (
+        Question.objects
+        .prefetch_related("choices")
+        .filter(is_active=True, is_deleted=False)
+    )
+
+
 def practice(request):
 
     """
@@ -155,11 +214,10 @@ def practice(request):
 
     # ================= RESET =================
     if request.GET.get("reset") == "1":
+        PracticeSession(request.session, SCOPE_PRACTICE).clear()
+
         for k in [
-            "p_seen",
-            "p_qid",
             "p_filters",
-            "p_total",
             "p_anon_count",
             "course_practice_initialized",
             "course_practice_count",
@@ -187,57 +245,21 @@ def practice(request):
 
     last_filters = request.session.get("p_filters")
 
-    # ================= BASE QUERYSET =================
-    qs = (
-        Question.objects
-        .filter(
-            question_type__in=[
-                Question.SINGLE,
-                Question.MULTI,
-                Question.TRUE_FALSE,
-            ],
-            is_active=True,
-            is_deleted=False,
-        )
-        .prefetch_related("choices")
-    )
-
-    selected_domain = None
-
-    if domain_id and str(domain_id).isdigit():
-        selected_domain = Domain.objects.filter(
-            id=domain_id,
-            is_active=True
-        ).first()
-
-        if selected_domain:
-            qs = qs.filter(category__domain=selected_domain)
-
-    if category_id and str(category_id).isdigit() and selected_domain:
-        cat = Category.objects.filter(
-            id=category_id,
-            domain=selected_domain,
-            is_active=True
-        ).first()
-
-        if cat:
-            qs = qs.filter(
-                category_id__in=cat.get_descendants_include_self()
-            )
-
-    if difficulty:
-        qs = qs.filter(difficulty=difficulty)
+    # ================= QUESTION POOL =================
+    selected_domain, pool = _practice_pool(domain_id, category_id, difficulty)
 
     # ================= RESET IF FILTERS CHANGED =================
+    state = PracticeSession(request.session, SCOPE_PRACTICE)
+
     if not is_from_course and filters != last_filters:
         request.session["p_filters"] = filters
-        request.session["p_seen"] = []
-        request.session.pop("p_qid", None)
-        request.session["p_total"] = qs.count()
         request.session["p_anon_count"] = 0
+        state.reset(len(pool))
+
+    elif not state.started or state.total != len(pool):
+        state.reset(len(pool))
 
-    seen = request.session.get("p_seen", [])
-    total = request.session.get("p_total", qs.count())
+    total = state.total
     anon_count = request.session.get("p_anon_count", 0)
 
     # ================= ANONYMOUS LIMIT =================
@@ -251,10 +273,11 @@ def practice(request):
                 "difficulty_choices": Question.DIFFICULTY_CHOICES,
             })
 
-    # ================= REMAINING =================
-    remaining = qs.exclude(id__in=seen)
+    # ================= PICK QUESTION =================
+    # The cursor stays on the same question until skip / next.
+    question = current_question(state, pool, _practice_questions())
 
-    if not remaining.exists():
+    if not question:
         return render(request, "quiz/student/practice/practice.html", {
             "completed": True,
             "progress_done": total,
@@ -264,14 +287,6 @@ def practice(request):
             "difficulty_choices": Question.DIFFICULTY_CHOICES,
         })
 
-    # ================= PICK QUESTION =================
-    qid = request.session.get("p_qid")
-    question = remaining.filter(id=qid).first() if qid else None
-
-    if not question:
-        question = remaining.order_by("?").first()
-        request.session["p_qid"] = question.id
-
     #choices = question.choices.order_by("order", "id")
 
 
@@ -284,9 +299,7 @@ def practice(request):
 
     # ================= SKIP =================
     if request.method == "POST" and request.POST.get("skip") == "1":
-        seen.append(question.id)
-        request.session["p_seen"] = seen
-        request.session.pop("p_qid", None)
+        state.advance()
         return redirect(request.path + "?" + request.META.get("QUERY_STRING", ""))
 
     # ================= ANSWER CHECK =================
@@ -326,9 +339,7 @@ def practice(request):
                     lesson_id=lesson.id
                 )
 
-        seen.append(question.id)
-        request.session["p_seen"] = seen
-        request.session.pop("p_qid", None)
+        state.advance()
 
         if not request.user.is_authenticated:
             request.session["p_anon_count"] = anon_count + 1
@@ -386,7 +397,7 @@ def practice(request):
         "category_id": category_id,
         "difficulty": difficulty,
         "difficulty_choices": Question.DIFFICULTY_CHOICES,
-        "progress_done": len(seen),
+        "progress_done": state.cursor,
         "progress_total": total,
         "locked_filters": locked_filters,
         "is_from_course": is_from_course,
@@ -504,16 +515,13 @@ def practice_answer_ajax(request):
     selected_choice_id = None
     selected_multi_ids = []
 
-    correct_ids = list(
-        choices.filter(is_correct=True)
-        .values_list("id", flat=True)
-    )
+    correct_ids = get_answer_key(question.id)["correct_choice_ids"]
 
     if question.question_type == Question.MULTI:
         selected_multi_ids = list(
             map(int, request.POST.getlist("choice_multi"))
         )
-        if set(selected_multi_ids) == set(correct_ids):
+        if set(selected_multi_ids) == correct_ids:
             result = "correct"
             show_next = True
     else:
@@ -563,13 +571,11 @@ def practice_next_ajax(request):
     # ===============================
     # SESSION STATE UPDATE FIRST
     # ===============================
-    seen = request.session.get("p_seen", [])
-    qid = request.session.get("p_qid")
+    state = PracticeSession(request.session, SCOPE_PRACTICE)
 
-    if qid:
-        seen.append(qid)
-        request.session["p_seen"] = seen
-        request.session.pop("p_qid", None)
+    # The question on screen is done, even if the lesson ends here
+    if state.started:
+        state.advance()
 
     # ===============================
     # COURSE THRESHOLD CHECK
@@ -599,35 +605,20 @@ def practice_next_ajax(request):
     category_id = filters.get("category")
     difficulty = filters.get("difficulty")
 
-    qs = (
-        Question.objects
-        .filter(
-            question_type__in=[
-                Question.SINGLE,
-                Question.MULTI,
-                Question.TRUE_FALSE,
-            ],
-            is_active=True,
-            is_deleted=False,
-        )
-        .prefetch_related("choices")
-    )
-
-    if domain_id and str(domain_id).isdigit():
-        qs = qs.filter(category__domain_id=domain_id)
-
-    if category_id and str(category_id).isdigit():
-        qs = qs.filter(category_id=category_id)
+    _, pool = _practice_pool(domain_id, category_id, difficulty)
 
-    if difficulty:
-        qs = qs.filter(difficulty=difficulty)
+    if not state.started:
+        state.reset(len(pool))
 
-    remaining = qs.exclude(id__in=seen)
+    # ===============================
+    # PICK NEXT QUESTION
+    # ===============================
+    question = current_question(state, pool, _practice_questions())
 
     # ===============================
     # COMPLETED (NO MORE QUESTIONS)
     # ===============================
-    if not remaining.exists():
+    if not question:
         html = render_to_string(
             "quiz/practice/_practice_completed.html",
             {},
@@ -635,12 +626,6 @@ def practice_next_ajax(request):
         )
         return JsonResponse({"success": True, "html": html})
 
-    # ===============================
-    # PICK NEXT QUESTION
-    # ===============================
-    question = remaining.order_by("?").first()
-    request.session["p_qid"] = question.id
-
     html = render_to_string(
         "quiz/practice/_practice_question.html",
         {
@@ -45,7 +45,17 @@ from quiz.models import (
     Coupon,
 )
 from quiz.services.access import can_access_exam
+from quiz.services.answer_keys import get_answer_key
 from quiz.services.pricing import apply_coupon
+from quiz.services.practice_session import (
+    SCOPE_EXPRESS,
+    PracticeSession,
+    current_question,
+)
+from quiz.services.question_sampler import (
+    EXPRESS,
+    get_practice_pool,
+)
 from quiz.services.subscription import has_valid_subscription
 from quiz.utils import get_leaf_category_name
 
@@ -109,11 +119,10 @@ def practice_express(request):
 
     # SAFE HARD RESET (only express keys)
     if request.GET.get("reset") == "1":
+        PracticeSession(request.session, SCOPE_EXPRESS).clear()
+
         for key in [
-            "pe_seen",
-            "pe_qid",
             "pe_filters",
-            "pe_total",
             "pe_progress",
         ]:
             request.session.pop(key, None)
@@ -152,23 +161,11 @@ def practice_express_next(request):
     last_filters = request.session.get("pe_filters")
 
     # -------------------------------
-    # BASE QUERYSET (🔥 FIXED)
-    # ❌ REMOVED question_type filter
-    # -------------------------------
-    qs = Question.objects.filter(
-        category__isnull=False ,
-        is_active= True
-    ).prefetch_related("choices")
-
-    # -------------------------------
-    # DOMAIN FILTER
+    # QUESTION POOL
+    # Cached ID array per filter, any question type
     # -------------------------------
-    if domain_id:
-        qs = qs.filter(category__domain_id=domain_id)
+    pool_category_id = None
 
-    # -------------------------------
-    # CATEGORY FILTER (DESCENDANTS)
-    # -------------------------------
     if category_id:
         cat = Category.objects.filter(
             id=category_id,
@@ -176,27 +173,29 @@ def practice_express_next(request):
             is_active=True
         ).first()
         if cat:
-            qs = qs.filter(
-                category_id__in=cat.get_descendants_include_self()
-            )
+            pool_category_id = cat.id
 
-    # -------------------------------
-    # DIFFICULTY FILTER
-    # -------------------------------
-    if difficulty:
-        qs = qs.filter(difficulty=difficulty)
+    pool = get_practice_pool(
+        EXPRESS,
+        domain_id=domain_id,
+        category_id=pool_category_id,
+        difficulty=difficulty,
+    )
 
     # -------------------------------
     # RESET WHEN FILTERS CHANGE
     # -------------------------------
+    state = PracticeSession(request.session, SCOPE_EXPRESS)
+
     if current_filters != last_filters:
         request.session["pe_filters"] = current_filters
-        request.session["pe_seen_qids"] = []
-        request.session["pe_total"] = qs.count()
         request.session["pe_anon_attempted"] = 0
+        state.reset(len(pool))
 
-    seen_qids = request.session.get("pe_seen_qids", [])
-    total_questions = request.session.get("pe_total", qs.count())
+    elif not state.started or state.total != len(pool):
+        state.reset(len(pool))
+
+    total_questions = state.total
     anon_attempted = request.session.get("pe_anon_attempted", 0)
 
     # -------------------------------
@@ -228,29 +227,30 @@ def practice_express_next(request):
             })
 
     # -------------------------------
-    # REMAINING QUESTIONS
+    # PICK NEXT QUESTION
     # -------------------------------
-    remaining = qs.exclude(id__in=seen_qids)
+    question = current_question(
+        state,
+        pool,
+        Question.objects
+        .prefetch_related("choices")
+        .filter(is_active=True, is_deleted=False),
+    )
 
     # -------------------------------
     # COMPLETED
     # -------------------------------
-    if not remaining.exists():
-        request.session["pe_seen_qids"] = []
+    if not question:
+        state.reset(len(pool))
         return JsonResponse({
             "completed": True,
             "progress_done": total_questions,
             "progress_total": total_questions,
         })
 
-    # -------------------------------
-    # PICK NEXT QUESTION
-    # -------------------------------
-    question = remaining.order_by("?").first()
-    correct_choices = question.choices.filter(is_correct=True)
+    correct_ids = get_answer_key(question.id)["correct_choice_ids"]
 
-    seen_qids.append(question.id)
-    request.session["pe_seen_qids"] = seen_qids
+    state.advance()
 
     if not request.user.is_authenticated:
         request.session["pe_anon_attempted"] = anon_attempted + 1
@@ -263,12 +263,12 @@ def practice_express_next(request):
         "text": question.text,
         "question_type": question.question_type,
         "explanation": question.explanation or "",
-        "correct_choices": [c.id for c in correct_choices],
+        "correct_choices": sorted(correct_ids),
         "choices": [
             {"id": c.id, "text": c.text}
             for c in question.choices.all().order_by("order", "id")
         ],
-        "progress_done": len(seen_qids),
+        "progress_done": state.cursor,
         "progress_total": total_questions,
     })
 
@@ -6,6 +6,7 @@ from django.utils import timezone
 
 from quiz.models import Question
 from quiz.forms import QuestionForm
+from quiz.services.question_pool import invalidate_question_pools
 
 from django.http import JsonResponse
 from django.template.loader import render_to_string
@@ -56,12 +57,14 @@ def question_dashboard(request):
             qid = request.POST.get("disable_question")
             Question.objects.filter(id=qid, is_deleted=False)\
                 .update(is_active=False)
+            invalidate_question_pools()
             return redirect(request.get_full_path())
 
         if "enable_question" in request.POST:
             qid = request.POST.get("enable_question")
             Question.objects.filter(id=qid, is_deleted=False)\
                 .update(is_active=True)
+            invalidate_question_pools()
             return redirect(request.get_full_path())
 
         if "delete_question" in request.POST:
@@ -74,6 +77,7 @@ def question_dashboard(request):
                 deleted_by=request.user,
                 deleted_at=timezone.now()
             )
+            invalidate_question_pools()
             return redirect(request.get_full_path())
 
     # ================= FILTERS =================
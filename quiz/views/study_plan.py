@@ -6,6 +6,7 @@ from datetime import timedelta
 from django.shortcuts import render, redirect
 from django.contrib.auth.decorators import login_required
 from django.contrib import messages
+from django.core.paginator import Paginator
 from django.utils import timezone
 from django.db.models import Q, F, Count, Max, Sum
 
@@ -14,10 +15,30 @@ from quiz.models import (
     StudyPlan,
     Question,
     Domain,
-    Category,
 )
-from quiz.services.study_plan_service import generate_study_plan
+from quiz.services.study_plan_service import (
+    generate_study_plan,
+    record_plan_answer,
+)
 from quiz.services.adaptive_engine import select_adaptive_question
+from quiz.services.answer_keys import get_answer_key
+from quiz.services.plan_stats import category_breakdown
+from quiz.services.leaderboard import (
+    current_season,
+    get_snapshot_row,
+    get_snapshot_rows,
+    partition_key,
+    update_leaderboard_entry,
+)
+from quiz.services.practice_session import (
+    get_done_mask,
+    remaining_ids,
+    set_done,
+)
+from quiz.services.review_state import (
+    due_question_ids,
+    record_review,
+)
 from quiz.utils import calculate_global_percentile
 
 
@@ -27,22 +48,6 @@ from quiz.utils import calculate_live_rank
 
 
 
-def calculate_live_rank(plan):
-    active_plans = StudyPlan.objects.filter(is_active=True)
-
-    scores = sorted(
-        [p.global_competitive_score() for p in active_plans],
-        reverse=True
-    )
-
-    user_score = plan.global_competitive_score()
-    rank = scores.index(user_score) + 1
-    total = len(scores)
-
-    percentile = 100 - round((rank / total) * 100, 2)
-
-    return rank, percentile
-
 @login_required
 def study_plan_dashboard(request):
 
@@ -89,35 +94,13 @@ def study_plan_dashboard(request):
         )
 
         # ================= CATEGORY ANALYTICS =================
-        stats = active_plan.category_stats or {}
-        category_ids = list(stats.keys())
-
-        categories = {
-            c.id: c
-            for c in Category.objects.filter(id__in=category_ids)
-        }
-
-        for cat_id, data in stats.items():
-            attempted = data.get("attempted", 0)
-            correct = data.get("correct", 0)
-
-            if attempted == 0:
-                continue
-
-            percent = round((correct / attempted) * 100, 2)
-            category_obj = categories.get(int(cat_id))
-
-            category_data = {
-                "id": cat_id,
-                "name": category_obj.name if category_obj else f"Category {cat_id}",
-                "attempted": attempted,
-                "correct": correct,
-                "accuracy": percent,
-            }
-
+        for category_data in category_breakdown(active_plan.id):
             category_analytics.append(category_data)
 
-            if percent < 60 and attempted >= 5:
+            if (
+                category_data["accuracy"] < 60
+                and category_data["attempted"] >= 5
+            ):
                 weak_categories.append(category_data)
 
         # ================= TREND =================
@@ -320,10 +303,11 @@ def study_plan_practice(request):
 
     if last_day != today_key:
         request.session["plan_day_key"] = today_key
-        request.session["sp_seen"] = []
+        request.session.pop("sp_done", None)
         request.session.pop("sp_qid", None)
 
-    seen = request.session.get("sp_seen", [])
+    # Answered slots of today's list, as a bitmask
+    done_mask = get_done_mask(request.session, "sp_done")
 
     # ================= PLAN EXPIRED =================
     if plan.get_day_index() >= plan.total_plan_days():
@@ -339,11 +323,12 @@ def study_plan_practice(request):
 
     # ================= TODAY QUESTIONS =================
     today_ids = plan.get_today_question_ids()
+    open_ids = remaining_ids(today_ids, done_mask)
 
-    qs = (
+    remaining = (
         Question.objects
         .filter(
-            id__in=today_ids,
+            id__in=open_ids,
             question_type__in=[
                 Question.SINGLE,
                 Question.MULTI,
@@ -355,8 +340,6 @@ def study_plan_practice(request):
         .prefetch_related("choices")
     )
 
-    remaining = qs.exclude(id__in=seen)
-
     if not remaining.exists():
         return redirect("quiz:study_plan_dashboard")
 
@@ -365,7 +348,11 @@ def study_plan_practice(request):
     question = remaining.filter(id=qid).first() if qid else None
 
     if not question:
-        question = select_adaptive_question(plan, remaining, request) or remaining.first()
+        # Reviews that are due come first, then the rest of today's list
+        due_ids = due_question_ids(request.user.id, open_ids)
+        candidates = remaining.filter(id__in=due_ids) if due_ids else remaining
+
+        question = select_adaptive_question(plan, candidates) or remaining.first()
         request.session["sp_qid"] = question.id
 
     choices = question.choices.order_by("order", "id")
@@ -378,60 +365,38 @@ def study_plan_practice(request):
 
         # ---------- Evaluate ----------
         is_correct = False
+        correct_ids = get_answer_key(question.id)["correct_choice_ids"]
 
         if question.question_type == Question.MULTI:
             selected_ids = list(map(int, request.POST.getlist("choice_multi")))
-            correct_ids = list(
-                question.choices
-                .filter(is_correct=True)
-                .values_list("id", flat=True)
-            )
-            is_correct = set(selected_ids) == set(correct_ids)
+            is_correct = set(selected_ids) == correct_ids
 
         else:
-            selected_id = request.POST.get("choice")
-            selected = question.choices.filter(id=selected_id).first()
-            is_correct = selected and selected.is_correct
-
-        # ---------- Aggregate ----------
-        plan.total_attempted += 1
-        if is_correct:
-            plan.total_correct += 1
-
-        # Save stats safely
-        cat_key = str(question.category_id)
-        category_stats = plan.category_stats or {}
-        category_stats.setdefault(cat_key, {"attempted": 0, "correct": 0})
-        category_stats[cat_key]["attempted"] += 1
-        if is_correct:
-            category_stats[cat_key]["correct"] += 1
-        plan.category_stats = category_stats
-
-        diff_key = question.difficulty
-        difficulty_stats = plan.difficulty_stats or {}
-        difficulty_stats.setdefault(diff_key, {"attempted": 0, "correct": 0})
-        difficulty_stats[diff_key]["attempted"] += 1
-        if is_correct:
-            difficulty_stats[diff_key]["correct"] += 1
-        plan.difficulty_stats = difficulty_stats
-
-        plan.save()
-        plan.save_daily_snapshot()
-        
+            try:
+                is_correct = int(request.POST.get("choice")) in correct_ids
+            except (TypeError, ValueError):
+                is_correct = False
+
+        # ---------- Record ----------
+        plan = record_plan_answer(
+            plan.id,
+            category_id=question.category_id,
+            difficulty=question.difficulty,
+            is_correct=is_correct,
+        )
+
+        record_review(request.user, question.id, is_correct)
 
         # Mark progress
-        seen.append(question.id)
-        request.session["sp_seen"] = seen
+        if question.id in today_ids:
+            set_done(request.session, "sp_done", today_ids.index(question.id))
         request.session.pop("sp_qid", None)
 
-        plan.increment_today_progress()
-
-        # 🔥 Final Completion Check
-        plan.mark_completed_if_finished()
-
         if plan.is_completed:
             return redirect("quiz:study_plan_completed", plan_id=plan.id)
 
+        update_leaderboard_entry(request.user.id)
+
         return redirect("quiz:study_plan_practice")
 
     # ============================================================
@@ -556,75 +521,26 @@ def study_plan_leaderboard(request):
     domain_id = request.GET.get("domain")
     month_filter = request.GET.get("monthly")
 
-    plans = StudyPlan.objects.select_related("user")
-
-    # ================= DOMAIN FILTER =================
-    if domain_id:
-        plans = plans.filter(domain_id=domain_id)
-
-    # ================= MONTHLY SEASON =================
-    if month_filter == "1":
-        now = timezone.now()
-        plans = plans.filter(
-            created_at__year=now.year,
-            created_at__month=now.month
-        )
-
-    # ================= ACTIVE + COMPLETED ONLY =================
-    plans = plans.filter(is_active=True)
-
-    # ================= BEST PLAN PER USER =================
-    best_plans = {}
-
-    for plan in plans:
-
-        # 🔥 NEW: Use Competitive Score instead of readiness only
-        score = plan.global_competitive_score()
-
-        if (
-            plan.user_id not in best_plans
-            or score > best_plans[plan.user_id]["score"]
-        ):
-            best_plans[plan.user_id] = {
-                "plan": plan,
-                "score": score
-            }
-
-    ranked = sorted(
-        best_plans.values(),
-        key=lambda x: x["score"],
-        reverse=True
+    # ================= DOMAIN / MONTHLY SEASON =================
+    partition = partition_key(
+        domain_id=domain_id if str(domain_id or "").isdigit() else None,
+        season=current_season() if month_filter == "1" else None,
     )
 
-    total_users = len(ranked)
-    leaderboard = []
-
-    for index, item in enumerate(ranked, start=1):
-
-        plan = item["plan"]
-        score = item["score"]
+    paginator = Paginator(get_snapshot_rows(partition), 50)
+    page_obj = paginator.get_page(request.GET.get("page"))
 
-        percentile = (
-            round((total_users - index) / total_users * 100, 2)
-            if total_users > 0 else 0
-        )
-
-        leaderboard.append({
-            "rank": index,
-            "user": plan.user,
-            "competitive_score": score,
-            "readiness": plan.certification_readiness(),
-            "xp": plan.xp,
-            "streak": plan.longest_streak,
-            "level": plan.level,
-            "percentile": percentile,
-        })
+    query = request.GET.copy()
+    query.pop("page", None)
 
     return render(
         request,
         "quiz/study_plan/leaderboard.html",
         {
-            "leaderboard": leaderboard,
+            "leaderboard": page_obj.object_list,
+            "page_obj": page_obj,
+            "querystring": query.urlencode(),
+            "my_row": get_snapshot_row(request.user.id, partition),
             "domains": Domain.objects.filter(is_active=True),
             "selected_domain": domain_id,
             "monthly_mode": month_filter,
@@ -805,19 +721,7 @@ def study_plan_detail(request, plan_id):
     prediction = plan.certification_prediction()
 
     # Category breakdown
-    category_data = []
-    stats = plan.category_stats or {}
-
-    for cat_id, data in stats.items():
-        attempted = data.get("attempted", 0)
-        correct = data.get("correct", 0)
-
-        if attempted > 0:
-            category_data.append({
-                "id": cat_id,
-                "accuracy": round((correct / attempted) * 100, 2),
-                "attempted": attempted
-            })
+    category_data = category_breakdown(plan.id)
 
     context = {
         "plan": plan,